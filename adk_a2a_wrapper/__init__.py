@@ -1,5 +1,19 @@
 from .wrapper import create_a2a_agent, A2AAgentServer
-from .models import AgentRequest, AgentResponse, SkillDefinition
+from .models import AgentRequest, AgentResponse, AgentCall, BatchRequest, SkillDefinition, CollaboratorConfig
+from .transport import ConnectionPool
+from .registry import CollaboratorRegistry
+from .stores import BoundedSessionService, BoundedTaskStore
+from .sqlite_store import SQLiteDatabase, SQLiteSessionService, SQLiteTaskStore
+from .context_sessions import ContextSessionManager
+from .cache import ResponseCache
+from .singleflight import SingleFlight
+from .admission import AdmissionController, AdmissionRejected
+from .ratelimit import RateLimiter, RateLimitedLlm
+from .deadlines import DeadlineExceeded
+from .host import MultiAgentHost
+from .metrics import Metrics
+from .tracing import Tracer, JsonlExporter, OTLPExporter
+from .replay import TrafficRecorder, TrafficReplayer, ReplayMiss
 from .base_agent import CollaborativeAgent
 
 __all__ = [
@@ -7,6 +21,32 @@ __all__ = [
     'A2AAgentServer', 
     'AgentRequest', 
     'AgentResponse', 
+    'AgentCall',
+    'BatchRequest',
     'SkillDefinition',
+    'CollaboratorConfig',
+    'ConnectionPool',
+    'CollaboratorRegistry',
+    'BoundedSessionService',
+    'BoundedTaskStore',
+    'SQLiteDatabase',
+    'SQLiteSessionService',
+    'SQLiteTaskStore',
+    'ContextSessionManager',
+    'ResponseCache',
+    'SingleFlight',
+    'AdmissionController',
+    'AdmissionRejected',
+    'RateLimiter',
+    'RateLimitedLlm',
+    'DeadlineExceeded',
+    'MultiAgentHost',
+    'Metrics',
+    'Tracer',
+    'JsonlExporter',
+    'OTLPExporter',
+    'TrafficRecorder',
+    'TrafficReplayer',
+    'ReplayMiss',
     'CollaborativeAgent'
 ]
@@ -0,0 +1,228 @@
+"""
+Admission control: bounded concurrency with a bounded, priority-ordered wait queue.
+"""
+import asyncio
+import itertools
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+SCHEDULING_POLICIES = ("fifo", "weighted", "edf")
+DEFAULT_PRIORITY_WEIGHTS = {"interactive": 8.0, "normal": 4.0, "batch": 1.0}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is turned away instead of being queued or run."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _Waiter:
+    __slots__ = ("future", "priority", "deadline", "seq")
+
+    def __init__(self, future: asyncio.Future, priority: str, deadline: Optional[float], seq: int):
+        self.future = future
+        self.priority = priority
+        self.deadline = deadline
+        self.seq = seq
+
+
+class _ClassStats:
+    def __init__(self, window: int):
+        self.admitted = 0
+        self.rejected = 0
+        self.waits: Deque[float] = deque(maxlen=window)
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def to_dict(self) -> Dict[str, Any]:
+        waits, latencies = list(self.waits), list(self.latencies)
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_p50": _percentile(waits, 0.5),
+            "wait_p99": _percentile(waits, 0.99),
+            "latency_p50": _percentile(latencies, 0.5),
+            "latency_p99": _percentile(latencies, 0.99),
+        }
+
+
+class AdmissionController:
+    """Lets at most max_concurrent requests run; up to max_queue more wait.
+
+    Requests arriving when the queue is full are rejected at once, and queued
+    requests are rejected once they have waited queue_timeout seconds (or
+    their own deadline has passed), so overload turns into fast rejections
+    instead of ever growing latency.
+
+    When a slot frees up the next request is picked by policy:
+    "fifo" in arrival order, "weighted" by weighted-fair share across
+    priority classes (FIFO within a class), or "edf" earliest deadline first
+    (requests without a deadline go last, by class weight).
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: Optional[int] = 100,
+        queue_timeout: Optional[float] = None,
+        policy: str = "weighted",
+        priority_weights: Optional[Dict[str, float]] = None,
+        default_priority: str = "normal",
+        window: int = 1024,
+    ):
+        if policy not in SCHEDULING_POLICIES:
+            raise ValueError(f"Unknown scheduling policy {policy!r}, expected one of {SCHEDULING_POLICIES}")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.policy = policy
+        self.priority_weights = dict(priority_weights or DEFAULT_PRIORITY_WEIGHTS)
+        self.default_priority = default_priority
+        self.priority_weights.setdefault(default_priority, 1.0)
+        self.window = window
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        # Weighted-fair virtual time per class
+        self._vtime: Dict[str, float] = {}
+        self._clock = 0.0
+        self._classes: Dict[str, _ClassStats] = {}
+        self.active = 0
+        self.max_waiting = 0
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self._wait_times: Deque[float] = deque(maxlen=window)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _class(self, priority: Optional[str]) -> str:
+        return priority if priority in self.priority_weights else self.default_priority
+
+    def _class_stats(self, priority: str) -> _ClassStats:
+        if priority not in self._classes:
+            self._classes[priority] = _ClassStats(self.window)
+        return self._classes[priority]
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[float]:
+        """Hold a slot for the duration of the block; yields the time spent queued.
+
+        Args:
+            timeout: Maximum queue time for this request (defaults to queue_timeout)
+            priority: Priority class (a key of priority_weights)
+            deadline: time.monotonic() by which the request must be answered
+
+        Raises:
+            AdmissionRejected: If the queue is full or the queue time ran out
+        """
+        priority = self._class(priority)
+        stats = self._class_stats(priority)
+        started = time.monotonic()
+
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+        else:
+            if self.max_queue is not None and len(self._waiters) >= self.max_queue:
+                self.rejected_full += 1
+                stats.rejected += 1
+                raise AdmissionRejected("queue full")
+
+            timeout = self.queue_timeout if timeout is None else timeout
+            if deadline is not None:
+                remaining = max(0.0, deadline - started)
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            await self._wait(priority, deadline, timeout, stats)
+
+        waited = time.monotonic() - started
+        self._wait_times.append(waited)
+        self.admitted += 1
+        stats.admitted += 1
+        stats.waits.append(waited)
+        try:
+            yield waited
+        finally:
+            stats.latencies.append(time.monotonic() - started)
+            self._release()
+
+    async def _wait(self, priority: str, deadline: Optional[float], timeout: Optional[float], stats: _ClassStats):
+        if priority not in {waiter.priority for waiter in self._waiters}:
+            # A class that was idle starts at the current virtual time
+            self._vtime[priority] = max(self._vtime.get(priority, 0.0), self._clock)
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), priority, deadline, next(self._seq))
+        self._waiters.append(waiter)
+        self.max_waiting = max(self.max_waiting, len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except BaseException as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejected_timeout += 1
+                stats.rejected += 1
+                raise AdmissionRejected("queue timeout") from None
+            raise
+
+    def _release(self):
+        # Hand the slot straight to the next waiter, if any
+        while self._waiters:
+            waiter = self._next()
+            self._waiters.remove(waiter)
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                return
+        self.active -= 1
+
+    def _next(self) -> _Waiter:
+        if self.policy == "fifo":
+            return min(self._waiters, key=lambda w: w.seq)
+        if self.policy == "edf":
+            return min(
+                self._waiters,
+                key=lambda w: (
+                    w.deadline if w.deadline is not None else math.inf,
+                    -self.priority_weights[w.priority],
+                    w.seq,
+                ),
+            )
+        # Weighted fair: the class furthest behind its share goes next
+        waiter = min(self._waiters, key=lambda w: (self._vtime[w.priority], w.seq))
+        self._clock = self._vtime[waiter.priority]
+        self._vtime[waiter.priority] += 1.0 / self.priority_weights[waiter.priority]
+        return waiter
+
+    def stats(self) -> Dict[str, Any]:
+        waits = list(self._wait_times)
+        return {
+            "active": self.active,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "admitted": self.admitted,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "wait_p50": _percentile(waits, 0.5),
+            "wait_p99": _percentile(waits, 0.99),
+            "wait_max": max(waits) if waits else 0.0,
+            "classes": {priority: stats.to_dict() for priority, stats in self._classes.items()},
+        }
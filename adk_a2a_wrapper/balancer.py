@@ -0,0 +1,102 @@
+"""
+Client-side load balancing across the replicas of a collaborator.
+"""
+import itertools
+import random
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .resilience import CircuitBreaker
+
+BALANCING_STRATEGIES = ("round_robin", "least_outstanding", "p2c_ewma")
+
+
+class ReplicaBalancer:
+    """Picks the replica (endpoint) of a collaborator group for each call.
+
+    Replicas that are marked unhealthy or whose circuit breaker is open are
+    skipped. Strategies:
+        round_robin: cycle through the available replicas
+        least_outstanding: fewest requests in flight from this process
+        p2c_ewma: of two random replicas, the one with the lower
+            latency EWMA weighted by its requests in flight
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        strategy: str = "round_robin",
+        is_healthy: Callable[[str], bool] = lambda endpoint: True,
+        in_flight: Callable[[str], int] = lambda endpoint: 0,
+        breakers: Optional[Dict[str, CircuitBreaker]] = None,
+        ewma_alpha: float = 0.3,
+    ):
+        if strategy not in BALANCING_STRATEGIES:
+            raise ValueError(f"Unknown balancing strategy {strategy!r}, expected one of {BALANCING_STRATEGIES}")
+        self.endpoints = list(endpoints)
+        self.strategy = strategy
+        self.is_healthy = is_healthy
+        self.in_flight = in_flight
+        self.breakers = breakers or {}
+        self.ewma_alpha = ewma_alpha
+        self.ewma: Dict[str, Optional[float]] = {endpoint: None for endpoint in self.endpoints}
+        self.picks: Dict[str, int] = {endpoint: 0 for endpoint in self.endpoints}
+        self._counter = itertools.count()
+
+    def _available(self, endpoint: str, healthy_only: bool = True) -> bool:
+        breaker = self.breakers.get(endpoint)
+        if healthy_only and not self.is_healthy(endpoint):
+            return False
+        return breaker is None or breaker.available()
+
+    def pick(self, avoid: Iterable[str] = (), healthy_only: bool = True) -> Optional[str]:
+        """Choose a replica, preferring ones not in avoid; None if none is available.
+
+        With healthy_only False, replicas marked unhealthy are candidates too
+        (circuit breakers still apply). The chosen replica's circuit breaker
+        (if any) is charged with the call.
+        """
+        avoid = set(avoid)
+        candidates = [e for e in self.endpoints if self._available(e, healthy_only)]
+        preferred = [e for e in candidates if e not in avoid] or candidates
+        while preferred:
+            endpoint = self._choose(preferred)
+            breaker = self.breakers.get(endpoint)
+            if breaker is None or breaker.allow():
+                self.picks[endpoint] += 1
+                return endpoint
+            preferred.remove(endpoint)
+        return None
+
+    def _choose(self, candidates: List[str]) -> str:
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.strategy == "round_robin":
+            return candidates[next(self._counter) % len(candidates)]
+        if self.strategy == "least_outstanding":
+            least = min(self.in_flight(e) for e in candidates)
+            return random.choice([e for e in candidates if self.in_flight(e) == least])
+        a, b = random.sample(candidates, 2)
+        return a if self._load(a) <= self._load(b) else b
+
+    def _load(self, endpoint: str) -> float:
+        # Replicas without samples yet look fast, so they get tried
+        ewma = self.ewma[endpoint] or 0.0
+        return ewma * (self.in_flight(endpoint) + 1)
+
+    def record_latency(self, endpoint: str, seconds: float):
+        previous = self.ewma.get(endpoint)
+        if previous is None:
+            self.ewma[endpoint] = seconds
+        else:
+            self.ewma[endpoint] = self.ewma_alpha * seconds + (1 - self.ewma_alpha) * previous
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            endpoint: {
+                "healthy": self.is_healthy(endpoint),
+                "in_flight": self.in_flight(endpoint),
+                "picks": self.picks[endpoint],
+                "latency_ewma": self.ewma[endpoint],
+                **({"circuit": self.breakers[endpoint].stats()} if endpoint in self.breakers else {}),
+            }
+            for endpoint in self.endpoints
+        }
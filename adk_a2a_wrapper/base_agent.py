@@ -3,10 +3,11 @@ Simplified base classes for creating A2A-enabled ADK agents.
 """
 import uuid
 import logging
-from typing import Dict, Any, Optional, List
-import httpx
+from typing import Dict, Any, Optional, List, Union, AsyncIterator
 from a2a.types import AgentSkill
 from adk_a2a_wrapper import create_a2a_agent, SkillDefinition, AgentRequest, AgentResponse
+from adk_a2a_wrapper.models import AgentCall, CollaboratorConfig
+from adk_a2a_wrapper.serialization import canonical_json
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
 
@@ -23,11 +24,12 @@ class CollaborativeAgent:
         port: int,
         api_key: str,
         skills: Optional[List[AgentSkill]] = None,
-        collaborators: Optional[Dict[str, str]] = None,
+        collaborators: Optional[Dict[str, Union[str, List[str], CollaboratorConfig]]] = None,
         tools: Optional[List] = None,
         enable_streaming: bool = False,
         host: str = "0.0.0.0",
         logger: Optional[logging.Logger] = None,
+        **server_kwargs,
     ):
         self.name = name
         self.model = model
@@ -41,6 +43,7 @@ class CollaborativeAgent:
         self.enable_streaming = enable_streaming
         self.host = host
         self.logger = logger or logging.getLogger(name)
+        self.server_kwargs = server_kwargs
         
         # Create ADK agent
         self.adk_agent = Agent(
@@ -48,7 +51,7 @@ class CollaborativeAgent:
             description=description,
             instruction=instruction,
             model=LiteLlm(model=model, api_key=api_key),
-            tools=tools,
+            tools=self.tools,
         )
         
         # Convert AgentSkill to SkillDefinition
@@ -68,6 +71,11 @@ class CollaborativeAgent:
         self._skill_definitions = skill_definitions
         self._setup_server()
     
+    @property
+    def server(self):
+        """The underlying A2AAgentServer (e.g. to mount it in a MultiAgentHost)."""
+        return self._server
+    
     def _setup_server(self):
         """Set up the A2A server with custom processing."""
         parent = self
@@ -82,28 +90,15 @@ class CollaborativeAgent:
                     # First get the base ADK response
                     prompt = request.message
                     if request.context:
-                        prompt = f"{request.message}\n\nContext: {request.context}"
+                        prompt = f"{request.message}\n\nContext: {canonical_json(request.context)}"
                     
-                    # Run ADK agent
-                    from google.genai import types
-                    content = types.Content(
-                        role="user",
-                        parts=[types.Part(text=prompt)]
-                    )
-                    
-                    response_text = ""
-                    async for event in self.runner.run_async(
-                        user_id="user1",
-                        session_id=session_id,
-                        new_message=content
-                    ):
-                        if event.is_final_response() and event.content and event.content.parts:
-                            response_text = event.content.parts[0].text
-                            break
+                    # Run ADK agent (streams partial text when enabled)
+                    response_text = await self.run_agent(prompt, session_id)
                     
                     # Now let the parent process the response
                     if hasattr(parent, 'process_response'):
-                        response_text = await parent.process_response(response_text, request)
+                        with self.stage("post_process"):
+                            response_text = await parent.process_response(response_text, request)
                     
                     return AgentResponse(
                         message=response_text,
@@ -129,6 +124,7 @@ class CollaborativeAgent:
             host=self.host,
             enable_streaming=self.enable_streaming,
             logger=self.logger,
+            **self.server_kwargs,
         )
     
     async def call_agent(
@@ -136,17 +132,135 @@ class CollaborativeAgent:
         agent_name: str, 
         message: str, 
         data: Optional[Dict[str, Any]] = None,
-        skill_id: Optional[str] = None
+        skill_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        deadline: Optional[float] = None,
     ) -> Dict[str, Any]:
-        """Call another agent and get structured response."""
+        """Call another agent and get structured response.
+        
+        priority picks the collaborator's scheduling class; deadline is how
+        many seconds we are willing to wait (capped by our own deadline).
+        """
         request = AgentRequest(
             message=message,
             context=data or {},
-            skill_id=skill_id
+            skill_id=skill_id,
+            priority=priority,
+            deadline=deadline,
         )
         
         response = await self._server.call_agent(agent_name, request)
         
+        return self._to_result(response)
+    
+    async def call_agent_stream(
+        self,
+        agent_name: str,
+        message: str,
+        data: Optional[Dict[str, Any]] = None,
+        skill_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Call another agent and yield its response as it is generated.
+        
+        Yields results with status "partial" for each text chunk, followed by
+        the final result shaped like call_agent's.
+        """
+        request = AgentRequest(
+            message=message,
+            context=data or {},
+            skill_id=skill_id,
+            priority=priority,
+            deadline=deadline,
+        )
+        
+        async for response in self._server.call_agent_stream(agent_name, request):
+            yield self._to_result(response)
+    
+    async def call_agents(
+        self,
+        calls: List[Dict[str, Any]],
+        mode: str = "all",
+        k: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Call several agents concurrently (scatter/gather).
+        
+        Args:
+            calls: One dict per call with "agent_name", "message" and optionally
+                "data", "skill_id", "priority" and "timeout" (seconds)
+            mode: "all", "first" or "quorum" (see A2AAgentServer.call_agents)
+            k: Number of successful responses needed by "first"/"quorum"
+            max_concurrency: Maximum number of calls in flight at once
+            timeout: Deadline for the whole fan-out in seconds
+            
+        Returns:
+            One result per call, in order, shaped like call_agent's result
+        """
+        agent_calls = [
+            AgentCall(
+                agent_name=call["agent_name"],
+                request=AgentRequest(
+                    message=call["message"],
+                    context=call.get("data") or {},
+                    skill_id=call.get("skill_id"),
+                    priority=call.get("priority"),
+                ),
+                timeout=call.get("timeout"),
+            )
+            for call in calls
+        ]
+        responses = await self._server.call_agents(
+            agent_calls, mode=mode, k=k, max_concurrency=max_concurrency, timeout=timeout
+        )
+        return [self._to_result(response) for response in responses]
+    
+    gather = call_agents
+    
+    async def call_agent_batch(
+        self,
+        agent_name: str,
+        items: List[Union[str, Dict[str, Any]]],
+        skill_id: Optional[str] = None,
+        priority: Optional[str] = "batch",
+        max_concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Send many requests to one agent in a single batch call.
+        
+        Args:
+            agent_name: Name of the agent to call
+            items: Messages, or dicts with "message" and optionally "data",
+                "skill_id", "priority" and "deadline" (seconds)
+            skill_id: Skill for items that do not name one
+            priority: Priority class for items that do not name one
+            max_concurrency: Items the agent processes at once
+            
+        Returns:
+            One result per item, in order, shaped like call_agent's result
+        """
+        requests = [
+            AgentRequest(message=item)
+            if isinstance(item, str)
+            else AgentRequest(
+                message=item["message"],
+                context=item.get("data") or {},
+                skill_id=item.get("skill_id"),
+                priority=item.get("priority"),
+                deadline=item.get("deadline"),
+            )
+            for item in items
+        ]
+        responses = await self._server.call_agent_batch(
+            agent_name, requests, skill_id=skill_id, priority=priority, max_concurrency=max_concurrency
+        )
+        return [self._to_result(response) for response in responses]
+    
+    @staticmethod
+    def _to_result(response: AgentResponse) -> Dict[str, Any]:
         return {
             "text": response.message,
             "status": response.status,
@@ -154,6 +268,14 @@ class CollaborativeAgent:
             "skill_used": response.skill_used
         }
     
+    def find_collaborators(self, skill_id: Optional[str] = None, tag: Optional[str] = None) -> List[str]:
+        """Find healthy collaborators offering a skill id or tag."""
+        return self._server.find_collaborators(skill_id=skill_id, tag=tag)
+    
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return connection pool statistics (open, idle, waiting) per collaborator."""
+        return self._server.pool_stats()
+    
     async def process_response(self, response_text: str, context: AgentRequest) -> str:
         """
         Override this method to customize response processing.
@@ -168,14 +290,14 @@ class CollaborativeAgent:
         # Default implementation - just return the response
         return response_text
     
-    def run(self):
-        """Run the agent server."""
+    def run(self, workers: int = 1, drain_timeout: float = 30.0, uds: Optional[str] = None):
+        """Run the agent server (see A2AAgentServer.run for worker options)."""
         if self._server:
             self.logger.info(f"Starting {self.name} on port {self.port}...")
             if self.skills:
                 self.logger.info(f"Available skills: {[s.name for s in self.skills]}")
             if self.collaborators:
                 self.logger.info(f"Collaborators: {list(self.collaborators.keys())}")
-            self._server.run()
+            self._server.run(workers=workers, drain_timeout=drain_timeout, uds=uds)
         else:
             self.logger.error("Server not initialized properly")
@@ -0,0 +1,10 @@
+"""
+Offline benchmarks: a deterministic fake model, load generators and agent scenarios.
+
+Run ``python -m adk_a2a_wrapper.benchmark --help`` for the command line.
+"""
+from .fake_llm import FakeLlm
+from .load import LoadReport, a2a_sender, run_load
+from .scenarios import SCENARIOS, run_scenario
+
+__all__ = ["FakeLlm", "LoadReport", "a2a_sender", "run_load", "SCENARIOS", "run_scenario"]
@@ -0,0 +1,105 @@
+"""
+Command line for the benchmarks, e.g.
+
+    python -m adk_a2a_wrapper.benchmark --scenario chain --mode open --rps 50 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import httpx
+from ..replay import TrafficReplayer
+from .fake_llm import FakeLlm
+from .load import LOAD_MODES, a2a_sender, run_load
+from .scenarios import SCENARIOS, run_scenario
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m adk_a2a_wrapper.benchmark",
+        description="Load-test A2A agents backed by a fake model (no network or API keys needed).",
+    )
+    parser.add_argument("--scenario", choices=SCENARIOS, default="single")
+    parser.add_argument("--mode", choices=LOAD_MODES, default="closed")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight (closed loop)")
+    parser.add_argument("--rps", type=float, help="target requests per second (open loop)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to measure")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds of unmeasured load first")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake model time to first token")
+    parser.add_argument("--tokens-per-second", type=float, help="fake model output speed")
+    parser.add_argument("--output-tokens", type=int, default=32, help="fake model tokens per response")
+    parser.add_argument("--fanout", type=int, default=4, help="workers in the fanout scenario")
+    parser.add_argument("--max-concurrency", type=int, help="max_concurrency of every agent")
+    parser.add_argument(
+        "--replay", metavar="LOG",
+        help="replay a TrafficRecorder log: its requests at their recorded arrival times, "
+        "against one agent answering from the log",
+    )
+    parser.add_argument("--time-scale", type=float, default=1.0, help="multiplier for recorded timings (--replay)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--fail-p99", type=float, help="exit with status 1 if p99 latency exceeds this (seconds)")
+    parser.add_argument("--fail-errors", type=int, help="exit with status 1 if more requests than this fail")
+    return parser.parse_args(argv)
+
+
+async def benchmark(args: argparse.Namespace) -> dict:
+    llm = FakeLlm(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+    )
+    server_kwargs = {"max_concurrency": args.max_concurrency}
+    scenario, message, schedule = args.scenario, None, None
+    if args.replay:
+        replayer = TrafficReplayer(args.replay, time_scale=args.time_scale)
+        recorded = replayer.requests()
+        if not recorded:
+            raise SystemExit(f"{args.replay} has no recorded requests")
+        first = recorded[0][0]
+        scenario, server_kwargs["traffic"] = "replay", replayer
+        schedule = [(t - first) * args.time_scale for t, _ in recorded]
+        message = lambda i: recorded[i][1]
+
+    async with run_scenario(
+        "single" if args.replay else scenario, llm=llm, fanout=args.fanout, **server_kwargs
+    ) as url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+            report = await run_load(
+                a2a_sender(client, url, message) if message else a2a_sender(client, url),
+                mode=args.mode,
+                concurrency=args.concurrency,
+                rps=args.rps,
+                duration=args.duration,
+                warmup=args.warmup,
+                schedule=schedule,
+            )
+    mode = "recorded arrivals" if args.replay else f"{args.mode} loop"
+    result = {"scenario": scenario, "mode": "replay" if args.replay else args.mode, **report.to_dict()}
+    if args.replay:
+        result["replay"] = replayer.stats()
+    if not args.json:
+        print(f"{scenario} ({mode})\n{report.format()}")
+    return result
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    result = asyncio.run(benchmark(args))
+    if args.json:
+        print(json.dumps(result))
+
+    failed = False
+    if args.fail_p99 is not None and result["p99"] > args.fail_p99:
+        print(f"p99 latency {result['p99']}s exceeds {args.fail_p99}s", file=sys.stderr)
+        failed = True
+    if args.fail_errors is not None and result["errors"] > args.fail_errors:
+        print(f"{result['errors']} errors exceed {args.fail_errors}", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
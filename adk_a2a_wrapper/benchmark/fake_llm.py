@@ -0,0 +1,87 @@
+"""
+Deterministic stand-in for LiteLlm, for benchmarks that must not touch a real model.
+"""
+import asyncio
+import hashlib
+from typing import AsyncGenerator, Optional
+from google.adk.models.base_llm import BaseLlm, LlmCapabilities
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from ..context_sessions import estimate_tokens
+
+_WORDS = (
+    "sea light wind stone river night gold quiet morning song shadow field rain "
+    "ember glass cloud harbor silver thread winter bloom echo lantern tide"
+).split()
+
+
+class FakeLlm(BaseLlm):
+    """Answers every prompt with deterministic text after a configurable delay.
+
+    Use it wherever a LiteLlm model goes (Agent(model=FakeLlm()), or assign
+    it to CollaborativeAgent.adk_agent.model). The same prompt always yields
+    the same output, so runs are comparable, and usage metadata is reported
+    like a real model's.
+
+    Attributes:
+        latency: Seconds before the first token
+        tokens_per_second: Output speed (None: the whole output at once)
+        output_tokens: Number of output tokens (words) per response
+    """
+
+    model: str = "fake/echo"
+    latency: float = 0.05
+    tokens_per_second: Optional[float] = None
+    output_tokens: int = 32
+
+    @classmethod
+    def supported_models(cls) -> list:
+        return [r"fake/.*"]
+
+    @property
+    def capabilities(self) -> LlmCapabilities:
+        return LlmCapabilities()
+
+    def _prompt(self, llm_request: LlmRequest) -> str:
+        for content in reversed(llm_request.contents or []):
+            for part in content.parts or []:
+                if part.text:
+                    return part.text
+        return ""
+
+    def _words(self, prompt: str):
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        return [_WORDS[digest[i % len(digest)] % len(_WORDS)] for i in range(self.output_tokens)]
+
+    def _usage(self, prompt: str) -> types.GenerateContentResponseUsageMetadata:
+        prompt_tokens = estimate_tokens(prompt)
+        return types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=self.output_tokens,
+            total_token_count=prompt_tokens + self.output_tokens,
+        )
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        prompt = self._prompt(llm_request)
+        words = self._words(prompt)
+        await asyncio.sleep(self.latency)
+        per_token = 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+        if stream:
+            for word in words:
+                if per_token:
+                    await asyncio.sleep(per_token)
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=word + " ")]),
+                    partial=True,
+                )
+        elif per_token:
+            await asyncio.sleep(per_token * len(words))
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=" ".join(words))]),
+            usage_metadata=self._usage(prompt),
+        )
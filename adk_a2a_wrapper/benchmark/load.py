@@ -0,0 +1,228 @@
+"""
+Open- and closed-loop load generation against A2A agents.
+"""
+import asyncio
+import gc
+import random
+import resource
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+import httpx
+from a2a.client.client import A2AClient
+from a2a.types import DataPart, Message, MessageSendParams, Part, SendMessageRequest, TaskState, TextPart
+from ..models import AgentRequest
+
+LOAD_MODES = ("closed", "open")
+
+# Sends request number i; returns whether it succeeded
+Sender = Callable[[int], Awaitable[bool]]
+
+
+def rss_mb() -> float:
+    """Resident memory of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LoadReport:
+    """Throughput, latency percentiles and memory growth of one load run."""
+
+    def __init__(
+        self,
+        latencies: List[float],
+        errors: int,
+        dropped: int,
+        duration: float,
+        rss_start: float,
+        rss_end: float,
+    ):
+        self.latencies = sorted(latencies)
+        self.errors = errors
+        self.dropped = dropped
+        self.duration = duration
+        self.rss_start = rss_start
+        self.rss_end = rss_end
+
+    def to_dict(self) -> Dict[str, Any]:
+        completed = len(self.latencies)
+        return {
+            "requests": completed,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "duration": round(self.duration, 3),
+            "throughput": round(completed / self.duration, 2) if self.duration else 0.0,
+            "p50": round(_percentile(self.latencies, 0.5), 4),
+            "p90": round(_percentile(self.latencies, 0.9), 4),
+            "p99": round(_percentile(self.latencies, 0.99), 4),
+            "max": round(self.latencies[-1], 4) if self.latencies else 0.0,
+            "rss_start_mb": round(self.rss_start, 1),
+            "rss_end_mb": round(self.rss_end, 1),
+            "rss_growth_mb": round(self.rss_end - self.rss_start, 1),
+        }
+
+    def format(self) -> str:
+        d = self.to_dict()
+        return (
+            f"{d['requests']} requests in {d['duration']}s ({d['throughput']} req/s), "
+            f"{d['errors']} errors, {d['dropped']} dropped\n"
+            f"latency p50 {d['p50'] * 1000:.1f} ms, p90 {d['p90'] * 1000:.1f} ms, "
+            f"p99 {d['p99'] * 1000:.1f} ms, max {d['max'] * 1000:.1f} ms\n"
+            f"memory {d['rss_start_mb']} MB -> {d['rss_end_mb']} MB ({d['rss_growth_mb']:+} MB)"
+        )
+
+
+async def run_load(
+    send: Sender,
+    mode: str = "closed",
+    concurrency: int = 8,
+    rps: Optional[float] = None,
+    duration: float = 10.0,
+    warmup: float = 1.0,
+    poisson: bool = True,
+    max_in_flight: int = 1000,
+    schedule: Optional[Sequence[float]] = None,
+) -> LoadReport:
+    """Drive send() for duration seconds (after warmup) and report on it.
+
+    Args:
+        send: Coroutine function sending request number i, returning success
+        mode: "closed" keeps `concurrency` requests in flight, each starting
+            when the previous one finished; "open" starts requests at `rps`
+            regardless of how fast they complete
+        concurrency: Requests in flight at once (closed loop)
+        rps: Target requests per second (open loop)
+        duration: Seconds to measure
+        warmup: Seconds of unmeasured load first
+        poisson: Open loop: exponential inter-arrival times instead of fixed
+        max_in_flight: Open loop: requests beyond this many in flight are
+            dropped (and counted) instead of piling up
+        schedule: Open loop: send request i at schedule[i] seconds after
+            the start instead of at `rps` (e.g. recorded arrival times);
+            nothing is excluded as warmup
+
+    Open-loop latency is measured from each request's scheduled start, so a
+    server that falls behind shows it in the percentiles.
+    """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode {mode!r}, expected one of {LOAD_MODES}")
+    if schedule is not None:
+        mode, warmup = "open", 0.0
+    elif mode == "open" and not rps:
+        raise ValueError("Open-loop load needs a target rps or a schedule")
+
+    latencies: List[float] = []
+    counters = {"errors": 0, "dropped": 0, "sent": 0}
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + warmup
+    if schedule is not None:
+        duration = max(schedule, default=0.0)
+    stop_at = measure_from + duration
+
+    async def one(scheduled: float):
+        index = counters["sent"]
+        counters["sent"] += 1
+        try:
+            ok = await send(index)
+        except Exception:
+            ok = False
+        if scheduled >= measure_from:
+            if ok:
+                latencies.append(loop.time() - scheduled)
+            else:
+                counters["errors"] += 1
+
+    rss_start = None
+    if warmup <= 0:
+        gc.collect()
+        rss_start = rss_mb()
+
+    if mode == "closed":
+        async def worker():
+            while loop.time() < stop_at:
+                await one(loop.time())
+
+        async def mark_start():
+            nonlocal rss_start
+            await asyncio.sleep(max(0.0, measure_from - loop.time()))
+            if rss_start is None:
+                gc.collect()
+                rss_start = rss_mb()
+
+        await asyncio.gather(mark_start(), *(worker() for _ in range(concurrency)))
+    else:
+        in_flight: set = set()
+
+        def arrivals():
+            if schedule is not None:
+                for offset in sorted(schedule):
+                    yield measure_from + offset
+                return
+            at = loop.time()
+            while at < stop_at:
+                yield at
+                at += random.expovariate(rps) if poisson else 1.0 / rps
+
+        for next_at in arrivals():
+            if rss_start is None and next_at >= measure_from:
+                gc.collect()
+                rss_start = rss_mb()
+            delay = next_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                if next_at >= measure_from:
+                    counters["dropped"] += 1
+            else:
+                task = asyncio.ensure_future(one(next_at))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.wait(set(in_flight))
+
+    elapsed = max(loop.time(), stop_at) - measure_from
+    gc.collect()
+    return LoadReport(
+        latencies, counters["errors"], counters["dropped"], elapsed, rss_start or rss_mb(), rss_mb()
+    )
+
+
+def a2a_sender(
+    client: httpx.AsyncClient,
+    url: str,
+    message: Callable[[int], Union[str, AgentRequest]] = lambda i: f"Write a short poem about topic {i % 50}",
+) -> Sender:
+    """A Sender that posts SendMessageRequests to an A2A agent; success means a completed task.
+
+    message(i) gives the text of request i, or an AgentRequest whose
+    context and skill_id are sent along as a data part.
+    """
+    a2a_client = A2AClient(httpx_client=client, url=url)
+
+    async def send(index: int) -> bool:
+        request = message(index)
+        if isinstance(request, str):
+            request = AgentRequest(message=request)
+        parts = [Part(root=TextPart(text=request.message))]
+        data = dict(request.context)
+        if request.skill_id:
+            data["skill_id"] = request.skill_id
+        if request.priority:
+            data["priority"] = request.priority
+        if data:
+            parts.append(Part(root=DataPart(data=data)))
+        msg = Message(messageId=str(uuid.uuid4()), role="user", parts=parts)
+        resp = await a2a_client.send_message(SendMessageRequest(id=str(index), params=MessageSendParams(message=msg)))
+        result = getattr(resp.root, "result", None)
+        status = getattr(result, "status", None)
+        return status is not None and status.state == TaskState.completed
+
+    return send
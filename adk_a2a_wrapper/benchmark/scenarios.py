@@ -0,0 +1,122 @@
+"""
+Benchmark scenarios: agents served in-process on loopback ports, backed by FakeLlm.
+"""
+import asyncio
+import logging
+import socket
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+import uvicorn
+from ..base_agent import CollaborativeAgent
+from ..models import AgentRequest
+from .fake_llm import FakeLlm
+
+SCENARIOS = ("single", "chain", "fanout")
+
+
+class BenchmarkAgent(CollaborativeAgent):
+    """A CollaborativeAgent whose LiteLlm is replaced by a FakeLlm."""
+
+    def __init__(self, name: str, port: int, llm: FakeLlm, **kwargs):
+        super().__init__(
+            name=name,
+            model=llm.model,
+            description=f"Benchmark agent {name}",
+            instruction="Answer the request.",
+            port=port,
+            api_key="benchmark",
+            host="127.0.0.1",
+            logger=kwargs.pop("logger", logging.getLogger(f"benchmark.{name}")),
+            **kwargs,
+        )
+        self.adk_agent.model = llm
+
+
+class PoemAgent(BenchmarkAgent):
+    """Writes a poem, then has the translator translate it (as in example/poem_agent_collab.py)."""
+
+    async def process_response(self, response_text: str, context: AgentRequest) -> str:
+        translation = await self.call_agent("translator", message=response_text, data={"target_language": "es"})
+        return f"Original Poem:\n{response_text}\n\nTranslated Poem:\n{translation['text']}"
+
+
+class FanOutAgent(BenchmarkAgent):
+    """Sends its answer to every worker at once and joins their replies."""
+
+    async def process_response(self, response_text: str, context: AgentRequest) -> str:
+        results = await self.call_agents([
+            {"agent_name": name, "message": response_text} for name in self.collaborators
+        ])
+        return "\n".join(result["text"] for result in results)
+
+
+def _bind_loopback() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+async def _serve(agent: CollaborativeAgent, sock: socket.socket) -> tuple:
+    """Start uvicorn for agent on a bound socket; returns (server, serving task) once it is up."""
+    server = uvicorn.Server(uvicorn.Config(agent.server.build_app(), lifespan="on", log_level="warning"))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        if task.done():
+            task.result()
+            raise RuntimeError(f"{agent.name} stopped during startup")
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+@asynccontextmanager
+async def run_scenario(
+    name: str,
+    llm: Optional[FakeLlm] = None,
+    fanout: int = 4,
+    **server_kwargs,
+) -> AsyncIterator[str]:
+    """Serve the agents of a scenario and yield the URL to send load to.
+
+    Args:
+        name: "single" (one agent), "chain" (poem agent calling a translator)
+            or "fanout" (a coordinator calling `fanout` workers concurrently)
+        llm: Model for every agent (default FakeLlm())
+        fanout: Number of workers in the "fanout" scenario
+        server_kwargs: Passed to every agent's A2AAgentServer (e.g. max_concurrency)
+    """
+    if name not in SCENARIOS:
+        raise ValueError(f"Unknown scenario {name!r}, expected one of {SCENARIOS}")
+    llm = llm or FakeLlm()
+
+    # Collaborators first: the entry agent reads their cards at startup
+    agents: List[CollaborativeAgent] = []
+    sockets: List[socket.socket] = []
+
+    def add(agent_class, agent_name: str, collaborators: Optional[Dict[str, str]] = None) -> str:
+        sock = _bind_loopback()
+        port = sock.getsockname()[1]
+        agents.append(agent_class(agent_name, port, llm, collaborators=collaborators, **server_kwargs))
+        sockets.append(sock)
+        return f"http://127.0.0.1:{port}/"
+
+    if name == "single":
+        url = add(BenchmarkAgent, "poem_agent")
+    elif name == "chain":
+        translator = add(BenchmarkAgent, "translator")
+        url = add(PoemAgent, "poem_agent", {"translator": translator})
+    else:
+        workers = {f"worker_{i}": add(BenchmarkAgent, f"worker_{i}") for i in range(fanout)}
+        url = add(FanOutAgent, "coordinator", workers)
+
+    servers: List[tuple] = []
+    try:
+        for agent, sock in zip(agents, sockets):
+            servers.append(await _serve(agent, sock))
+        yield url
+    finally:
+        for server, task in reversed(servers):
+            server.should_exit = True
+            await task
+        for sock in sockets:
+            sock.close()
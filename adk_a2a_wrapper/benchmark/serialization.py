@@ -0,0 +1,163 @@
+"""
+Microbenchmark of the per-request serialization work, against the previous implementation.
+
+    python -m adk_a2a_wrapper.benchmark.serialization --sizes 1 16 256
+
+For each context/data size (in KB) it times the JSON handling a request
+goes through: the context injected into the prompt, the coalescing and
+response cache keys, and encoding/decoding a response as a batch result.
+"Before" reimplements what the wrapper did earlier (dict repr in prompts,
+json.dumps keys, dict-based batch lines).
+"""
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+from ..cache import ResponseCache, normalize_prompt
+from ..context_sessions import estimate_tokens
+from ..models import AgentRequest, AgentResponse
+from ..serialization import HAS_ORJSON, canonical_json, loads
+from ..singleflight import default_request_key
+
+
+def make_payload(size_kb: float, seed: int = 0) -> Dict[str, Any]:
+    """A JSON-like dict of roughly size_kb KB, mixing strings, numbers, lists and nesting."""
+    rng = random.Random(seed)
+    payload: Dict[str, Any] = {}
+    i = 0
+    while len(json.dumps(payload)) < size_kb * 1024:
+        payload[f"field_{i}"] = {
+            "id": rng.randrange(10**9),
+            "score": round(rng.random(), 6),
+            "active": rng.random() < 0.5,
+            "note": None,
+            "label": " ".join(rng.choice(("sea", "stone", "river", "light", "océano")) for _ in range(6)),
+            "tags": [rng.choice("abcdef") * 3 for _ in range(4)],
+        }
+        i += 1
+    return payload
+
+
+# The previous implementation of each step
+
+def _before_prompt(request: AgentRequest) -> str:
+    return f"{request.message}\n\nContext: {request.context}"
+
+
+def _before_coalesce_key(request: AgentRequest):
+    context = json.dumps(request.context, sort_keys=True, separators=(",", ":"), default=str)
+    return (request.skill_id or "", normalize_prompt(request.message), context)
+
+
+def _before_cache_key(request: AgentRequest) -> str:
+    payload = json.dumps(
+        ["model", "instruction", request.skill_id or "general", normalize_prompt(request.message), request.context],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _before_encode(response: AgentResponse) -> str:
+    return f'{{"index": 0, "response": {response.model_dump_json()}}}\n'
+
+
+def _before_decode(line: str) -> AgentResponse:
+    item = json.loads(line)
+    return AgentResponse.model_validate(item["response"])
+
+
+# The current implementation
+
+def _after_prompt(request: AgentRequest) -> str:
+    return f"{request.message}\n\nContext: {canonical_json(request.context)}"
+
+
+def _after_cache_key(request: AgentRequest) -> str:
+    return ResponseCache.make_key("model", "instruction", request.skill_id, request.message, request.context)
+
+
+def _after_encode(response: AgentResponse) -> str:
+    return f'{{"index":0,"response":{response.model_dump_json()}}}\n'
+
+
+def _after_decode(line: str) -> AgentResponse:
+    return AgentResponse.model_validate(loads(line)["response"])
+
+
+def cpu_seconds(fn: Callable[[], Any], min_time: float = 0.2) -> float:
+    """CPU seconds per call of fn (best of three timed loops)."""
+    number = 1
+    while True:
+        started = time.process_time()
+        for _ in range(number):
+            fn()
+        elapsed = time.process_time() - started
+        if elapsed >= min_time / 10 or number >= 1_000_000:
+            break
+        number *= 10
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = float("inf")
+    for _ in range(3):
+        started = time.process_time()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.process_time() - started) / number)
+    return best
+
+
+def run(sizes: List[float]) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        payload = make_payload(size)
+        request = AgentRequest(message="Summarize the attached records", context=payload, skill_id="summary")
+        response = AgentResponse(message="Done", data=payload)
+        before_line = _before_encode(response)
+        after_line = _after_encode(response)
+        steps = {
+            "prompt": (lambda: _before_prompt(request), lambda: _after_prompt(request)),
+            "coalesce_key": (lambda: _before_coalesce_key(request), lambda: default_request_key(request)),
+            "cache_key": (lambda: _before_cache_key(request), lambda: _after_cache_key(request)),
+            "encode_result": (lambda: _before_encode(response), lambda: _after_encode(response)),
+            "decode_result": (lambda: _before_decode(before_line), lambda: _after_decode(after_line)),
+        }
+        row: Dict[str, Any] = {"size_kb": size, "steps": {}}
+        for name, (before, after) in steps.items():
+            row["steps"][name] = {"before_us": cpu_seconds(before) * 1e6, "after_us": cpu_seconds(after) * 1e6}
+        row["before_us"] = sum(step["before_us"] for step in row["steps"].values())
+        row["after_us"] = sum(step["after_us"] for step in row["steps"].values())
+        row["prompt_tokens_before"] = estimate_tokens(_before_prompt(request))
+        row["prompt_tokens_after"] = estimate_tokens(_after_prompt(request))
+        results.append(row)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m adk_a2a_wrapper.benchmark.serialization")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 16, 256], help="payload sizes in KB")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes)
+    if args.json:
+        print(json.dumps({"orjson": HAS_ORJSON, "results": results}))
+        return 0
+
+    print(f"JSON backend: {'orjson' if HAS_ORJSON else 'json (pip install orjson for the fast path)'}")
+    for row in results:
+        print(f"\ncontext/data {row['size_kb']:g} KB          before       after")
+        for name, step in row["steps"].items():
+            print(f"  {name:<16} {step['before_us']:>9.1f} us {step['after_us']:>9.1f} us")
+        speedup = row["before_us"] / row["after_us"] if row["after_us"] else float("inf")
+        print(f"  {'total':<16} {row['before_us']:>9.1f} us {row['after_us']:>9.1f} us  ({speedup:.2f}x)")
+        print(f"  prompt tokens    {row['prompt_tokens_before']:>9} {row['prompt_tokens_after']:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
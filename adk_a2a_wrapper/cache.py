@@ -0,0 +1,151 @@
+"""
+Response cache in front of A2AAgentServer.process_request.
+"""
+import hashlib
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+from .models import AgentResponse
+from .serialization import canonical_json
+from .sqlite_store import SQLiteDatabase
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS response_cache (
+    key TEXT PRIMARY KEY,
+    skill_id TEXT,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS response_cache_created_at ON response_cache (created_at);
+"""
+
+
+def normalize_prompt(text: str) -> str:
+    """Normalize unicode and collapse whitespace so trivially different prompts share a key."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + optional SQLite file) cache of agent responses.
+
+    Entries are keyed on model, instruction, skill id and a hash of the
+    normalized prompt and request context. Only successful responses are
+    stored. Use it for deterministic skills only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 3600.0,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 100000,
+        disk_ttl: Optional[float] = 7 * 24 * 3600.0,
+        skills: Optional[List[str]] = None,
+        exclude_skills: Optional[List[str]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_max_entries = disk_max_entries
+        self.disk_ttl = disk_ttl
+        self.skills = set(skills) if skills is not None else None
+        self.exclude_skills = set(exclude_skills or [])
+        self._memory: "OrderedDict[str, Tuple[AgentResponse, float]]" = OrderedDict()
+        self.disk = SQLiteDatabase(disk_path, schema=_CACHE_SCHEMA) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def enabled_for(self, skill_id: Optional[str]) -> bool:
+        """Whether responses of a skill are cached."""
+        skill_id = skill_id or "general"
+        if skill_id in self.exclude_skills:
+            return False
+        return self.skills is None or skill_id in self.skills
+
+    @staticmethod
+    def make_key(model: str, instruction: str, skill_id: Optional[str], prompt: str, context: Dict[str, Any]) -> str:
+        payload = canonical_json([model, instruction, skill_id or "general", normalize_prompt(prompt), context])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[AgentResponse]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            response, created = entry
+            if self.ttl is None or time.time() - created <= self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return response.model_copy(deep=True)
+            del self._memory[key]
+
+        if self.disk is not None:
+            pending = self.disk.pending(("cache", key))
+            if pending is not None:
+                rows = [(pending[2][1], pending[2][0].model_dump_json())]
+            else:
+                rows = await self.disk.read("SELECT created_at, data FROM response_cache WHERE key = ?", (key,))
+            if rows and (self.disk_ttl is None or time.time() - rows[0][0] <= self.disk_ttl):
+                response = AgentResponse.model_validate_json(rows[0][1])
+                self._remember(key, response, rows[0][0])
+                self.disk_hits += 1
+                return response.model_copy(deep=True)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, response: AgentResponse, skill_id: Optional[str] = None):
+        if response.status != "success":
+            return
+        response = response.model_copy(deep=True)
+        created = time.time()
+        self._remember(key, response, created)
+        self.stores += 1
+        if self.disk is not None:
+            self.disk.write(
+                ("cache", key),
+                "INSERT OR REPLACE INTO response_cache (key, skill_id, created_at, data) VALUES (?, ?, ?, ?)",
+                lambda: (key, skill_id, created, response.model_dump_json()),
+                (response, created),
+            )
+            # Coalesced into one statement per flush
+            self.disk.write(
+                ("cache-prune",),
+                "DELETE FROM response_cache WHERE rowid IN "
+                "(SELECT rowid FROM response_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.disk_max_entries,),
+            )
+            if self.disk_ttl is not None:
+                self.disk.write(
+                    ("cache-expire",),
+                    "DELETE FROM response_cache WHERE created_at < ?",
+                    lambda: (time.time() - self.disk_ttl,),
+                )
+
+    def _remember(self, key: str, response: AgentResponse, created: float):
+        self._memory[key] = (response, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def clear(self):
+        """Drop all cached responses."""
+        self._memory.clear()
+        if self.disk is not None:
+            self.disk.write(("cache-clear",), "DELETE FROM response_cache", ())
+            await self.disk.flush()
+
+    async def close(self):
+        if self.disk is not None:
+            await self.disk.close()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
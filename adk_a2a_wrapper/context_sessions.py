@@ -0,0 +1,216 @@
+"""
+Reuse of ADK sessions across turns of the same A2A context.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.genai import types
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def event_text(event: Event) -> str:
+    """Concatenated text of an event's content."""
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text or "" for part in event.content.parts)
+
+
+async def extractive_summary(events: List[Event], token_budget: int) -> str:
+    """Summarize events by keeping the most recent lines that fit the budget."""
+    lines = []
+    used = 0
+    for event in reversed(events):
+        text = event_text(event).strip()
+        if not text:
+            continue
+        if len(text) > 400:
+            text = text[:400] + "..."
+        line = f"{event.author}: {text}"
+        cost = estimate_tokens(line)
+        if used + cost > token_budget:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(reversed(lines))
+
+
+class ContextSessionManager:
+    """Maps A2A context ids to persistent ADK sessions.
+
+    The session id is derived from the context id, so any process sharing the
+    session store (e.g. SQLite) finds the same session. Idle contexts beyond
+    max_contexts are evicted least recently used first, and sessions whose
+    history exceeds token_budget are compacted: older events are replaced by
+    a summary and only the most recent keep_recent_events are kept verbatim.
+    """
+
+    def __init__(
+        self,
+        session_service: BaseSessionService,
+        app_name: str,
+        user_id: str = "user1",
+        max_contexts: int = 1000,
+        token_budget: Optional[int] = 8000,
+        keep_recent_events: int = 4,
+        summarizer: Optional[Callable[[List[Event], int], Awaitable[str]]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.session_service = session_service
+        self.app_name = app_name
+        self.user_id = user_id
+        self.max_contexts = max_contexts
+        self.token_budget = token_budget
+        self.keep_recent_events = keep_recent_events
+        self.summarizer = summarizer or extractive_summary
+        self.logger = logger or logging.getLogger(__name__)
+        self._contexts: "OrderedDict[str, asyncio.Lock]" = OrderedDict()
+        self._finishing: set = set()
+        self.evictions = 0
+        self.compactions = 0
+
+    @staticmethod
+    def session_id_for(context_id: str) -> str:
+        return f"ctx-{context_id}"
+
+    async def acquire(self, context_id: str) -> str:
+        """Lock the context for one turn and return its ADK session id."""
+        lock = self._contexts.get(context_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._contexts[context_id] = lock
+        self._contexts.move_to_end(context_id)
+        await lock.acquire()
+
+        session_id = self.session_id_for(context_id)
+        try:
+            session = await self.session_service.get_session(
+                app_name=self.app_name, user_id=self.user_id, session_id=session_id
+            )
+            if session is None:
+                await self.session_service.create_session(
+                    app_name=self.app_name, user_id=self.user_id, session_id=session_id
+                )
+            await self._evict_idle()
+        except BaseException:
+            # The caller never gets the context, so it will not release it
+            lock.release()
+            raise
+        return session_id
+
+    async def release(self, context_id: str):
+        """Finish a turn and unlock the context.
+        
+        Compaction (if the history is over budget) runs in the background
+        before the unlock, so it does not delay the current response.
+        """
+        task = asyncio.ensure_future(self._finish_turn(context_id))
+        self._finishing.add(task)
+        task.add_done_callback(self._finishing.discard)
+
+    async def _finish_turn(self, context_id: str):
+        lock = self._contexts.get(context_id)
+        try:
+            if self.token_budget:
+                await self._maybe_compact(self.session_id_for(context_id))
+        except Exception as e:
+            self.logger.warning(f"History compaction failed for context {context_id}: {e}")
+        finally:
+            if lock is not None and lock.locked():
+                lock.release()
+
+    async def _evict_idle(self):
+        for context_id in list(self._contexts):
+            if len(self._contexts) <= self.max_contexts:
+                break
+            if self._contexts[context_id].locked():
+                continue
+            del self._contexts[context_id]
+            await self.session_service.delete_session(
+                app_name=self.app_name, user_id=self.user_id, session_id=self.session_id_for(context_id)
+            )
+            self.evictions += 1
+
+    async def _maybe_compact(self, session_id: str):
+        session = await self.session_service.get_session(
+            app_name=self.app_name, user_id=self.user_id, session_id=session_id
+        )
+        if session is None:
+            return
+        tokens = sum(estimate_tokens(event_text(event)) for event in session.events)
+        if tokens <= self.token_budget or len(session.events) <= self.keep_recent_events:
+            return
+        await self.compact(session)
+
+    async def compact(self, session: Session):
+        """Replace all but the most recent events with a summary.
+
+        The compacted history is written to a scratch session first, so a
+        failing summary or store leaves the session untouched; if replacing
+        the session itself then fails, its original history is restored.
+        """
+        split = len(session.events) - self.keep_recent_events
+        older, recent = session.events[:split], session.events[split:]
+        summary = await self.summarizer(older, self.token_budget // 2)
+
+        state = {k: v for k, v in session.state.items() if not k.startswith(("app:", "user:", "temp:"))}
+        summary_event = Event(
+            invocation_id=f"compaction-{uuid.uuid4()}",
+            author="user",
+            content=types.Content(role="user", parts=[types.Part(text=f"{SUMMARY_PREFIX}\n{summary}")]),
+        )
+        events = [summary_event] + recent
+
+        scratch_id = f"{session.id}-compacting-{uuid.uuid4().hex[:8]}"
+        try:
+            await self._write_session(scratch_id, state, events)
+            # Recreate the session under the same id with the compacted history
+            await self._delete_session(session.id)
+            try:
+                await self._write_session(session.id, state, events)
+            except BaseException:
+                self.logger.warning(f"Compacting session {session.id} failed, restoring its history")
+                await self._delete_session(session.id)
+                await self._write_session(session.id, state, session.events)
+                raise
+        finally:
+            await self._delete_session(scratch_id)
+        self.compactions += 1
+        self.logger.debug(f"Compacted session {session.id}: {len(older)} events summarized")
+
+    async def _write_session(self, session_id: str, state: Dict[str, Any], events: List[Event]):
+        """Create a session holding copies of events (their state changes are already in state)."""
+        new_session = await self.session_service.create_session(
+            app_name=self.app_name, user_id=self.user_id, session_id=session_id, state=state
+        )
+        for event in events:
+            event = event.model_copy(deep=True)
+            event.actions.state_delta = {}
+            await self.session_service.append_event(new_session, event)
+
+    async def _delete_session(self, session_id: str):
+        await self.session_service.delete_session(
+            app_name=self.app_name, user_id=self.user_id, session_id=session_id
+        )
+
+    async def wait_finishing(self, timeout: Optional[float] = None):
+        """Wait for turns still finishing (background compactions), up to timeout seconds."""
+        if self._finishing:
+            await asyncio.wait(set(self._finishing), timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "contexts": len(self._contexts),
+            "max_contexts": self.max_contexts,
+            "evictions": self.evictions,
+            "compactions": self.compactions,
+        }
@@ -0,0 +1,79 @@
+"""
+Request deadlines that follow a request through nested collaborator calls.
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Optional
+
+# Seconds kept back on every hop for the network round trip and response handling
+HOP_MARGIN = 0.05
+
+# time.monotonic() by which the request being handled must be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes before or while it runs."""
+
+    def __init__(self, message: str, started: bool):
+        super().__init__(message)
+        self.started = started
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current request's deadline, or None if it has none."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def current_deadline() -> Optional[float]:
+    """The current request's deadline as a time.monotonic() value."""
+    return _deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """Run the block with a deadline `seconds` from now (never later than an enclosing one)."""
+    deadline = _deadline.get()
+    if seconds is not None:
+        ours = time.monotonic() + seconds
+        deadline = ours if deadline is None else min(deadline, ours)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def check_deadline(started: bool = False):
+    """Raise DeadlineExceeded if the current request's deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(
+            "Deadline exceeded" + (" while running" if started else " before the request started"),
+            started=started,
+        )
+
+
+async def run_with_deadline(awaitable: Awaitable[Any]) -> Any:
+    """Await awaitable, cancelling it if the current request's deadline passes first."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, max(left, 0.0))
+    except asyncio.TimeoutError:
+        if (remaining() or 0.0) > 0:
+            raise
+        raise DeadlineExceeded("Deadline exceeded while running", started=True) from None
+
+
+def outbound_deadline(timeout: Optional[float]) -> Optional[float]:
+    """Seconds to give a nested call: the call's own timeout, shrunk to what is left of ours."""
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(left - HOP_MARGIN, 0.0)
+    return left if timeout is None else min(timeout, left)
@@ -0,0 +1,135 @@
+"""
+Concurrent scatter/gather over many awaitables with partial-result semantics,
+and bounded-parallel batches that stream results as they complete.
+"""
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+FANOUT_MODES = ("all", "first", "quorum")
+
+
+async def scatter_gather(
+    calls: Sequence[Tuple[Callable[[], Awaitable[Any]], Optional[float]]],
+    mode: str = "all",
+    k: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    is_success: Callable[[Any], bool] = lambda result: True,
+) -> List[Any]:
+    """Run calls concurrently and return their results in input order.
+
+    Args:
+        calls: (factory, timeout) pairs; each factory returns the awaitable to run
+            and timeout is that call's deadline in seconds (None for no deadline).
+        mode: "all" waits for every call to settle, "first" returns once k calls
+            succeeded, "quorum" returns once k (default: a majority) succeeded.
+        k: Number of successes required by "first" (default 1) and "quorum".
+        max_concurrency: Maximum number of calls running at once.
+        timeout: Deadline in seconds for the whole gather.
+        is_success: Predicate deciding whether a result counts as a success.
+
+    Returns:
+        One entry per call: its result, or the exception it raised.
+        Calls still running when the gather finished early ("first",
+        "quorum") are cancelled and reported as asyncio.CancelledError;
+        calls that missed their own deadline, or were still running when the
+        whole gather timed out, are reported as asyncio.TimeoutError.
+    """
+    if mode not in FANOUT_MODES:
+        raise ValueError(f"Unknown fan-out mode {mode!r}, expected one of {FANOUT_MODES}")
+    n = len(calls)
+    if mode == "first":
+        needed = k or 1
+    elif mode == "quorum":
+        needed = k or n // 2 + 1
+    else:
+        needed = n
+    needed = min(needed, n)
+
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+    results: List[Any] = [asyncio.CancelledError() for _ in range(n)]
+    started = time.monotonic()
+
+    async def run(factory: Callable[[], Awaitable[Any]]):
+        if semaphore is None:
+            return await factory()
+        async with semaphore:
+            return await factory()
+
+    tasks = {}
+    for index, (factory, call_timeout) in enumerate(calls):
+        task = asyncio.ensure_future(asyncio.wait_for(run(factory), call_timeout))
+        tasks[task] = index
+
+    pending = set(tasks)
+    successes = 0
+    try:
+        while pending:
+            remaining = None
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    for task in pending:
+                        results[tasks[task]] = asyncio.TimeoutError()
+                    break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                index = tasks[task]
+                try:
+                    results[index] = task.result()
+                except (asyncio.CancelledError, Exception) as e:
+                    results[index] = e
+                if not isinstance(results[index], BaseException) and is_success(results[index]):
+                    successes += 1
+            if mode != "all" and (successes >= needed or successes + len(pending) < needed):
+                break
+    finally:
+        # Cancel stragglers
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+    return results
+
+
+async def bounded_as_completed(
+    factories: Sequence[Callable[[], Awaitable[Any]]],
+    max_concurrency: int,
+) -> AsyncIterator[Tuple[int, Any]]:
+    """Run factories, at most max_concurrency at a time, yielding (index, result) as each settles.
+
+    The result is the exception for calls that raised (including an
+    asyncio.CancelledError a call ended in). Calls are started in input
+    order as slots free up, so a large batch never has more than
+    max_concurrency calls (plus as many unconsumed results) in memory at
+    once. Closing the iterator early cancels the calls still running.
+    """
+    results: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency)
+    indices = iter(range(len(factories)))
+    closing = False
+
+    async def worker():
+        for index in indices:
+            try:
+                result = await factories[index]()
+            except asyncio.CancelledError as e:
+                # Workers are only cancelled below; any other CancelledError is the call's result
+                if closing:
+                    raise
+                result = e
+            except Exception as e:
+                result = e
+            await results.put((index, result))
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(min(max_concurrency, len(factories)))]
+    try:
+        for _ in range(len(factories)):
+            yield await results.get()
+    finally:
+        closing = True
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
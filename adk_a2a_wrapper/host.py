@@ -0,0 +1,153 @@
+"""
+Serve many agents from one process and port, each under its own path prefix.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Hashable, List, Optional
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, Metrics
+from .wrapper import METRICS_PATH, A2AAgentServer
+
+AGENTS_INDEX_PATH = "/.well-known/agents.json"
+
+
+class MultiAgentHost:
+    """One ASGI app (and uvicorn server) for many A2AAgentServer/CollaborativeAgent instances.
+
+    Each agent is mounted under a path prefix (by default /<agent name>), so
+    its card is served at <prefix>/.well-known/agent.json and its JSON-RPC
+    endpoint at <prefix>/. All agents share the interpreter, the imported
+    libraries and the HTTP clients of their collaborator connection pools.
+
+    Args:
+        agents: Agents to mount under their default prefix
+        host: Interface to bind
+        port: Port to serve all agents on
+        public_url: Base URL clients reach the host at (for the agent cards)
+        logger: Logger for host-level messages
+        metrics: Metrics shared by the agents that have none of their own,
+            served at /metrics
+    """
+
+    def __init__(
+        self,
+        agents: Optional[List[Any]] = None,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        public_url: Optional[str] = None,
+        logger: Optional[logging.Logger] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.public_url = (public_url or f"http://localhost:{port}").rstrip("/")
+        self.logger = logger or logging.getLogger(__name__)
+        self.metrics = metrics
+        self.servers: Dict[str, A2AAgentServer] = {}
+        # Rendered agents index; the cards only change when an agent is added
+        self._index: Optional[bytes] = None
+        self.drain_timeout = 30.0
+        self.uds: Optional[str] = None
+        # HTTP clients shared by the connection pools of all mounted agents
+        self.clients: Dict[Hashable, httpx.AsyncClient] = {}
+        for agent in agents or []:
+            self.add(agent)
+
+    def add(self, agent: Any, prefix: Optional[str] = None) -> A2AAgentServer:
+        """Mount an A2AAgentServer or CollaborativeAgent under prefix (default "/<agent name>").
+
+        Returns the mounted server; its agent card now points at
+        <public_url><prefix>/.
+        """
+        server = agent if isinstance(agent, A2AAgentServer) else agent.server
+        prefix = "/" + (prefix or server.agent.name).strip("/")
+        if prefix == "/":
+            raise ValueError("Agents need a non-empty path prefix")
+        if prefix in self.servers:
+            raise ValueError(f"An agent is already mounted at {prefix}")
+        self.servers[prefix] = server
+        server.base_url = f"{self.public_url}{prefix}/"
+        server.agent_card = server._create_agent_card()
+        self._index = None
+        server.connection_pool.share_clients(self.clients)
+        if server.metrics is None:
+            server.metrics = self.metrics
+        return server
+
+    async def startup(self):
+        """Start every mounted agent."""
+        await asyncio.gather(*(server.startup() for server in self.servers.values()))
+
+    async def shutdown(self):
+        """Drain and stop every mounted agent, then close the shared clients."""
+        for server in self.servers.values():
+            server.drain_timeout = self.drain_timeout
+        results = await asyncio.gather(
+            *(server.shutdown() for server in self.servers.values()), return_exceptions=True
+        )
+        for prefix, result in zip(self.servers, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Error stopping agent at {prefix}: {result}")
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """Starlette lifespan for all mounted agents (mounted apps' own lifespans do not run)."""
+        await self.startup()
+        try:
+            yield
+        finally:
+            await self.shutdown()
+
+    async def _agents_index(self, request: Request) -> Response:
+        if self._index is None:
+            self._index = (
+                "[" + ",".join(
+                    server.agent_card.model_dump_json(exclude_none=True) for server in self.servers.values()
+                ) + "]"
+            ).encode("utf-8")
+        return Response(self._index, media_type="application/json")
+
+    async def _metrics_endpoint(self, request: Request) -> Response:
+        return Response(self.metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+    def build_app(self) -> Starlette:
+        """Build one Starlette app with every agent's app mounted under its prefix."""
+        routes = [Route(AGENTS_INDEX_PATH, self._agents_index, methods=["GET"])]
+        if self.metrics is not None:
+            routes.append(Route(METRICS_PATH, self._metrics_endpoint, methods=["GET"]))
+        routes += [Mount(prefix, app=server.build_app()) for prefix, server in self.servers.items()]
+        return Starlette(routes=routes, lifespan=self.lifespan)
+
+    def create_worker_app(self):
+        """App factory for one worker process: fresh runners and stores for every agent."""
+        self.clients.clear()
+        for server in self.servers.values():
+            server._init_components()
+        return self.build_app()
+
+    def run(self, workers: int = 1, drain_timeout: float = 30.0, uds: Optional[str] = None):
+        """Serve all mounted agents (see A2AAgentServer.run for the options)."""
+        self.drain_timeout = drain_timeout
+        self.uds = uds
+        if workers > 1:
+            from .workers import run_workers
+            run_workers(self, workers)
+            return
+
+        import uvicorn
+        uvicorn.run(
+            self.build_app(),
+            host=self.host,
+            port=self.port,
+            uds=uds,
+            timeout_graceful_shutdown=drain_timeout,
+        )
@@ -0,0 +1,168 @@
+"""
+Request, stage, token and collaborator-call metrics in the Prometheus text format.
+"""
+import bisect
+import time
+from typing import Dict, List, Sequence, Tuple
+
+# Seconds; covers cache hits through slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for values, count in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, values)} {_number(count)}")
+        return lines
+
+
+class Histogram:
+    """Bucketed observations (cumulative counts, sum and count) per label set."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "agent", "stage", "started")
+
+    def __init__(self, histogram: Histogram, agent: str, stage: str):
+        self.histogram = histogram
+        self.agent = agent
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.monotonic() - self.started, self.agent, self.stage)
+        return False
+
+
+class Metrics:
+    """The wrapper's metrics; share one instance between agents to expose them together.
+
+    Series (all labelled by agent):
+        a2a_requests_total: handled requests by skill and status
+        a2a_request_duration_seconds: time to answer a request, by skill
+        a2a_stage_duration_seconds: time per processing stage (queue, cache,
+            session, llm, process, post_process, serialize, release)
+        a2a_llm_tokens_total: prompt/completion tokens by model
+        a2a_outbound_duration_seconds: collaborator call latency by
+            collaborator and status
+        a2a_cancelled_total: work stopped by cancellation, by what was
+            stopped (execution, or agent_run for runs stopped mid-way)
+        a2a_cancelled_seconds_total: how long cancelled executions had run
+        a2a_downstream_cancels_total: cancel requests sent to collaborators,
+            by result (sent, failed)
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.requests = Counter(
+            "a2a_requests_total", "Requests handled, by skill and status", ("agent", "skill", "status")
+        )
+        self.request_seconds = Histogram(
+            "a2a_request_duration_seconds", "Time to answer a request", ("agent", "skill"), buckets
+        )
+        self.stage_seconds = Histogram(
+            "a2a_stage_duration_seconds", "Time spent per processing stage", ("agent", "stage"), buckets
+        )
+        self.llm_tokens = Counter(
+            "a2a_llm_tokens_total", "LLM tokens used, by model and kind", ("agent", "model", "kind")
+        )
+        self.outbound_seconds = Histogram(
+            "a2a_outbound_duration_seconds",
+            "Latency of calls to collaborators",
+            ("agent", "collaborator", "status"),
+            buckets,
+        )
+        self.cancelled = Counter(
+            "a2a_cancelled_total", "Work stopped by cancellation, by what was stopped", ("agent", "what")
+        )
+        self.cancelled_seconds = Counter(
+            "a2a_cancelled_seconds_total", "Seconds cancelled executions had run when stopped", ("agent",)
+        )
+        self.downstream_cancels = Counter(
+            "a2a_downstream_cancels_total", "Cancel requests sent to collaborators, by result", ("agent", "result")
+        )
+
+    def stage(self, agent: str, stage: str) -> _StageTimer:
+        """Context manager recording the duration of a stage."""
+        return _StageTimer(self.stage_seconds, agent, stage)
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in (
+            self.requests,
+            self.request_seconds,
+            self.stage_seconds,
+            self.llm_tokens,
+            self.outbound_seconds,
+            self.cancelled,
+            self.cancelled_seconds,
+            self.downstream_cancels,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
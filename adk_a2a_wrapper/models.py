@@ -8,17 +8,34 @@ class AgentRequest(BaseModel):
     context: Dict[str, Any] = Field(default_factory=dict, description="Additional context for the request")
     session_id: Optional[str] = Field(None, description="Session identifier for stateful interactions")
     skill_id: Optional[str] = Field(None, description="Specific skill to invoke")
+    priority: Optional[str] = Field(None, description="Priority class, e.g. interactive, normal or batch")
+    deadline: Optional[float] = Field(None, description="Seconds the caller is willing to wait for the response")
 
 
 class AgentResponse(BaseModel):
     """Standard A2A agent response format."""
     message: str = Field(..., description="The response message")
-    status: str = Field(default="success", description="Status of the response (success, error)")
+    status: str = Field(default="success", description="Status of the response (success, error, rejected, timeout, cancelled)")
     data: Dict[str, Any] = Field(default_factory=dict, description="Additional data returned by the agent")
     session_id: Optional[str] = Field(None, description="Session identifier for stateful interactions")
     skill_used: Optional[str] = Field(None, description="The skill that was used to generate the response")
 
 
+class AgentCall(BaseModel):
+    """A single call in a fan-out to collaborator agents."""
+    agent_name: str = Field(..., description="Name of the collaborator to call")
+    request: AgentRequest = Field(..., description="The request to send")
+    timeout: Optional[float] = Field(None, description="Deadline for this call in seconds")
+
+
+class BatchRequest(BaseModel):
+    """Many requests to one agent, sent as a single batch."""
+    requests: List[AgentRequest] = Field(..., description="The requests to process")
+    skill_id: Optional[str] = Field(None, description="Skill for requests that do not name one")
+    priority: Optional[str] = Field(None, description="Priority class for requests that do not name one")
+    max_concurrency: Optional[int] = Field(None, description="Requests processed at once (capped by the server)")
+
+
 class SkillDefinition(BaseModel):
     """Definition of an agent skill."""
     id: str = Field(..., description="Unique identifier for the skill")
@@ -28,3 +45,29 @@ class SkillDefinition(BaseModel):
     examples: Optional[List[str]] = Field(None, description="Example prompts that trigger this skill")
     input_schema: Optional[Dict[str, Any]] = Field(None, description="Expected input format")
     output_schema: Optional[Dict[str, Any]] = Field(None, description="Expected output format")
+
+
+class CollaboratorConfig(BaseModel):
+    """Connection settings for a collaborator agent."""
+    url: str = Field(..., description="Base URL of the collaborator's A2A endpoint")
+    max_connections: int = Field(100, description="Maximum number of open connections to the collaborator")
+    max_keepalive_connections: int = Field(20, description="Maximum number of idle connections kept alive")
+    keepalive_expiry: float = Field(30.0, description="Seconds an idle connection is kept before closing")
+    http2: bool = Field(False, description="Negotiate HTTP/2 with the collaborator (requires the h2 package)")
+    timeout: float = Field(60.0, description="Request timeout in seconds")
+    replicas: List[str] = Field(default_factory=list, description="Additional URLs of replicas serving the same agent")
+    balancing: str = Field("round_robin", description="How calls are spread over replicas: round_robin, least_outstanding or p2c_ewma")
+    retries: int = Field(0, description="Extra attempts after a retryable failure (unreachable, 5xx, timeout, rejected)")
+    retry_backoff: float = Field(0.1, description="Base delay in seconds of the jittered exponential retry backoff")
+    retry_max_backoff: float = Field(2.0, description="Maximum delay in seconds between retries")
+    hedge_percentile: Optional[float] = Field(None, description="Send a duplicate request once a call is slower than this percentile (e.g. 0.95) of recent calls")
+    hedge_delay: Optional[float] = Field(None, description="Fixed hedging delay in seconds (used until enough latencies are known for hedge_percentile)")
+    circuit_failure_rate: Optional[float] = Field(None, description="Open the circuit breaker at this share of failed calls (None disables it)")
+    circuit_min_requests: int = Field(10, description="Calls needed in the window before the breaker may open")
+    circuit_window: float = Field(30.0, description="Seconds of call outcomes the breaker looks at")
+    circuit_reset_timeout: float = Field(10.0, description="Seconds the breaker stays open before letting a probe call through")
+
+    @property
+    def urls(self) -> List[str]:
+        """All replica URLs, the primary url first."""
+        return [self.url] + list(self.replicas)
@@ -0,0 +1,216 @@
+"""
+Token-bucket rate limiting of outbound LLM calls, per model.
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from .context_sessions import estimate_tokens
+
+# Bucket state: (available tokens, time of last update)
+BucketState = Tuple[float, float]
+
+
+def reserve(state: Optional[BucketState], now: float, rate: float, capacity: float, amount: float):
+    """Take amount from a bucket, going into debt if needed.
+
+    Returns the new state and how long the caller must wait before its
+    reservation is covered. Callers queue up behind earlier debt, so bursts
+    are smoothed to the refill rate instead of failing.
+    """
+    tokens, updated = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    # A negative amount (a refund) may not overfill the bucket either
+    tokens = min(capacity, tokens - amount)
+    wait = -tokens / rate if tokens < 0 else 0.0
+    return (tokens, now), wait
+
+
+def _request_tokens(llm_request: LlmRequest) -> int:
+    text = []
+    config = llm_request.config
+    if config is not None and config.system_instruction:
+        text.append(str(config.system_instruction))
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                text.append(part.text)
+    return estimate_tokens("".join(text))
+
+
+class _MemoryBuckets:
+    def __init__(self):
+        self.buckets: Dict[str, BucketState] = {}
+
+    async def reserve(self, key: str, rate: float, capacity: float, amount: float) -> float:
+        self.buckets[key], wait = reserve(self.buckets.get(key), time.time(), rate, capacity, amount)
+        return wait
+
+
+class _SQLiteBuckets:
+    """Bucket state in a SQLite file, so processes on one host share limits."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        # One connection per process; a forked child opens its own
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+    def _reserve(self, key: str, rate: float, capacity: float, amount: float) -> float:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+                state, wait = reserve(row, time.time(), rate, capacity, amount)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (key, *state),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def reserve(self, key: str, rate: float, capacity: float, amount: float) -> float:
+        return await asyncio.to_thread(self._reserve, key, rate, capacity, amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits per model.
+
+    Share one instance between agents to share the limits within a process;
+    give it a path to share them, through a SQLite file, with other processes
+    on the same host. Calls over the limit wait for their turn rather than
+    fail. Token use is estimated up front from the prompt plus
+    output_token_estimate and corrected once the response reports usage.
+
+    Args:
+        rpm: Default requests per minute (None for unlimited)
+        tpm: Default tokens per minute (None for unlimited)
+        limits: Per-model overrides, {model: {"rpm": ..., "tpm": ...}}
+        burst: Seconds worth of the rate that may be used at once; the
+            default 60 allows a limit's whole per-minute budget in one go
+        output_token_estimate: Expected output tokens per call
+        path: SQLite file for limits shared across processes
+    """
+
+    def __init__(
+        self,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        limits: Optional[Dict[str, Dict[str, float]]] = None,
+        burst: float = 60.0,
+        output_token_estimate: int = 256,
+        path: Optional[str] = None,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.limits = limits or {}
+        self.burst = burst
+        self.output_token_estimate = output_token_estimate
+        self.buckets = _SQLiteBuckets(path) if path else _MemoryBuckets()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _limits_for(self, model: str) -> Tuple[Optional[float], Optional[float]]:
+        limits = self.limits.get(model, {})
+        return limits.get("rpm", self.rpm), limits.get("tpm", self.tpm)
+
+    def _model_stats(self, model: str) -> Dict[str, float]:
+        if model not in self._stats:
+            self._stats[model] = {"requests": 0, "tokens": 0, "delayed": 0, "wait_seconds": 0.0}
+        return self._stats[model]
+
+    async def _take(self, key: str, per_minute: float, amount: float) -> float:
+        rate = per_minute / 60.0
+        # A single call larger than the bucket still goes through on an idle one
+        capacity = max(rate * self.burst, amount, 1.0)
+        return await self.buckets.reserve(key, rate, capacity, amount)
+
+    async def acquire(self, model: str, tokens: int = 0) -> float:
+        """Wait until a call of about `tokens` tokens to model is allowed; returns the wait."""
+        rpm, tpm = self._limits_for(model)
+        wait = 0.0
+        if rpm:
+            wait = max(wait, await self._take(f"{model}:rpm", rpm, 1))
+        if tpm and tokens:
+            wait = max(wait, await self._take(f"{model}:tpm", tpm, tokens))
+        stats = self._model_stats(model)
+        stats["requests"] += 1
+        stats["tokens"] += tokens
+        if wait > 0:
+            stats["delayed"] += 1
+            stats["wait_seconds"] += wait
+            await asyncio.sleep(wait)
+        return wait
+
+    async def settle(self, model: str, estimated: int, actual: int):
+        """Correct the token bucket once a call's actual usage is known."""
+        _, tpm = self._limits_for(model)
+        self._model_stats(model)["tokens"] += actual - estimated
+        if tpm and actual != estimated:
+            # A negative amount refunds an overestimate
+            await self._take(f"{model}:tpm", tpm, actual - estimated)
+
+    def estimate(self, llm_request: LlmRequest) -> int:
+        config = llm_request.config
+        output = (config.max_output_tokens if config is not None else None) or self.output_token_estimate
+        return _request_tokens(llm_request) + output
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {model: dict(stats) for model, stats in self._stats.items()}
+
+
+class RateLimitedLlm(BaseLlm):
+    """Wraps an ADK model so that every call goes through a RateLimiter."""
+
+    llm: BaseLlm
+    limiter: Any
+
+    @property
+    def capabilities(self):
+        return self.llm.capabilities
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        estimated = self.limiter.estimate(llm_request)
+        await self.limiter.acquire(self.model, estimated)
+        used = None
+        async for response in self.llm.generate_content_async(llm_request, stream=stream):
+            usage = response.usage_metadata
+            if usage is not None and usage.total_token_count:
+                used = usage.total_token_count
+            yield response
+        if used is not None:
+            await self.limiter.settle(self.model, estimated, used)
+
+    def connect(self, llm_request: LlmRequest):
+        return self.llm.connect(llm_request)
+
+
+def apply_rate_limiter(agent: BaseAgent, limiter: RateLimiter):
+    """Route the model calls of agent and its sub-agents through limiter."""
+    if isinstance(agent, LlmAgent) and agent.model and not isinstance(agent.model, RateLimitedLlm):
+        llm = agent.canonical_model
+        agent.model = RateLimitedLlm(model=llm.model, llm=llm, limiter=limiter)
+    for sub_agent in agent.sub_agents:
+        apply_rate_limiter(sub_agent, limiter)
@@ -0,0 +1,228 @@
+"""
+Collaborator registry: cached agent cards, health probing and skill lookup.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional, List, Set
+from a2a.types import AgentCard
+from .transport import ConnectionPool, get_local_server, http_url, is_local
+
+AGENT_CARD_PATH = "/.well-known/agent.json"
+
+
+class CollaboratorState:
+    """What the registry knows about one collaborator."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        self.card: Optional[AgentCard] = None
+        self.card_fetched_at: Optional[float] = None
+        self.healthy: Optional[bool] = None
+        self.consecutive_failures = 0
+        self.last_checked: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.unhealthy_since: Optional[float] = None
+
+    @property
+    def card_url(self) -> str:
+        return http_url(self.url).rstrip("/") + AGENT_CARD_PATH
+
+
+class CollaboratorRegistry:
+    """Keeps collaborator agent cards and health status up to date in the background.
+
+    State is kept per endpoint (pool entry). With groups, a collaborator name
+    stands for several replica endpoints: it is healthy while any replica is,
+    and skill lookups return collaborator names.
+
+    A collaborator marked unhealthy is skipped for unhealthy_cooldown
+    seconds after its last failure; then calls are let through again, so it
+    recovers on the first success even when it is not probed
+    (health_check_interval=None). A failed retry restarts the cooldown.
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        card_ttl: float = 300.0,
+        health_check_interval: Optional[float] = 10.0,
+        health_check_timeout: float = 2.0,
+        failure_threshold: int = 2,
+        logger: Optional[logging.Logger] = None,
+        groups: Optional[Dict[str, List[str]]] = None,
+        unhealthy_cooldown: float = 30.0,
+    ):
+        self.pool = pool
+        self.card_ttl = card_ttl
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.failure_threshold = failure_threshold
+        self.unhealthy_cooldown = unhealthy_cooldown
+        self.logger = logger or logging.getLogger(__name__)
+        self.collaborators: Dict[str, CollaboratorState] = {
+            name: CollaboratorState(name, config.url) for name, config in pool.configs.items()
+        }
+        self.groups = groups or {}
+        self._group_of = {endpoint: name for name, endpoints in self.groups.items() for endpoint in endpoints}
+        self._skill_index: Dict[str, Set[str]] = {}
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Fetch all cards once and start the background probe loop."""
+        await self.check_all()
+        if self.health_check_interval and self._task is None:
+            self._task = asyncio.create_task(self._probe_loop())
+
+    async def close(self):
+        """Stop the background probe loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _probe_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_all()
+            except Exception as e:
+                self.logger.warning(f"Collaborator health check failed: {e}")
+
+    async def check_all(self):
+        """Probe every collaborator, refreshing cards whose TTL has expired."""
+        await asyncio.gather(*(self.check(name) for name in self.collaborators))
+
+    async def check(self, name: str) -> bool:
+        """Probe one collaborator; fetches the card when stale, otherwise a cheap HEAD."""
+        state = self.collaborators[name]
+        try:
+            if is_local(state.url):
+                # In-process peers are up while they are registered
+                card = get_local_server(state.url).agent_card
+                if card is not state.card:
+                    self._set_card(state, card)
+                self.mark_healthy(name)
+                return True
+            client = self.pool.get_client(name)
+            if self._card_is_stale(state):
+                resp = await client.get(state.card_url, timeout=self.health_check_timeout)
+                resp.raise_for_status()
+                self._set_card(state, AgentCard.model_validate(resp.json()))
+            else:
+                resp = await client.head(state.card_url, timeout=self.health_check_timeout)
+                resp.raise_for_status()
+            self.mark_healthy(name)
+        except Exception as e:
+            self.mark_unhealthy(name, e)
+        finally:
+            state.last_checked = time.time()
+        return bool(state.healthy)
+
+    def _card_is_stale(self, state: CollaboratorState) -> bool:
+        return state.card is None or time.monotonic() - state.card_fetched_at >= self.card_ttl
+
+    def _set_card(self, state: CollaboratorState, card: AgentCard):
+        state.card = card
+        state.card_fetched_at = time.monotonic()
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        skill_index: Dict[str, Set[str]] = {}
+        tag_index: Dict[str, Set[str]] = {}
+        for name, state in self.collaborators.items():
+            if not state.card:
+                continue
+            name = self._group_of.get(name, name)
+            for skill in state.card.skills:
+                skill_index.setdefault(skill.id, set()).add(name)
+                for tag in skill.tags or []:
+                    tag_index.setdefault(tag, set()).add(name)
+        self._skill_index = skill_index
+        self._tag_index = tag_index
+
+    def mark_healthy(self, name: str):
+        """Record a successful interaction with a collaborator."""
+        state = self.collaborators.get(name)
+        if state is None:
+            return
+        if state.healthy is False:
+            self.logger.info(f"Collaborator {name} is healthy again")
+        state.healthy = True
+        state.consecutive_failures = 0
+        state.last_error = None
+        state.unhealthy_since = None
+
+    def mark_unhealthy(self, name: str, error: Optional[Exception] = None):
+        """Record a failed interaction; the peer is marked down after enough failures."""
+        state = self.collaborators.get(name)
+        if state is None:
+            return
+        state.consecutive_failures += 1
+        state.last_error = str(error) if error else None
+        if state.consecutive_failures >= self.failure_threshold:
+            if state.healthy is not False:
+                self.logger.warning(f"Collaborator {name} marked unhealthy: {state.last_error}")
+                state.healthy = False
+            state.unhealthy_since = time.monotonic()
+
+    def _endpoints(self, name: str) -> List[str]:
+        return self.groups.get(name, [name])
+
+    def is_healthy(self, name: str) -> bool:
+        """Whether calls to a collaborator (any of its replicas) should be attempted.
+
+        Unknown health counts as healthy, and so does an unhealthy mark whose
+        cooldown has expired.
+        """
+        now = time.monotonic()
+        for endpoint in self._endpoints(name):
+            state = self.collaborators.get(endpoint)
+            if state is None or state.healthy is not False:
+                return True
+            if state.unhealthy_since is None or now - state.unhealthy_since >= self.unhealthy_cooldown:
+                return True
+        return False
+
+    def get_card(self, name: str) -> Optional[AgentCard]:
+        """Return the cached agent card for a collaborator, if any."""
+        for endpoint in self._endpoints(name):
+            state = self.collaborators.get(endpoint)
+            if state and state.card:
+                return state.card
+        return None
+
+    def supports_streaming(self, name: str) -> bool:
+        """Whether the collaborator's card advertises streaming."""
+        card = self.get_card(name)
+        return bool(card and card.capabilities and card.capabilities.streaming)
+
+    def find_by_skill(self, skill_id: str, healthy_only: bool = True) -> List[str]:
+        """Names of collaborators offering a skill id."""
+        names = self._skill_index.get(skill_id, set())
+        return sorted(n for n in names if not healthy_only or self.is_healthy(n))
+
+    def find_by_tag(self, tag: str, healthy_only: bool = True) -> List[str]:
+        """Names of collaborators with at least one skill carrying a tag."""
+        names = self._tag_index.get(tag, set())
+        return sorted(n for n in names if not healthy_only or self.is_healthy(n))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return health and card status per collaborator."""
+        now = time.monotonic()
+        return {
+            name: {
+                "healthy": state.healthy,
+                "consecutive_failures": state.consecutive_failures,
+                "last_checked": state.last_checked,
+                "last_error": state.last_error,
+                "card_age": now - state.card_fetched_at if state.card_fetched_at else None,
+                "skills": [s.id for s in state.card.skills] if state.card else [],
+            }
+            for name, state in self.collaborators.items()
+        }
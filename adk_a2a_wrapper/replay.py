@@ -0,0 +1,299 @@
+"""
+Record and replay the LLM and collaborator traffic of an agent.
+
+A TrafficRecorder writes every incoming request, ADK runner event and
+call_agent response to a compact JSON-lines log (gzipped when the path ends
+in .gz). A TrafficReplayer serves those runs and responses back, with their
+original or scaled timing, instead of calling the model and collaborators.
+"""
+import asyncio
+import gzip
+import hashlib
+import logging
+import time
+from collections import deque
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from google.adk.events import Event
+from google.genai import types
+from .models import AgentRequest, AgentResponse
+from .serialization import canonical_json, dumps, loads
+
+REPLAY_MISS_MODES = ("error", "live")
+
+
+class ReplayMiss(LookupError):
+    """Nothing was recorded for a model run or call being replayed."""
+
+
+def _key(*parts: Any) -> str:
+    return hashlib.sha256(canonical_json(parts).encode("utf-8")).hexdigest()[:24]
+
+
+def run_key(prompt: str) -> str:
+    """Log key of an agent run on prompt."""
+    return _key(prompt)
+
+
+def call_key(agent_name: str, request: AgentRequest) -> str:
+    """Log key of a call to a collaborator (scheduling hints are not part of it)."""
+    return _key(agent_name, request.message, request.context, request.skill_id)
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_log(path: str) -> List[Dict[str, Any]]:
+    """All entries of a traffic log, in the order they were written."""
+    with _open(path, "r") as f:
+        return [loads(line) for line in f if line.strip()]
+
+
+class TrafficRecorder:
+    """Records an agent's traffic to a log file while it runs normally.
+
+    Log entries (one JSON object per line, "t" is seconds since recording
+    started):
+        {"k": "req", "t", "m": message, "c": context, "s": skill_id, "p": priority}
+        {"k": "run", "t", "key", "ev": [[dt, partial, text, prompt_tokens, completion_tokens], ...]}
+        {"k": "call", "t", "to": collaborator, "key", "r": [[dt, status, message, data], ...]}
+
+    Record with a single worker process: workers would interleave their
+    writes to the same file.
+
+    Args:
+        path: Log file; appended to, gzipped if it ends in .gz
+        record_requests: Also log incoming requests (to replay their arrivals)
+    """
+
+    def __init__(self, path: str, record_requests: bool = True):
+        self.path = path
+        self.record_requests = record_requests
+        self.logger = logging.getLogger(__name__)
+        self._file = None
+        self._started = time.monotonic()
+        self.entries = {"req": 0, "run": 0, "call": 0}
+
+    def _write(self, entry: Dict[str, Any]):
+        # Opened on first use, so forked workers do not share a file object
+        if self._file is None:
+            self._file = _open(self.path, "a")
+        self._file.write(dumps(entry) + "\n")
+        self.entries[entry["k"]] += 1
+
+    def _now(self) -> float:
+        return round(time.monotonic() - self._started, 4)
+
+    def request(self, request: AgentRequest):
+        """Log an incoming request."""
+        if self.record_requests:
+            self._write({
+                "k": "req",
+                "t": self._now(),
+                "m": request.message,
+                "c": request.context,
+                "s": request.skill_id,
+                "p": request.priority,
+            })
+
+    async def run(self, prompt: str, events: AsyncIterator[Event]) -> AsyncIterator[Event]:
+        """Pass the runner's events through, logging them once the final response arrives."""
+        started = time.monotonic()
+        t = self._now()
+        recorded: List[list] = []
+        async with aclosing(events):
+            async for event in events:
+                text = event.content.parts[0].text if event.content and event.content.parts else None
+                usage = event.usage_metadata
+                recorded.append([
+                    round(time.monotonic() - started, 4),
+                    1 if event.partial else 0,
+                    text or "",
+                    usage.prompt_token_count or 0 if usage else 0,
+                    usage.candidates_token_count or 0 if usage else 0,
+                ])
+                if not event.partial and event.is_final_response():
+                    self._write({"k": "run", "t": t, "key": run_key(prompt), "ev": recorded})
+                yield event
+
+    async def call(
+        self, agent_name: str, request: AgentRequest, send: Callable[[], Awaitable[AgentResponse]]
+    ) -> AgentResponse:
+        """Make a collaborator call and log its response."""
+        started = time.monotonic()
+        t = self._now()
+        response = await send()
+        self._log_call(agent_name, request, t, [_response_entry(response, time.monotonic() - started)])
+        return response
+
+    async def stream(
+        self, agent_name: str, request: AgentRequest, responses: AsyncIterator[AgentResponse]
+    ) -> AsyncIterator[AgentResponse]:
+        """Relay a streamed collaborator call, logging its partial and final responses."""
+        started = time.monotonic()
+        t = self._now()
+        recorded: List[list] = []
+        async for response in responses:
+            recorded.append(_response_entry(response, time.monotonic() - started))
+            if response.status != "partial":
+                self._log_call(agent_name, request, t, recorded)
+            yield response
+
+    def _log_call(self, agent_name: str, request: AgentRequest, t: float, recorded: List[list]):
+        self._write({"k": "call", "t": t, "to": agent_name, "key": call_key(agent_name, request), "r": recorded})
+
+    async def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"recorded": dict(self.entries)}
+
+
+def _response_entry(response: AgentResponse, elapsed: float) -> list:
+    return [round(elapsed, 4), response.status, response.message, response.data or None]
+
+
+class TrafficReplayer:
+    """Serves recorded model runs and collaborator responses instead of making them.
+
+    Runs are matched by prompt and calls by collaborator, message, context
+    and skill. Identical prompts recorded several times are replayed in turn,
+    round-robin. Replayed runs do not touch the model, the session history or
+    tools; only their events and timing are reproduced.
+
+    Args:
+        path: Log written by a TrafficRecorder
+        time_scale: Multiplier for the recorded delays (1.0 original timing,
+            0.5 twice as fast, 0 no waiting)
+        on_miss: "error" fails unrecorded runs and calls; "live" makes them
+            for real
+    """
+
+    def __init__(self, path: str, time_scale: float = 1.0, on_miss: str = "error"):
+        if on_miss not in REPLAY_MISS_MODES:
+            raise ValueError(f"Unknown on_miss {on_miss!r}, expected one of {REPLAY_MISS_MODES}")
+        self.path = path
+        self.time_scale = time_scale
+        self.on_miss = on_miss
+        self.logger = logging.getLogger(__name__)
+        self._runs: Dict[str, Deque[list]] = {}
+        self._calls: Dict[Tuple[str, str], Deque[list]] = {}
+        self._requests: List[Tuple[float, AgentRequest]] = []
+        for entry in read_log(path):
+            kind = entry.get("k")
+            if kind == "run":
+                self._runs.setdefault(entry["key"], deque()).append(entry["ev"])
+            elif kind == "call":
+                self._calls.setdefault((entry["to"], entry["key"]), deque()).append(entry["r"])
+            elif kind == "req":
+                self._requests.append((entry["t"], AgentRequest(
+                    message=entry["m"], context=entry.get("c") or {}, skill_id=entry.get("s"), priority=entry.get("p"),
+                )))
+        self.hits = 0
+        self.misses = 0
+
+    def requests(self) -> List[Tuple[float, AgentRequest]]:
+        """Recorded incoming requests as (seconds since recording started, request)."""
+        return list(self._requests)
+
+    def request(self, request: AgentRequest):
+        pass
+
+    @staticmethod
+    def _next(recorded: Dict[Any, Deque[list]], key: Any) -> Optional[list]:
+        entries = recorded.get(key)
+        if not entries:
+            return None
+        entries.rotate(-1)
+        return entries[-1]
+
+    def _miss(self, what: str) -> bool:
+        """Count a miss; whether to go live instead of failing."""
+        self.misses += 1
+        self.logger.debug(f"No recorded {what}")
+        return self.on_miss == "live"
+
+    async def _wait(self, started: float, offset: float):
+        delay = started + offset * self.time_scale - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def run(self, prompt: str, events: AsyncIterator[Event]) -> AsyncIterator[Event]:
+        """Replay the events of a recorded run on prompt (the live events are not consumed)."""
+        recorded = self._next(self._runs, run_key(prompt))
+        if recorded is None:
+            if not self._miss("run for this prompt"):
+                raise ReplayMiss("No recorded model run for this prompt")
+            async with aclosing(events):
+                async for event in events:
+                    yield event
+            return
+        self.hits += 1
+        started = time.monotonic()
+        prompt_tokens = completion_tokens = 0
+        for offset, partial, text, event_prompt_tokens, event_completion_tokens in recorded:
+            await self._wait(started, offset)
+            prompt_tokens += event_prompt_tokens
+            completion_tokens += event_completion_tokens
+            if partial or not text:
+                # Partial text, or an intermediate step (e.g. a tool call) kept for its timing only
+                content = types.Content(role="model", parts=[types.Part(text=text)]) if text else None
+                yield Event(author="replay", content=content, partial=True)
+                continue
+            # The final event carries the tokens of the whole run
+            yield Event(
+                author="replay",
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+                usage_metadata=types.GenerateContentResponseUsageMetadata(
+                    prompt_token_count=prompt_tokens,
+                    candidates_token_count=completion_tokens,
+                    total_token_count=prompt_tokens + completion_tokens,
+                ),
+            )
+
+    def _recorded_call(self, agent_name: str, request: AgentRequest) -> Optional[list]:
+        recorded = self._next(self._calls, (agent_name, call_key(agent_name, request)))
+        if recorded is not None:
+            self.hits += 1
+        return recorded
+
+    async def call(
+        self, agent_name: str, request: AgentRequest, send: Callable[[], Awaitable[AgentResponse]]
+    ) -> AgentResponse:
+        """The recorded response to a collaborator call, after its recorded latency."""
+        recorded = self._recorded_call(agent_name, request)
+        if recorded is None:
+            if self._miss(f"call to {agent_name}"):
+                return await send()
+            return AgentResponse(message=f"No recorded response from {agent_name}", status="error")
+        offset, status, message, data = recorded[-1]
+        await self._wait(time.monotonic(), offset)
+        return AgentResponse(message=message, status=status, data=data or {})
+
+    async def stream(
+        self, agent_name: str, request: AgentRequest, responses: AsyncIterator[AgentResponse]
+    ) -> AsyncIterator[AgentResponse]:
+        """Replay the partial and final responses of a recorded (streamed) call."""
+        recorded = self._recorded_call(agent_name, request)
+        if recorded is None:
+            if self._miss(f"call to {agent_name}"):
+                async for response in responses:
+                    yield response
+            else:
+                yield AgentResponse(message=f"No recorded response from {agent_name}", status="error")
+            return
+        started = time.monotonic()
+        for offset, status, message, data in recorded:
+            await self._wait(started, offset)
+            yield AgentResponse(message=message, status=status, data=data or {})
+
+    async def close(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,123 @@
+"""
+Retry backoff, latency tracking and circuit breaking for collaborator calls.
+"""
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class LatencyTracker:
+    """Recent successful call latencies, for picking a hedging delay."""
+
+    def __init__(self, window: int = 256):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class CircuitBreaker:
+    """Opens when the recent failure rate is too high, then probes for recovery.
+
+    While closed, outcomes of the last `window` seconds are kept; once at
+    least min_requests were seen and the failure share reaches failure_rate,
+    the circuit opens and calls fail fast. After reset_timeout one probe call
+    is let through (half-open): success closes the circuit, failure opens it
+    again.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_requests: int = 10,
+        window: float = 30.0,
+        reset_timeout: float = 10.0,
+    ):
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.opens = 0
+        self.short_circuited = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._probe_started: Optional[float] = None
+
+    def available(self) -> bool:
+        """Whether allow() would currently let a call through (without claiming a probe)."""
+        now = time.monotonic()
+        if self.state == OPEN:
+            return now - self.opened_at >= self.reset_timeout
+        if self.state == HALF_OPEN:
+            return self._probe_started is None or now - self._probe_started >= self.reset_timeout
+        return True
+
+    def allow(self) -> bool:
+        """Whether a call may go out now."""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.short_circuited += 1
+                return False
+            self.state = HALF_OPEN
+            self._probe_started = None
+        if self.state == HALF_OPEN:
+            # One probe at a time; a probe that never reported back (cancelled) expires
+            now = time.monotonic()
+            if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+                self.short_circuited += 1
+                return False
+            self._probe_started = now
+        return True
+
+    def record(self, success: bool):
+        """Record the outcome of a call that allow() let through."""
+        now = time.monotonic()
+        if self.state == HALF_OPEN:
+            self._probe_started = None
+            if success:
+                self.state = CLOSED
+                self._outcomes.clear()
+            else:
+                self._open(now)
+            return
+
+        self._outcomes.append((now, success))
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+        if len(self._outcomes) >= self.min_requests:
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.opens += 1
+        self._outcomes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "opens": self.opens,
+            "short_circuited": self.short_circuited,
+        }
@@ -0,0 +1,58 @@
+"""
+Fast JSON encoding for keys, prompts and logs (orjson when installed, json otherwise).
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+    _CANONICAL_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+
+def _json_dumps(value: Any, sort_keys: bool) -> str:
+    return json.dumps(value, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def dumps(value: Any) -> str:
+    """Compact JSON for value; unknown types are encoded as their str()."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=_OPTIONS).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits; json handles them
+            pass
+    return _json_dumps(value, sort_keys=False)
+
+
+def canonical_json(value: Any) -> str:
+    """Compact JSON with sorted keys: equal values always give the same text.
+
+    Used for cache and coalescing keys and for context injected into
+    prompts, where the dict repr would waste tokens (spaces, Python-only
+    literals) and depend on key order.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=_CANONICAL_OPTIONS).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits; json handles them
+            pass
+    try:
+        return _json_dumps(value, sort_keys=True)
+    except TypeError:
+        # Keys of mixed types (e.g. 1 and "a") cannot be sorted
+        return _json_dumps(value, sort_keys=False)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
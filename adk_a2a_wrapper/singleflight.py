@@ -0,0 +1,99 @@
+"""
+Coalescing of concurrent identical requests into one in-flight computation.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+from .cache import normalize_prompt
+from .models import AgentRequest
+from .serialization import canonical_json
+
+
+def default_request_key(request: AgentRequest) -> Optional[Hashable]:
+    """Requests with the same skill, normalized message and context are duplicates."""
+    return (request.skill_id or "", normalize_prompt(request.message), canonical_json(request.context))
+
+
+def _outlasts(deadline: Optional[float], other: Optional[float]) -> bool:
+    """Whether a computation under deadline runs at least as long as other allows (None: no deadline)."""
+    return deadline is None or (other is not None and other <= deadline)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters", "listeners", "deadline")
+
+    def __init__(self, deadline: Optional[float]):
+        self.task: Optional[asyncio.Future] = None
+        self.deadline = deadline
+        self.waiters = 0
+        self.listeners: List[Callable[[Any], None]] = []
+
+
+class SingleFlight:
+    """Runs at most one computation per key; concurrent callers share its result.
+
+    The computation runs in its own task, so it survives the caller that
+    started it as long as any other caller is still waiting, and is cancelled
+    once every caller has gone. Callers may pass a listener to receive the
+    progress values the computation emits (e.g. streamed text).
+
+    A computation bounded by a deadline (time.monotonic()) is only shared with
+    callers whose own deadline is no later; a caller that may wait longer
+    starts a new computation, which later callers of the key then share.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        factory: Callable[[Callable[[Any], None]], Awaitable[Any]],
+        listener: Optional[Callable[[Any], None]] = None,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """Return the result of factory(emit), shared with concurrent callers of the same key.
+
+        deadline is the one factory(emit) runs under, if any.
+        """
+        flight = self._flights.get(key)
+        if flight is not None and not _outlasts(flight.deadline, deadline):
+            flight = None
+        if flight is None:
+            flight = _Flight(deadline)
+
+            def emit(value: Any):
+                for callback in list(flight.listeners):
+                    callback(value)
+
+            flight.task = asyncio.ensure_future(factory(emit))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self._flights[key] = flight
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        if listener is not None:
+            flight.listeners.append(listener)
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if listener is not None:
+                flight.listeners.remove(listener)
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
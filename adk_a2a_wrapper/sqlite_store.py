@@ -0,0 +1,358 @@
+"""
+Durable SQLite (WAL) task and session stores with batched writes.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Union, Callable
+from a2a.server.tasks.task_store import TaskStore
+from a2a.types import Task
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import ListSessionsResponse
+from .stores import BoundedSessionService, DEFAULT_MAX_ENTRIES, DEFAULT_TTL
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    context_id TEXT,
+    state TEXT,
+    updated_at REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_context_id ON tasks (context_id);
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    updated_at REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id)
+);
+CREATE TABLE IF NOT EXISTS scoped_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+_UPSERT_TASK = "INSERT OR REPLACE INTO tasks (task_id, context_id, state, updated_at, data) VALUES (?, ?, ?, ?, ?)"
+_DELETE_TASK = "DELETE FROM tasks WHERE task_id = ?"
+_UPSERT_SESSION = "INSERT OR REPLACE INTO sessions (app_name, user_id, session_id, updated_at, data) VALUES (?, ?, ?, ?, ?)"
+_DELETE_SESSION = "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?"
+_UPSERT_STATE = "INSERT OR REPLACE INTO scoped_state (app_name, user_id, data) VALUES (?, ?, ?)"
+
+# scoped_state rows with this user_id hold app-wide state
+_APP_SCOPE = ""
+
+
+class SQLiteDatabase:
+    """One SQLite file in WAL mode with a coalescing, batched background writer.
+
+    Writes are keyed; a later write to the same key replaces an unflushed
+    earlier one, so a task that moves through several states between two
+    flushes is written once. Pending writes are committed every
+    flush_interval seconds or as soon as batch_size keys are waiting.
+    All SQLite calls run on one dedicated thread, started (and the file
+    opened) on first use, so an unused instance is safe to fork.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 0.05, schema: str = _SCHEMA):
+        self.path = path
+        self.schema = schema
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: Dict[Tuple, Tuple[str, tuple, Any]] = {}
+        self._flushing: Dict[Tuple, Tuple[str, tuple, Any]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_tasks: set = set()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.logger = logging.getLogger(__name__)
+        self.writes = 0
+        self.flushes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Only called on the database thread
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(self.schema)
+            self._conn = conn
+        return self._conn
+
+    async def read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a query on the database thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread, lambda: self._connection().execute(sql, params).fetchall())
+
+    def write(self, key: Tuple, sql: str, params: Union[tuple, Callable[[], tuple]], value: Any = None):
+        """Queue a write; value is what readers see for key until it is flushed.
+        
+        params may be a callable, evaluated at flush time, so objects written
+        several times between flushes are only serialized once.
+        """
+        self._pending[key] = (sql, params, value)
+        self.writes += 1
+        if len(self._pending) >= self.batch_size:
+            self._schedule_flush(0)
+        elif self._flush_handle is None:
+            self._schedule_flush(self.flush_interval)
+
+    def pending(self, key: Tuple) -> Optional[Tuple[str, tuple, Any]]:
+        """Return the unflushed write for key, if any."""
+        return self._pending.get(key) or self._flushing.get(key)
+
+    def _schedule_flush(self, delay: float):
+        loop = asyncio.get_running_loop()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = loop.call_later(delay, self._start_flush)
+
+    def _start_flush(self):
+        self._flush_handle = None
+        task = asyncio.ensure_future(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task):
+        self._flush_tasks.discard(task)
+        if not task.cancelled():
+            # Already logged by flush(); the writes stay pending for the next one
+            task.exception()
+
+    async def flush(self):
+        """Commit every pending write in one transaction.
+
+        If the commit fails, the writes go back to the pending set (behind any
+        newer write to the same key) and the error is raised.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            self._flushing, self._pending = self._pending, {}
+            loop = asyncio.get_running_loop()
+            try:
+                batches: Dict[str, List[tuple]] = {}
+                for sql, params, _ in self._flushing.values():
+                    batches.setdefault(sql, []).append(params() if callable(params) else params)
+                await loop.run_in_executor(self._thread, self._commit, batches)
+                self.flushes += 1
+            except BaseException as e:
+                self._pending = {**self._flushing, **self._pending}
+                self.logger.error(f"Writing {len(self._flushing)} keys to {self.path} failed: {e}")
+                raise
+            finally:
+                self._flushing = {}
+
+    def _commit(self, batches: Dict[str, List[tuple]]):
+        conn = self._connection()
+        with conn:
+            for sql, rows in batches.items():
+                conn.executemany(sql, rows)
+
+    async def close(self):
+        """Flush pending writes and close the connection."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush()
+        if self._conn is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._thread, self._conn.close)
+            self._conn = None
+        self._thread.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "pending_writes": len(self._pending),
+            "writes": self.writes,
+            "flushes": self.flushes,
+        }
+
+
+class SQLiteTaskStore(TaskStore):
+    """A2A task store persisted in SQLite, indexed by task id and context id."""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def save(self, task: Task):
+        self.db.write(
+            ("task", task.id),
+            _UPSERT_TASK,
+            lambda: (task.id, task.contextId, task.status.state.value, time.time(), task.model_dump_json()),
+            task,
+        )
+
+    async def get(self, task_id: str) -> Optional[Task]:
+        pending = self.db.pending(("task", task_id))
+        if pending is not None:
+            return pending[2]
+        rows = await self.db.read("SELECT data FROM tasks WHERE task_id = ?", (task_id,))
+        return Task.model_validate_json(rows[0][0]) if rows else None
+
+    async def delete(self, task_id: str):
+        self.db.write(("task", task_id), _DELETE_TASK, (task_id,), None)
+
+    async def list_by_context(self, context_id: str) -> List[Task]:
+        """Return all tasks of a context, oldest update first."""
+        await self.db.flush()
+        rows = await self.db.read(
+            "SELECT data FROM tasks WHERE context_id = ? ORDER BY updated_at", (context_id,)
+        )
+        return [Task.model_validate_json(row[0]) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        return self.db.stats()
+
+
+class SQLiteSessionService(BoundedSessionService):
+    """ADK session service persisted in SQLite.
+
+    Recently used sessions are kept in memory (bounded like
+    BoundedSessionService); sessions evicted from memory stay on disk and
+    are loaded again on access, also by other processes sharing the file.
+    get_session() reloads an in-memory session that another process (e.g.
+    another worker serving the same context) has updated on disk since.
+    """
+
+    def __init__(
+        self,
+        db: SQLiteDatabase,
+        max_sessions: Optional[int] = DEFAULT_MAX_ENTRIES,
+        ttl: Optional[float] = DEFAULT_TTL,
+    ):
+        super().__init__(max_sessions=max_sessions, ttl=ttl)
+        self.db = db
+
+    def _persist(self, app_name: str, user_id: str, session_id: str):
+        session = self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+        if session is not None:
+            self.db.write(
+                ("session", app_name, user_id, session_id),
+                _UPSERT_SESSION,
+                lambda: (app_name, user_id, session_id, session.last_update_time, session.model_dump_json()),
+            )
+        if app_name in self.app_state:
+            self.db.write(
+                ("state", app_name, _APP_SCOPE),
+                _UPSERT_STATE,
+                lambda: (app_name, _APP_SCOPE, json.dumps(self.app_state.get(app_name, {}), default=str)),
+            )
+        user_state = self.user_state.get(app_name, {}).get(user_id)
+        if user_state is not None:
+            self.db.write(
+                ("state", app_name, user_id),
+                _UPSERT_STATE,
+                lambda: (app_name, user_id, json.dumps(user_state, default=str)),
+            )
+
+    async def _load(self, app_name: str, user_id: str, session_id: str, fresh: bool = False) -> bool:
+        """Bring a session (and its app/user state) from disk into memory.
+
+        With fresh, a session already in memory is reloaded when its row on
+        disk is newer (written by another process).
+        """
+        cached = self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+        unflushed = self.db.pending(("session", app_name, user_id, session_id)) is not None
+        if cached is not None:
+            if not fresh or unflushed:
+                return True
+            rows = await self.db.read(
+                "SELECT updated_at FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (app_name, user_id, session_id),
+            )
+            if not rows or rows[0][0] is None or rows[0][0] <= cached.last_update_time:
+                return True
+        elif unflushed:
+            await self.db.flush()
+        rows = await self.db.read(
+            "SELECT data FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?",
+            (app_name, user_id, session_id),
+        )
+        if not rows:
+            return False
+        state_rows = await self.db.read(
+            "SELECT user_id, data FROM scoped_state WHERE app_name = ? AND user_id IN (?, ?)",
+            (app_name, _APP_SCOPE, user_id),
+        )
+        for scope, data in state_rows:
+            if scope == _APP_SCOPE:
+                self.app_state.setdefault(app_name, {}).update(json.loads(data))
+            else:
+                self.user_state.setdefault(app_name, {}).setdefault(user_id, {}).update(json.loads(data))
+        await self.evict()
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[session_id] = Session.model_validate_json(rows[0][0])
+        self._touch(app_name, user_id, session_id)
+        return True
+
+    async def create_session(self, *, app_name: str, user_id: str, state=None, session_id=None) -> Session:
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._persist(app_name, user_id, session.id)
+        return session
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str, config=None) -> Optional[Session]:
+        if not await self._load(app_name, user_id, session_id, fresh=True):
+            return None
+        return await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        await self._load(session.app_name, session.user_id, session.id)
+        event = await super().append_event(session=session, event=event)
+        if not event.partial:
+            self._persist(session.app_name, session.user_id, session.id)
+        return event
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str):
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        self.db.write(
+            ("session", app_name, user_id, session_id),
+            _DELETE_SESSION,
+            (app_name, user_id, session_id),
+        )
+
+    async def _evict_session(self, app_name: str, user_id: str, session_id: str):
+        # Only drop the in-memory copy; the session stays on disk
+        self._access.pop((app_name, user_id, session_id), None)
+        await InMemorySessionService.delete_session(
+            self, app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        await self.db.flush()
+        if user_id is None:
+            rows = await self.db.read(
+                "SELECT data FROM sessions WHERE app_name = ? ORDER BY updated_at", (app_name,)
+            )
+        else:
+            rows = await self.db.read(
+                "SELECT data FROM sessions WHERE app_name = ? AND user_id = ? ORDER BY updated_at",
+                (app_name, user_id),
+            )
+        sessions = []
+        for (data,) in rows:
+            session = Session.model_validate_json(data)
+            session.events = []
+            session.state = {}
+            sessions.append(session)
+        return ListSessionsResponse(sessions=sessions)
+
+    def stats(self, include_bytes: bool = False) -> Dict[str, Any]:
+        stats = super().stats(include_bytes=include_bytes)
+        stats["database"] = self.db.stats()
+        return stats
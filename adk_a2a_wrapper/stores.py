@@ -0,0 +1,153 @@
+"""
+Bounded, evicting session and task stores.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from a2a.server.tasks.task_store import TaskStore
+from a2a.types import Task
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL = 3600.0
+
+
+class BoundedTaskStore(TaskStore):
+    """In-memory task store with idle TTL and least-recently-used eviction."""
+
+    def __init__(self, max_tasks: Optional[int] = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = DEFAULT_TTL):
+        self.max_tasks = max_tasks
+        self.ttl = ttl
+        self.tasks: "OrderedDict[str, Tuple[Task, float]]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    async def save(self, task: Task):
+        self.tasks[task.id] = (task, time.monotonic())
+        self.tasks.move_to_end(task.id)
+        self._evict()
+
+    async def get(self, task_id: str) -> Optional[Task]:
+        entry = self.tasks.get(task_id)
+        if entry is None:
+            return None
+        task, touched = entry
+        if self.ttl is not None and time.monotonic() - touched > self.ttl:
+            del self.tasks[task_id]
+            self.expirations += 1
+            return None
+        self.tasks[task_id] = (task, time.monotonic())
+        self.tasks.move_to_end(task_id)
+        return task
+
+    async def delete(self, task_id: str):
+        self.tasks.pop(task_id, None)
+
+    def _evict(self):
+        # Entries are ordered by last access, so expired ones are at the front
+        if self.ttl is not None:
+            cutoff = time.monotonic() - self.ttl
+            while self.tasks:
+                _, touched = next(iter(self.tasks.values()))
+                if touched > cutoff:
+                    break
+                self.tasks.popitem(last=False)
+                self.expirations += 1
+        if self.max_tasks is not None:
+            while len(self.tasks) > self.max_tasks:
+                self.tasks.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self, include_bytes: bool = False) -> Dict[str, Any]:
+        """Return store counters; include_bytes serializes every task (O(n))."""
+        stats = {
+            "tasks": len(self.tasks),
+            "max_tasks": self.max_tasks,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+        if include_bytes:
+            stats["approx_bytes"] = sum(len(task.model_dump_json()) for task, _ in self.tasks.values())
+        return stats
+
+
+class BoundedSessionService(InMemorySessionService):
+    """In-memory ADK session service with idle TTL and least-recently-used eviction."""
+
+    def __init__(self, max_sessions: Optional[int] = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = DEFAULT_TTL):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._access: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def _touch(self, app_name: str, user_id: str, session_id: str):
+        key = (app_name, user_id, session_id)
+        self._access[key] = time.monotonic()
+        self._access.move_to_end(key)
+
+    async def create_session(self, *, app_name: str, user_id: str, state=None, session_id=None) -> Session:
+        await self.evict()
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._touch(app_name, user_id, session.id)
+        return session
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str, config=None) -> Optional[Session]:
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None:
+            self._touch(app_name, user_id, session_id)
+        return session
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        if (session.app_name, session.user_id, session.id) in self._access:
+            self._touch(session.app_name, session.user_id, session.id)
+        return event
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str):
+        self._access.pop((app_name, user_id, session_id), None)
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def evict(self):
+        """Drop expired sessions and, if over capacity, the least recently used ones."""
+        if self.ttl is not None:
+            cutoff = time.monotonic() - self.ttl
+            while self._access:
+                key, touched = next(iter(self._access.items()))
+                if touched > cutoff:
+                    break
+                await self._evict_session(*key)
+                self.expirations += 1
+        if self.max_sessions is not None:
+            while len(self._access) >= self.max_sessions:
+                key = next(iter(self._access))
+                await self._evict_session(*key)
+                self.evictions += 1
+
+    async def _evict_session(self, app_name: str, user_id: str, session_id: str):
+        await self.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    def stats(self, include_bytes: bool = False) -> Dict[str, Any]:
+        """Return store counters; include_bytes serializes every session (O(n))."""
+        sessions = [
+            session
+            for users in self.sessions.values()
+            for user_sessions in users.values()
+            for session in user_sessions.values()
+        ]
+        stats = {
+            "sessions": len(sessions),
+            "max_sessions": self.max_sessions,
+            "events": sum(len(session.events) for session in sessions),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+        if include_bytes:
+            stats["approx_bytes"] = sum(len(session.model_dump_json()) for session in sessions)
+        return stats
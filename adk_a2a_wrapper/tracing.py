@@ -0,0 +1,386 @@
+"""
+Lightweight distributed tracing across agent-to-agent hops.
+
+Trace context travels between agents as a W3C "traceparent" string in the
+A2A message metadata. Finished spans go to an exporter: a JSONL file or an
+OTLP/HTTP JSON collector.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, List, Optional
+import httpx
+from .serialization import dumps
+
+TRACEPARENT = "traceparent"
+
+# The span work in this context belongs to
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+_OTLP_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def parse_traceparent(value: Any) -> Optional[tuple]:
+    """(trace_id, parent span id, sampled) from a traceparent string, or None if malformed."""
+    if not isinstance(value, str):
+        return None
+    parts = value.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+class Span:
+    """A timed operation within a trace. Unsampled spans only carry context."""
+
+    __slots__ = (
+        "tracer", "trace_id", "span_id", "parent_id", "name", "service", "kind",
+        "sampled", "start", "end_time", "attributes", "status", "status_message", "_token",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        trace_id: str,
+        parent_id: Optional[str],
+        name: str,
+        service: str,
+        kind: str,
+        sampled: bool,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.service = service
+        self.kind = kind
+        self.sampled = sampled
+        self.start = time.time()
+        self.end_time: Optional[float] = None
+        self.attributes = attributes or {}
+        self.status = "unset"
+        self.status_message: Optional[str] = None
+        self._token: Optional[Token] = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_status(self, status: str, message: Optional[str] = None):
+        """Mark the span "ok" or "error"."""
+        self.status = status
+        self.status_message = message
+
+    def activate(self) -> "Span":
+        """Make this the current span until end()."""
+        self._token = _current_span.set(self)
+        return self
+
+    def end(self):
+        if self.end_time is not None:
+            return
+        self.end_time = time.time()
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        if self.sampled:
+            self.tracer._finish(self)
+
+    def __enter__(self) -> "Span":
+        return self.activate()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None and self.status == "unset":
+            self.set_status("error", f"{exc_type.__name__}: {exc}")
+        self.end()
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "service": self.service,
+            "kind": self.kind,
+            "start": self.start,
+            "end": self.end_time,
+            "duration_ms": round((self.end_time - self.start) * 1000, 3),
+            "status": self.status,
+            "status_message": self.status_message,
+            "attributes": self.attributes,
+        }
+
+
+class _NoSpan:
+    """Stands in for a span when there is nothing to record."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class JsonlExporter:
+    """Appends each finished span as one JSON line to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", buffering=1 << 16)
+
+    def export(self, spans: List[Span]):
+        for span in spans:
+            self._file.write(dumps(span.to_dict()) + "\n")
+
+    async def flush(self):
+        self._file.flush()
+
+    async def close(self):
+        self._file.close()
+
+
+class OTLPExporter:
+    """Sends spans in batches to an OTLP/HTTP collector as JSON (e.g. http://localhost:4318/v1/traces)."""
+
+    def __init__(self, endpoint: str = "http://localhost:4318/v1/traces", timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self._client = None
+        self._sending: set = set()
+
+    def export(self, spans: List[Span]):
+        payload = self.encode(spans)
+        try:
+            task = asyncio.get_running_loop().create_task(self._send(payload))
+        except RuntimeError:
+            self.logger.debug(f"Dropped {len(spans)} span(s): no event loop to send them from")
+            return
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    @staticmethod
+    def encode(spans: List[Span]) -> Dict[str, Any]:
+        """The OTLP JSON request body for spans, grouped by service."""
+        by_service: Dict[str, List[Dict[str, Any]]] = {}
+        for span in spans:
+            by_service.setdefault(span.service, []).append({
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": span.parent_id or "",
+                "name": span.name,
+                "kind": _OTLP_KINDS.get(span.kind, 1),
+                "startTimeUnixNano": str(int(span.start * 1e9)),
+                "endTimeUnixNano": str(int(span.end_time * 1e9)),
+                "attributes": [
+                    {"key": key, "value": {"stringValue": str(value)}} for key, value in span.attributes.items()
+                ],
+                "status": {
+                    "code": {"ok": 1, "error": 2}.get(span.status, 0),
+                    "message": span.status_message or "",
+                },
+            })
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+                    "scopeSpans": [{"scope": {"name": "adk_a2a_wrapper"}, "spans": service_spans}],
+                }
+                for service, service_spans in by_service.items()
+            ]
+        }
+
+    async def _send(self, payload: Dict[str, Any]):
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        try:
+            resp = await self._client.post(
+                self.endpoint, content=dumps(payload), headers={"Content-Type": "application/json"}
+            )
+            resp.raise_for_status()
+        except Exception as e:
+            self.logger.warning(f"Could not export spans to {self.endpoint}: {e}")
+
+    async def flush(self):
+        if self._sending:
+            await asyncio.wait(set(self._sending), timeout=self.timeout)
+
+    async def close(self):
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class Tracer:
+    """Creates spans and hands finished, sampled ones to an exporter in batches.
+
+    The sampling decision is made once per trace, where it starts; agents
+    further down follow the caller's decision carried in the traceparent,
+    so a trace is either recorded on every hop or on none. Unsampled
+    requests still propagate their trace id (e.g. for log correlation) but
+    record nothing.
+
+    Args:
+        exporter: Receives finished spans (JsonlExporter, OTLPExporter, ...)
+        sample_rate: Share of new traces to record, 0.0-1.0
+        batch_size: Spans buffered before they are exported
+        flush_interval: Seconds after which a partial batch is exported
+    """
+
+    def __init__(
+        self,
+        exporter: Any = None,
+        sample_rate: float = 1.0,
+        batch_size: int = 128,
+        flush_interval: float = 5.0,
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Span] = []
+        self._last_flush = time.monotonic()
+        self.traces_started = 0
+        self.traces_sampled = 0
+        self.spans_recorded = 0
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        return _current_span.get()
+
+    def start_trace(
+        self,
+        name: str,
+        service: str,
+        traceparent: Optional[str] = None,
+        activate: bool = True,
+        **attributes: Any,
+    ) -> Span:
+        """Start the server span of a request, continuing the caller's trace if any.
+
+        The span becomes the current one unless activate is False (see use_span).
+        """
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = _new_id(16), None
+            sampled = random.random() < self.sample_rate
+            self.traces_started += 1
+            self.traces_sampled += sampled
+        span = Span(self, trace_id, parent_id, name, service, "server", sampled, attributes)
+        return span.activate() if activate else span
+
+    def span(self, name: str, service: str, kind: str = "internal", **attributes: Any):
+        """Context manager for a child of the current span (a no-op outside sampled traces)."""
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            return _NO_SPAN
+        return Span(self, parent.trace_id, parent.span_id, name, service, kind, True, attributes)
+
+    def start_span(self, name: str, service: str, kind: str = "internal", **attributes: Any) -> Optional[Span]:
+        """A child of the current span that is not made current; end() it when done."""
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            return None
+        return Span(self, parent.trace_id, parent.span_id, name, service, kind, True, attributes)
+
+    def record(self, name: str, service: str, start: float, end: float, **attributes: Any):
+        """Record an already finished child of the current span, from time.time() values."""
+        span = self.start_span(name, service, **attributes)
+        if span is not None:
+            span.start = start
+            span.end_time = end
+            self._finish(span)
+
+    def inject(self) -> Optional[str]:
+        """traceparent to send along with an outgoing call, if a trace is active."""
+        span = _current_span.get()
+        return span.traceparent if span is not None else None
+
+    def _finish(self, span: Span):
+        self.spans_recorded += 1
+        if self.exporter is None:
+            return
+        self._buffer.append(span)
+        now = time.monotonic()
+        if len(self._buffer) >= self.batch_size or now - self._last_flush >= self.flush_interval:
+            self._export(now)
+
+    def _export(self, now: float):
+        spans, self._buffer = self._buffer, []
+        self._last_flush = now
+        if spans:
+            try:
+                self.exporter.export(spans)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Could not export {len(spans)} span(s): {e}")
+
+    async def flush(self):
+        """Export buffered spans now."""
+        self._export(time.monotonic())
+        if self.exporter is not None:
+            await self.exporter.flush()
+
+    async def close(self):
+        await self.flush()
+        if self.exporter is not None:
+            await self.exporter.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "traces_started": self.traces_started,
+            "traces_sampled": self.traces_sampled,
+            "spans_recorded": self.spans_recorded,
+            "spans_buffered": len(self._buffer),
+        }
+
+
+class use_span:
+    """Make span the current one for the block (in the running task only)."""
+
+    def __init__(self, span: Optional[Span]):
+        self.span = span
+        self._token: Optional[Token] = None
+
+    def __enter__(self) -> Optional[Span]:
+        if self.span is not None:
+            self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, *exc_info):
+        if self._token is not None:
+            _current_span.reset(self._token)
+        return False
+
+
+class TraceLogFilter(logging.Filter):
+    """Adds trace_id and span_id of the current span to log records (use %(trace_id)s in formats)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = _current_span.get()
+        record.trace_id = span.trace_id if span is not None else "-"
+        record.span_id = span.span_id if span is not None else "-"
+        return True
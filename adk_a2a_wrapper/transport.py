@@ -0,0 +1,240 @@
+"""
+Pooled HTTP transport shared by all collaborator calls of a server.
+
+Besides http(s):// URLs, collaborators can be reached over a Unix domain
+socket ("unix:///path/to/agent.sock") or, when they run in the same
+process, directly ("local://agent_name").
+"""
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Hashable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import httpx
+from .models import CollaboratorConfig
+
+LOCAL_SCHEME = "local://"
+UNIX_SCHEME = "unix://"
+
+# Servers in this process that local:// URLs resolve to, by name
+_local_servers: Dict[str, Any] = {}
+
+
+class LocalAgentUnavailable(ConnectionError):
+    """Raised when no server in this process is registered under a local:// name."""
+
+
+def register_local(name: str, server: Any):
+    """Make a server reachable in-process as local://name."""
+    _local_servers[name] = server
+
+
+def unregister_local(name: str, server: Any):
+    """Remove a local registration, unless another server has taken the name since."""
+    if _local_servers.get(name) is server:
+        del _local_servers[name]
+
+
+def is_local(url: str) -> bool:
+    return url.startswith(LOCAL_SCHEME)
+
+
+def get_local_server(url: str) -> Any:
+    """The in-process server a local:// URL points to."""
+    name = url[len(LOCAL_SCHEME):].strip("/")
+    server = _local_servers.get(name)
+    if server is None:
+        raise LocalAgentUnavailable(f"No agent named {name!r} is running in this process")
+    return server
+
+
+def unix_socket_path(url: str) -> Optional[str]:
+    """The socket path of a unix:// URL, or None for other URLs."""
+    return url[len(UNIX_SCHEME):] if url.startswith(UNIX_SCHEME) else None
+
+
+def http_url(url: str) -> str:
+    """The URL HTTP requests are addressed to (unix:// peers are reached via their socket)."""
+    return "http://localhost/" if unix_socket_path(url) is not None else url
+
+
+def normalize_collaborators(
+    collaborators: Optional[Dict[str, Union[str, List[str], CollaboratorConfig]]]
+) -> Dict[str, CollaboratorConfig]:
+    """Turn a name -> URL(s)/config mapping into a name -> CollaboratorConfig mapping."""
+    configs = {}
+    for name, value in (collaborators or {}).items():
+        if isinstance(value, CollaboratorConfig):
+            configs[name] = value
+        elif isinstance(value, dict):
+            configs[name] = CollaboratorConfig(**value)
+        elif isinstance(value, (list, tuple)):
+            configs[name] = CollaboratorConfig(url=value[0], replicas=list(value[1:]))
+        else:
+            configs[name] = CollaboratorConfig(url=value)
+    return configs
+
+
+def expand_replicas(
+    configs: Dict[str, CollaboratorConfig]
+) -> Tuple[Dict[str, CollaboratorConfig], Dict[str, List[str]]]:
+    """Split collaborators with replicas into one endpoint per URL.
+
+    Returns the endpoint -> config mapping (one connection pool and health
+    state each) and the collaborator name -> endpoint names mapping. A
+    collaborator with a single URL keeps its name as its endpoint name;
+    replicas are named "name#0", "name#1", ...
+    """
+    endpoints: Dict[str, CollaboratorConfig] = {}
+    groups: Dict[str, List[str]] = {}
+    for name, config in configs.items():
+        if not config.replicas:
+            endpoints[name] = config
+            groups[name] = [name]
+            continue
+        groups[name] = []
+        for index, url in enumerate(config.urls):
+            endpoint = f"{name}#{index}"
+            endpoints[endpoint] = config.model_copy(update={"url": url, "replicas": []})
+            groups[name].append(endpoint)
+    return endpoints, groups
+
+
+def _client_key(config: CollaboratorConfig) -> Hashable:
+    """Collaborators with the same origin (or socket) and settings share one client."""
+    parts = urlsplit(config.url)
+    origin = unix_socket_path(config.url) or f"{parts.scheme}://{parts.netloc}"
+    return (
+        origin,
+        config.max_connections,
+        config.max_keepalive_connections,
+        config.keepalive_expiry,
+        config.http2,
+        config.timeout,
+    )
+
+
+class ConnectionPool:
+    """Long-lived, keep-alive HTTP clients, one per collaborator origin."""
+
+    def __init__(
+        self,
+        configs: Optional[Dict[str, CollaboratorConfig]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.configs = dict(configs or {})
+        self.logger = logger or logging.getLogger(__name__)
+        self._clients: Dict[Hashable, httpx.AsyncClient] = {}
+        self._owns_clients = True
+        self._in_flight: Dict[str, int] = {}
+
+    def add(self, name: str, config: CollaboratorConfig):
+        """Register (or replace) the settings used for a collaborator."""
+        self.configs[name] = config
+
+    def share_clients(self, clients: Dict[Hashable, httpx.AsyncClient]):
+        """Keep clients in a store shared with other pools (of servers in one process).
+
+        Pools then reuse each other's connections to common collaborators;
+        whoever owns the store closes the clients, close() leaves them open.
+        """
+        self._clients = clients
+        self._owns_clients = False
+
+    async def start(self):
+        """Open a client for every configured collaborator."""
+        for name, config in self.configs.items():
+            if not is_local(config.url):
+                self.get_client(name)
+
+    async def close(self):
+        """Close all clients and their connections."""
+        if not self._owns_clients:
+            return
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def get_client(self, name: str) -> httpx.AsyncClient:
+        """Return the pooled client for a collaborator, creating it on first use."""
+        config = self.configs[name]
+        key = _client_key(config)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._create_client(config)
+            self._clients[key] = client
+        return client
+
+    def _create_client(self, config: CollaboratorConfig) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        timeout = httpx.Timeout(config.timeout)
+        uds = unix_socket_path(config.url)
+        if uds is not None:
+            # Limits go to the transport, which the client then uses as is
+            transport = httpx.AsyncHTTPTransport(uds=uds, limits=limits)
+            return httpx.AsyncClient(transport=transport, timeout=timeout)
+        try:
+            return httpx.AsyncClient(limits=limits, timeout=timeout, http2=config.http2)
+        except ImportError:
+            self.logger.warning(f"HTTP/2 requested for {config.url} but h2 is not installed, using HTTP/1.1")
+            return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+    def url(self, name: str) -> str:
+        """The URL to address HTTP requests for a collaborator to."""
+        return http_url(self.configs[name].url)
+
+    @asynccontextmanager
+    async def connection(self, name: str):
+        """Yield the pooled client for a collaborator while tracking in-flight requests.
+
+        In-process (local://) collaborators need no client; None is yielded.
+        """
+        client = None if is_local(self.configs[name].url) else self.get_client(name)
+        self._in_flight[name] = self._in_flight.get(name, 0) + 1
+        try:
+            yield client
+        finally:
+            self._in_flight[name] -= 1
+
+    def in_flight(self, name: str) -> int:
+        """Number of requests to a collaborator currently in flight."""
+        return self._in_flight.get(name, 0)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return open/idle/waiting connection counts per collaborator.
+
+        in_flight is counted here. The connection counts come from the
+        httpcore pool behind the client, which httpx does not expose publicly;
+        when its internals differ from what is expected (another httpx or
+        httpcore version, a custom transport) they are reported as "unknown".
+        Collaborators sharing a client report the same connection counts.
+        """
+        stats = {}
+        for name, config in self.configs.items():
+            client = self._clients.get(_client_key(config))
+            if client is None:
+                continue
+            in_flight = self._in_flight.get(name, 0)
+            counts = _pool_counts(client)
+            if counts is None:
+                stats[name] = {key: "unknown" for key in ("open", "idle", "active", "waiting")}
+            else:
+                stats[name] = counts
+            stats[name]["in_flight"] = in_flight
+        return stats
+
+
+def _pool_counts(client: httpx.AsyncClient) -> Optional[Dict[str, int]]:
+    """Open/idle/active/waiting counts of a client's httpcore pool, or None if they cannot be read."""
+    try:
+        pool = client._transport._pool
+        connections = list(pool.connections)
+        idle = sum(1 for conn in connections if conn.is_idle())
+        waiting = sum(1 for req in pool._requests if req.is_queued())
+    except Exception:
+        return None
+    return {"open": len(connections), "idle": idle, "active": len(connections) - idle, "waiting": waiting}
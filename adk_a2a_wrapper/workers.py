@@ -0,0 +1,112 @@
+"""
+Pre-fork multi-process serving for A2AAgentServer.
+"""
+import os
+import signal
+import socket
+import time
+from typing import Dict, Optional
+
+
+def _bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def _bind_unix_socket(path: str) -> socket.socket:
+    # A socket file left behind by an earlier run would make bind fail
+    if os.path.exists(path):
+        os.unlink(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve_worker(server, shared_socket: Optional[socket.socket]):
+    """Worker process body: build a fresh app and serve until told to stop."""
+    import uvicorn
+    
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    sock = shared_socket or _bind_socket(server.host, server.port, reuse_port=True)
+    config = uvicorn.Config(
+        server.create_worker_app(),
+        timeout_graceful_shutdown=server.drain_timeout,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def run_workers(server, workers: int):
+    """Fork `workers` processes serving the same port and supervise them.
+    
+    Crashed workers are restarted. SIGINT/SIGTERM are forwarded to all
+    workers, which stop accepting connections and drain in-flight tasks
+    before exiting.
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Multiple workers require a platform with os.fork()")
+    
+    # With SO_REUSEPORT every worker binds its own socket and the kernel
+    # balances connections; otherwise workers share one pre-bound socket.
+    # A Unix domain socket is always bound once and shared.
+    shared_socket = None
+    if server.uds:
+        shared_socket = _bind_unix_socket(server.uds)
+    elif not hasattr(socket, "SO_REUSEPORT"):
+        shared_socket = _bind_socket(server.host, server.port, reuse_port=False)
+    
+    children: Dict[int, int] = {}
+    stopping = False
+    
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _serve_worker(server, shared_socket)
+            except BaseException:
+                server.logger.exception(f"Worker {index} crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = index
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    
+    address = server.uds or f"{server.host}:{server.port}"
+    server.logger.info(f"Starting {workers} workers on {address}")
+    for index in range(workers):
+        spawn(index)
+    
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        index = children.pop(pid, None)
+        if index is not None and not stopping:
+            server.logger.warning(f"Worker {index} (pid {pid}) exited with status {status}, restarting")
+            time.sleep(0.5)
+            spawn(index)
+    
+    if shared_socket:
+        shared_socket.close()
@@ -1,31 +1,77 @@
+import asyncio
+import time
 import uuid
 import logging
-from typing import Dict, Any, Optional, List
+from contextlib import aclosing, asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, List, Tuple, Union, Callable, AsyncIterator, Hashable, Set
 import httpx
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
 from a2a.server.agent_execution.agent_executor import AgentExecutor
 from a2a.server.agent_execution.context import RequestContext
 from a2a.server.apps.starlette_app import A2AStarletteApplication
 from a2a.server.events.event_queue import EventQueue
 from a2a.server.request_handlers.default_request_handler import DefaultRequestHandler
-from a2a.server.tasks.inmemory_task_store import InMemoryTaskStore
+from a2a.server.tasks.task_store import TaskStore
 from a2a.server.tasks.task_updater import TaskUpdater
 from a2a.types import (
     AgentCard,
     AgentSkill,
     AgentCapabilities,
+    Artifact,
+    CancelTaskRequest,
     Part,
     TextPart,
     DataPart,
     Message,
     MessageSendParams,
     SendMessageRequest,
+    SendStreamingMessageRequest,
+    TaskArtifactUpdateEvent,
+    TaskIdParams,
     TaskState,
 )
 from google.genai import types
 from google.adk.agents import Agent
-from google.adk.sessions import InMemorySessionService
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService
 from google.adk.runners import Runner
-from .models import AgentRequest, AgentResponse, SkillDefinition
+from .models import AgentRequest, AgentResponse, AgentCall, BatchRequest, SkillDefinition, CollaboratorConfig
+from .fanout import bounded_as_completed, scatter_gather
+from .transport import (
+    ConnectionPool, expand_replicas, get_local_server, is_local, normalize_collaborators, register_local,
+    unregister_local,
+)
+from .registry import CollaboratorRegistry
+from .stores import BoundedSessionService, BoundedTaskStore
+from .sqlite_store import SQLiteDatabase, SQLiteSessionService, SQLiteTaskStore
+from .context_sessions import ContextSessionManager, extractive_summary
+from .cache import ResponseCache
+from .singleflight import SingleFlight, default_request_key
+from .admission import AdmissionController, AdmissionRejected
+from .ratelimit import RateLimiter, apply_rate_limiter
+from .resilience import CircuitBreaker, LatencyTracker, backoff_delay
+from .balancer import ReplicaBalancer
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, Metrics
+from .tracing import TRACEPARENT, Span, TraceLogFilter, Tracer, use_span
+from .replay import TrafficRecorder, TrafficReplayer
+from .serialization import canonical_json, loads
+from .deadlines import (
+    DeadlineExceeded, check_deadline, current_deadline, deadline_scope, outbound_deadline, run_with_deadline,
+)
+
+# Paths of the batch and metrics endpoints, relative to the agent's URL
+BATCH_PATH = "/batch"
+METRICS_PATH = "/metrics"
+
+# Stage timer used when metrics are off
+_NO_STAGE = nullcontext()
+
+# Receives partial response text while the runner streams (set by the executor)
+_partial_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar("partial_sink", default=None)
 
 
 class A2AAgentServer:
@@ -36,10 +82,36 @@ class A2AAgentServer:
         agent: Agent,
         port: int,
         skills: Optional[List[SkillDefinition]] = None,
-        collaborators: Optional[Dict[str, str]] = None,
+        collaborators: Optional[Dict[str, Union[str, List[str], CollaboratorConfig]]] = None,
         host: str = "0.0.0.0",
         enable_streaming: bool = False,
         logger: Optional[logging.Logger] = None,
+        card_ttl: float = 300.0,
+        health_check_interval: Optional[float] = 10.0,
+        session_service: Optional[BaseSessionService] = None,
+        task_store: Optional[TaskStore] = None,
+        storage: str = "memory",
+        storage_path: Optional[str] = None,
+        context_sessions: bool = False,
+        max_contexts: int = 1000,
+        history_token_budget: Optional[int] = 8000,
+        response_cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = False,
+        coalesce_calls: bool = False,
+        coalesce_key: Optional[Callable[[AgentRequest], Optional[Hashable]]] = None,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = 100,
+        queue_timeout: Optional[float] = None,
+        scheduling_policy: str = "weighted",
+        priority_weights: Optional[Dict[str, float]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        batch_concurrency: int = 8,
+        max_batch_size: int = 1000,
+        metrics: Optional[Metrics] = None,
+        tracer: Optional[Tracer] = None,
+        traffic: Optional[Union[TrafficRecorder, TrafficReplayer]] = None,
+        unhealthy_cooldown: float = 30.0,
+        failure_threshold: int = 2,
     ):
         self.agent = agent
         self.port = port
@@ -48,17 +120,160 @@ class A2AAgentServer:
         self.collaborators = collaborators or {}
         self.enable_streaming = enable_streaming
         self.logger = logger or logging.getLogger(agent.name)
+        if storage not in ("memory", "sqlite"):
+            raise ValueError(f"Unknown storage {storage!r}, expected 'memory' or 'sqlite'")
+        self.storage = storage
+        self.storage_path = storage_path or f"{agent.name}.db"
+        self._custom_session_service = session_service
+        self._custom_task_store = task_store
+        self._reuse_context_sessions = context_sessions
+        self.max_contexts = max_contexts
+        self.history_token_budget = history_token_budget
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.scheduling_policy = scheduling_policy
+        self.priority_weights = priority_weights
+        self.batch_concurrency = batch_concurrency
+        self.max_batch_size = max_batch_size
+        
+        # Outbound LLM calls wait for the (possibly shared) rate limiter
+        self.rate_limiter = rate_limiter
+        if rate_limiter is not None:
+            apply_rate_limiter(agent, rate_limiter)
+        self.response_cache = response_cache
+        # Optional instrumentation, exposed at /metrics (None costs nothing per request)
+        self.metrics = metrics
+        # Optional tracing; log records then carry %(trace_id)s and %(span_id)s
+        self.tracer = tracer
+        if tracer is not None:
+            self.logger.addFilter(TraceLogFilter())
+        # Optional record/replay of model runs and collaborator calls
+        self.traffic = traffic
+        
+        # Single-flight: concurrent identical requests share one computation
+        self.coalesce_requests = coalesce_requests
+        self.coalesce_calls = coalesce_calls
+        self.coalesce_key = coalesce_key or default_request_key
+        self.inflight_requests = SingleFlight()
+        self.inflight_calls = SingleFlight()
+        
+        self.drain_timeout = 30.0
+        self.uds: Optional[str] = None
+        # Public URL of the agent when it is not served at the root of host:port
+        self.base_url: Optional[str] = None
         
-        # Initialize A2A components
-        self.session_service = InMemorySessionService()
+        self._init_components()
+        self.agent_card = self._create_agent_card()
+        
+        
+        # Long-lived HTTP clients for collaborator calls
+        # (one pool entry, health state and breaker per replica endpoint)
+        self.collaborator_configs = normalize_collaborators(self.collaborators)
+        endpoint_configs, self.replica_groups = expand_replicas(self.collaborator_configs)
+        self.connection_pool = ConnectionPool(endpoint_configs, logger=self.logger)
+        self.registry = CollaboratorRegistry(
+            self.connection_pool,
+            card_ttl=card_ttl,
+            health_check_interval=health_check_interval,
+            logger=self.logger,
+            groups=self.replica_groups,
+            failure_threshold=failure_threshold,
+            unhealthy_cooldown=unhealthy_cooldown,
+        )
+        
+        # Retry/hedging bookkeeping, optional circuit breakers and replica balancing
+        self.breakers = {
+            endpoint: CircuitBreaker(
+                failure_rate=config.circuit_failure_rate,
+                min_requests=config.circuit_min_requests,
+                window=config.circuit_window,
+                reset_timeout=config.circuit_reset_timeout,
+            )
+            for endpoint, config in endpoint_configs.items()
+            if config.circuit_failure_rate is not None
+        }
+        self.balancers = {
+            name: ReplicaBalancer(
+                self.replica_groups[name],
+                strategy=config.balancing,
+                is_healthy=self.registry.is_healthy,
+                in_flight=self.connection_pool.in_flight,
+                breakers=self.breakers,
+            )
+            for name, config in self.collaborator_configs.items()
+        }
+        self.latencies = {name: LatencyTracker() for name in self.collaborator_configs}
+        self.call_stats = {
+            name: {"calls": 0, "retries": 0, "hedges": 0, "hedge_wins": 0}
+            for name in self.collaborator_configs
+        }
+        
+        # Collaborators in this process can reach us as local://<agent name>
+        register_local(self.agent.name, self)
+    
+    def _init_components(self):
+        """Create the per-process runner, stores and executor.
+        
+        Called again in every worker process so that no worker shares a
+        runner, database connection or event loop state with another.
+        """
+        # Optional durable storage shared by the session and task stores
+        self.database = None
+        session_service = self._custom_session_service
+        task_store = self._custom_task_store
+        if self.storage == "sqlite":
+            self.database = SQLiteDatabase(self.storage_path)
+            session_service = session_service or SQLiteSessionService(self.database)
+            task_store = task_store or SQLiteTaskStore(self.database)
+        
+        # Initialize A2A components (bounded in-memory stores unless provided)
+        self.session_service = session_service or BoundedSessionService()
         self.runner = Runner(
             agent=self.agent,
-            app_name=agent.name,
+            app_name=self.agent.name,
             session_service=self.session_service,
         )
-        self.task_store = InMemoryTaskStore()
-        self.agent_card = self._create_agent_card()
+        self.task_store = task_store or BoundedTaskStore()
+        
+        # Optional multi-turn mode: one persistent session per A2A context
+        self.context_sessions = None
+        if self._reuse_context_sessions:
+            self.context_sessions = ContextSessionManager(
+                self.session_service,
+                app_name=self.agent.name,
+                max_contexts=self.max_contexts,
+                token_budget=self.history_token_budget,
+                summarizer=self.summarize_history,
+                logger=self.logger,
+            )
+        
+        # Optional admission control in front of the agent
+        self.admission = None
+        if self.max_concurrency:
+            self.admission = AdmissionController(
+                self.max_concurrency,
+                max_queue=self.max_queue,
+                queue_timeout=self.queue_timeout,
+                policy=self.scheduling_policy,
+                priority_weights=self.priority_weights,
+            )
         self.executor = self._create_executor()
+        # Requests rejected before starting / aborted mid-run for their deadline
+        self.deadline_stats = {"rejected": 0, "aborted": 0}
+        # Executions in flight, by A2A task id
+        self.running_tasks: Dict[str, asyncio.Task] = {}
+        # Of those, the ones being cancelled by a tasks/cancel request
+        self.cancel_requested: Set[str] = set()
+        # Work stopped by cancellation: executions, agent runs and collaborator tasks
+        self.cancel_stats = {
+            "cancelled": 0,
+            "cancelled_running": 0,
+            "seconds_at_cancel": 0.0,
+            "downstream_cancels": 0,
+            "downstream_cancel_failures": 0,
+        }
+        self._background: set = set()
     
     def add_skill(self, skill: SkillDefinition):
         """Add a skill definition to the agent."""
@@ -95,7 +310,7 @@ class A2AAgentServer:
             name=self.agent.name,
             description=self.agent.description or "ADK Agent",
             version="1.0",
-            url=f"http://localhost:{self.port}/",
+            url=self.base_url or f"http://localhost:{self.port}/",
             capabilities=AgentCapabilities(
                 streaming=self.enable_streaming,
                 pushNotifications=False,
@@ -123,6 +338,10 @@ class A2AAgentServer:
         
         class ADKExecutor(AgentExecutor):
             async def execute(self, context: RequestContext, event_queue: EventQueue):
+                running_id = context.task_id or str(uuid.uuid4())
+                parent.running_tasks[running_id] = asyncio.current_task()
+                started = time.monotonic()
+                trace = parent._start_trace(context)
                 try:
                     # Extract input
                     user_input = context.get_user_input()
@@ -136,6 +355,10 @@ class A2AAgentServer:
                                 # Check for skill_id in data
                                 skill_id = data.get("skill_id")
                     
+                    # Scheduling hints are not part of the agent's input
+                    priority = data.pop("priority", None)
+                    deadline = data.pop("deadline", None)
+                    
                     # Create task updater
                     task_id = context.task_id or str(uuid.uuid4())
                     context_id = context.context_id or str(uuid.uuid4())
@@ -145,39 +368,91 @@ class A2AAgentServer:
                     updater.submit()
                     updater.start_work()
                     
-                    # Process with ADK
-                    session_id = str(uuid.uuid4())
-                    await parent.session_service.create_session(
-                        app_name=parent.agent.name,
-                        user_id="user1",
-                        session_id=session_id
-                    )
-                    
                     # Create request object
                     request = AgentRequest(
                         message=user_input,
                         context=data,
-                        session_id=session_id,
-                        skill_id=skill_id
+                        skill_id=skill_id,
+                        priority=priority,
+                        deadline=deadline,
                     )
                     
-                    # Process request
-                    response = await parent.process_request(request, session_id)
+                    # Process request, streaming partial text as artifact chunks if enabled
+                    on_partial = None
+                    if parent.enable_streaming:
+                        chunks = []
+                        
+                        def on_partial(text: str):
+                            _send_artifact_chunk(
+                                updater, [Part(root=TextPart(text=text))],
+                                append=bool(chunks), last_chunk=False,
+                            )
+                            chunks.append(text)
                     
-                    # Create response artifact
-                    parts = [TextPart(text=response.message)]
-                    if response.data:
-                        parts.append(DataPart(data=response.data))
+                    response = await parent.handle_request(request, context_id=context_id, on_partial=on_partial)
+                    if trace is not None:
+                        trace.set_attribute("status", response.status)
+                        trace.set_status("ok" if response.status == "success" else "error")
                     
-                    updater.add_artifact(
-                        parts=parts,
-                        artifact_id="response",
-                        name="response",
-                    )
-                    
-                    updater.complete()
+                    with parent.stage("serialize"):
+                        # Create response artifact
+                        parts = [TextPart(text=response.message)]
+                        if response.data:
+                            parts.append(DataPart(data=response.data))
+                        
+                        if parent.enable_streaming:
+                            # Replaces the streamed chunks with the final text
+                            _send_artifact_chunk(
+                                updater, [Part(root=part) for part in parts],
+                                append=False, last_chunk=True,
+                            )
+                        else:
+                            updater.add_artifact(
+                                parts=parts,
+                                artifact_id="response",
+                                name="response",
+                            )
+                        
+                        updater.complete()
                     
+                except DeadlineExceeded as e:
+                    if trace is not None:
+                        trace.set_status("error", str(e))
+                    parent.logger.warning(f"{e} (task {task_id})")
+                    parent.deadline_stats["aborted" if e.started else "rejected"] += 1
+                    updater.update_status(
+                        TaskState.failed if e.started else TaskState.rejected,
+                        updater.new_agent_message([TextPart(text=str(e))]),
+                        final=True,
+                    )
+                except AdmissionRejected as e:
+                    if trace is not None:
+                        trace.set_status("error", f"Rejected: {e.reason}")
+                    parent.logger.warning(f"Rejected request: {e.reason}")
+                    updater.update_status(
+                        TaskState.rejected,
+                        updater.new_agent_message([TextPart(text=f"Rejected: {e.reason}")]),
+                        final=True,
+                    )
+                except asyncio.CancelledError:
+                    if trace is not None:
+                        trace.set_status("error", "cancelled")
+                    ran = time.monotonic() - started
+                    parent.cancel_stats["cancelled"] += 1
+                    parent.cancel_stats["seconds_at_cancel"] += ran
+                    if parent.metrics is not None:
+                        parent.metrics.cancelled.inc(parent.agent.name, "execution")
+                        parent.metrics.cancelled_seconds.inc(parent.agent.name, amount=ran)
+                    if running_id not in parent.cancel_requested:
+                        raise
+                    # Cancelled on request: end the task normally, or the SDK's consumer of
+                    # this execution never sees a final event and the original request hangs.
+                    # This is the only canceled status published for a running execution.
+                    if 'updater' in locals():
+                        updater.update_status(TaskState.canceled, final=True)
                 except Exception as e:
+                    if trace is not None:
+                        trace.set_status("error", str(e))
                     parent.logger.error(f"Error: {e}", exc_info=True)
                     if 'updater' in locals():
                         updater.failed(
@@ -185,10 +460,23 @@ class A2AAgentServer:
                                 [TextPart(text=f"Error: {str(e)}")]
                             )
                         )
+                finally:
+                    parent.running_tasks.pop(running_id, None)
+                    parent.cancel_requested.discard(running_id)
+                    if trace is not None:
+                        trace.end()
             
             async def cancel(self, context: RequestContext, event_queue: EventQueue):
                 task_id = context.task_id
                 if task_id:
+                    # Stop the execution itself: the runner, the session and any collaborator calls
+                    running = parent.running_tasks.get(task_id)
+                    if running is not None and not running.done():
+                        # The execution publishes the canceled status itself as it unwinds;
+                        # publishing it here too would race it on the same queue
+                        parent.cancel_requested.add(task_id)
+                        running.cancel()
+                        return
                     updater = TaskUpdater(
                         event_queue, task_id, context.context_id or ""
                     )
@@ -196,6 +484,282 @@ class A2AAgentServer:
         
         return ADKExecutor()
     
+    async def handle_request(
+        self,
+        request: AgentRequest,
+        context_id: Optional[str] = None,
+        on_partial: Optional[Callable[[str], None]] = None,
+    ) -> AgentResponse:
+        """Run a request through the response cache, a session and process_request.
+        
+        With coalesce_requests, concurrent duplicates (per coalesce_key and
+        priority) wait for the first one instead of running the agent again,
+        each only as long as its own deadline allows.
+        
+        Args:
+            request: The request to process
+            context_id: A2A context id, used when sessions are kept per context
+            on_partial: Receives partial response text while the agent streams
+        
+        Raises:
+            DeadlineExceeded: If request.deadline passes before or while the agent runs
+        """
+        started = time.monotonic()
+        status = "error"
+        response = None
+        if self.traffic is not None:
+            self.traffic.request(request)
+        try:
+            # The deadline also bounds every call_agent made while handling the request
+            with deadline_scope(request.deadline):
+                check_deadline()
+                # History-dependent requests are never duplicates of each other
+                key = None
+                if self.coalesce_requests and not self.context_sessions:
+                    key = self.coalesce_key(request)
+                if key is None:
+                    response = await self._handle_request(request, context_id, on_partial)
+                else:
+                    # Shared runs are admitted and scheduled under the first request's
+                    # priority and deadline: only join one that does not cut ours short
+                    response = await run_with_deadline(self.inflight_requests.do(
+                        (request.priority, key),
+                        lambda emit: self._handle_request(request, None, emit),
+                        on_partial,
+                        deadline=current_deadline(),
+                    ))
+                    response = response.model_copy(deep=True)
+            status = response.status
+            return response
+        except DeadlineExceeded as e:
+            status = "timeout" if e.started else "rejected"
+            raise
+        except AdmissionRejected:
+            status = "rejected"
+            raise
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            if self.metrics is not None:
+                self._record_request(request, response, status, time.monotonic() - started)
+    
+    def _record_request(
+        self, request: AgentRequest, response: Optional[AgentResponse], status: str, seconds: float
+    ):
+        if response is not None and response.skill_used:
+            skill_id = response.skill_used
+        else:
+            skill = self._get_skill_for_request(request)
+            skill_id = skill.id if skill else "general"
+        self.metrics.requests.inc(self.agent.name, skill_id, status)
+        self.metrics.request_seconds.observe(seconds, self.agent.name, skill_id)
+    
+    def stage(self, name: str):
+        """Context manager timing a processing stage for the metrics and traces.
+        
+        A no-op without metrics and outside sampled traces.
+        """
+        timer = self.metrics.stage(self.agent.name, name) if self.metrics is not None else None
+        span = self.tracer.span(name, self.agent.name) if self.tracer is not None else None
+        if not isinstance(span, Span):
+            return timer or _NO_STAGE
+        return _Stage(timer, span) if timer else span
+    
+    def _start_trace(self, context: RequestContext) -> Optional[Span]:
+        """Open the server span of an execution, continuing the caller's trace."""
+        if self.tracer is None:
+            return None
+        metadata = (context.message.metadata if context.message else None) or {}
+        return self.tracer.start_trace(
+            "a2a.execute", self.agent.name, metadata.get(TRACEPARENT), task_id=context.task_id
+        )
+    
+    async def _handle_request(
+        self,
+        request: AgentRequest,
+        context_id: Optional[str],
+        on_partial: Optional[Callable[[str], None]],
+    ) -> AgentResponse:
+        cache_key = self._cache_key(request)
+        if cache_key:
+            with self.stage("cache"):
+                cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Only requests that reach the agent take an admission slot
+        if self.admission is None:
+            response = await self._run_in_session(request, context_id, on_partial)
+        else:
+            async with self.admission.admit(priority=request.priority, deadline=current_deadline()) as waited:
+                if self.metrics is not None:
+                    self.metrics.stage_seconds.observe(waited, self.agent.name, "queue")
+                if self.tracer is not None:
+                    now = time.time()
+                    self.tracer.record("queue", self.agent.name, now - waited, now, priority=request.priority)
+                response = await self._run_in_session(request, context_id, on_partial)
+        
+        if cache_key:
+            await self.response_cache.set(cache_key, response, skill_id=response.skill_used)
+        return response
+    
+    async def _run_in_session(
+        self,
+        request: AgentRequest,
+        context_id: Optional[str],
+        on_partial: Optional[Callable[[str], None]],
+    ) -> AgentResponse:
+        # Time spent queued may have used up the deadline; don't start the LLM then
+        check_deadline()
+        
+        # Process with ADK, in the context's session or a one-shot one
+        with self.stage("session"):
+            if self.context_sessions and context_id:
+                session_id = await self.context_sessions.acquire(context_id)
+            else:
+                context_id = None
+                session_id = str(uuid.uuid4())
+                await self.session_service.create_session(
+                    app_name=self.agent.name,
+                    user_id="user1",
+                    session_id=session_id
+                )
+        request = request.model_copy(update={"session_id": session_id})
+        
+        sink_token = _partial_sink.set(on_partial) if on_partial else None
+        try:
+            with self.stage("process"):
+                response = await run_with_deadline(self.process_request(request, session_id))
+        except asyncio.CancelledError:
+            self.cancel_stats["cancelled_running"] += 1
+            if self.metrics is not None:
+                self.metrics.cancelled.inc(self.agent.name, "agent_run")
+            raise
+        finally:
+            if sink_token is not None:
+                _partial_sink.reset(sink_token)
+            with self.stage("release"):
+                if context_id:
+                    await self.context_sessions.release(context_id)
+                else:
+                    # One-shot session: not needed once the response exists
+                    await self.release_session(session_id)
+        return response
+    
+    async def _answer(
+        self, request: AgentRequest, on_partial: Optional[Callable[[str], None]] = None
+    ) -> AgentResponse:
+        """handle_request, with deadline and admission outcomes turned into response statuses."""
+        try:
+            return await self.handle_request(request, on_partial=on_partial)
+        except DeadlineExceeded as e:
+            return AgentResponse(message=str(e), status="timeout" if e.started else "rejected")
+        except AdmissionRejected as e:
+            return AgentResponse(message=f"Rejected: {e.reason}", status="rejected")
+    
+    async def handle_batch(
+        self, batch: BatchRequest, trace: Optional[Span] = None
+    ) -> AsyncIterator[Tuple[int, AgentResponse]]:
+        """Process a batch with bounded parallelism, yielding (index, response) as items finish.
+        
+        Items run through handle_request one by one (cache, coalescing,
+        admission control and deadlines apply per item), at most
+        batch_concurrency (or the batch's lower max_concurrency) at once,
+        and never more than the server's max_concurrency, so a batch waits
+        for its own items instead of overflowing the admission queue.
+        Items are traced as part of trace, when given.
+        """
+        concurrency = min(batch.max_concurrency or self.batch_concurrency, self.batch_concurrency)
+        if self.max_concurrency is not None:
+            concurrency = min(concurrency, self.max_concurrency)
+        requests = [
+            request.model_copy(update={
+                "skill_id": request.skill_id or batch.skill_id,
+                "priority": request.priority or batch.priority,
+            })
+            for request in batch.requests
+        ]
+        
+        async def answer(request: AgentRequest) -> AgentResponse:
+            with use_span(trace):
+                return await self._answer(request)
+        
+        factories = [lambda request=request: answer(request) for request in requests]
+        async for index, result in bounded_as_completed(factories, max(concurrency, 1)):
+            if isinstance(result, asyncio.CancelledError):
+                result = AgentResponse(message="Cancelled", status="cancelled")
+            elif isinstance(result, BaseException):
+                self.logger.error(f"Error processing batch item {index}: {result}")
+                result = AgentResponse(message=f"Error: {result}", status="error")
+            yield index, result
+    
+    async def _batch_endpoint(self, request: Request):
+        """POST <agent url>/batch: a BatchRequest in, one NDJSON result line per item out."""
+        try:
+            batch = BatchRequest.model_validate(loads(await request.body()))
+        except ValueError as e:
+            return JSONResponse({"error": f"Invalid batch: {e}"}, status_code=400)
+        if len(batch.requests) > self.max_batch_size:
+            return JSONResponse(
+                {"error": f"Batch of {len(batch.requests)} exceeds max_batch_size {self.max_batch_size}"},
+                status_code=413,
+            )
+        
+        trace = None
+        if self.tracer is not None:
+            trace = self.tracer.start_trace(
+                "a2a.batch", self.agent.name, request.headers.get(TRACEPARENT),
+                activate=False, items=len(batch.requests),
+            )
+        
+        async def lines():
+            # Results go out as they complete; "index" refers to the request's position
+            try:
+                async for index, response in self.handle_batch(batch, trace):
+                    yield f'{{"index":{index},"response":{response.model_dump_json()}}}\n'
+            finally:
+                if trace is not None:
+                    trace.end()
+        
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    
+    def _cache_key(self, request: AgentRequest) -> Optional[str]:
+        """Response cache key for a request, or None if it must not be cached."""
+        # Multi-turn answers depend on history, so only one-shot requests are cached
+        if self.response_cache is None or self.context_sessions:
+            return None
+        skill = self._get_skill_for_request(request)
+        skill_id = skill.id if skill else "general"
+        if not self.response_cache.enabled_for(skill_id):
+            return None
+        return ResponseCache.make_key(
+            self._model_name(), str(self.agent.instruction), skill_id, request.message, request.context
+        )
+    
+    def coalesce_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return single-flight counters for incoming requests and outgoing calls."""
+        return {
+            "requests": self.inflight_requests.stats(),
+            "calls": self.inflight_calls.stats(),
+        }
+    
+    def admission_stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait time and rejection counters (empty if admission control is off)."""
+        return self.admission.stats() if self.admission else {}
+    
+    def rate_limit_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return per-model request, token and delay counters (empty if not rate limited)."""
+        return self.rate_limiter.stats() if self.rate_limiter else {}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return response cache hit/miss counters (empty if caching is off)."""
+        return self.response_cache.stats() if self.response_cache else {}
+    
+    def traffic_stats(self) -> Dict[str, Any]:
+        """Return record/replay counters (empty if traffic is neither recorded nor replayed)."""
+        return self.traffic.stats() if self.traffic else {}
+    
     async def process_request(self, request: AgentRequest, session_id: str) -> AgentResponse:
         """Process request with ADK agent using appropriate skill."""
         try:
@@ -207,23 +771,10 @@ class A2AAgentServer:
             if skill:
                 prompt = f"[Using skill: {skill.name}] {request.message}"
             if request.context:
-                prompt = f"{prompt}\n\nContext: {request.context}"
+                prompt = f"{prompt}\n\nContext: {canonical_json(request.context)}"
             
             # Run ADK agent
-            content = types.Content(
-                role="user",
-                parts=[types.Part(text=prompt)]
-            )
-            
-            response_text = ""
-            async for event in self.runner.run_async(
-                user_id="user1",
-                session_id=session_id,
-                new_message=content
-            ):
-                if event.is_final_response() and event.content and event.content.parts:
-                    response_text = event.content.parts[0].text
-                    break
+            response_text = await self.run_agent(prompt, session_id)
             
             return AgentResponse(
                 message=response_text,
@@ -240,88 +791,881 @@ class A2AAgentServer:
                 session_id=session_id
             )
     
+    async def run_agent(self, prompt: str, session_id: str) -> str:
+        """Run the ADK agent on a prompt and return the final response text.
+        
+        With streaming enabled, partial text is forwarded to the streaming
+        client as artifact chunks while the model is still generating.
+        """
+        content = types.Content(
+            role="user",
+            parts=[types.Part(text=prompt)]
+        )
+        sink = _partial_sink.get() if self.enable_streaming else None
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE if sink else StreamingMode.NONE)
+        
+        events = self.runner.run_async(
+            user_id="user1",
+            session_id=session_id,
+            new_message=content,
+            run_config=run_config,
+        )
+        if self.traffic is not None:
+            events = self.traffic.run(prompt, events)
+        
+        response_text = ""
+        # Closed here, in this task, when we stop at the final response
+        async with aclosing(events):
+            with self.stage("llm"):
+                async for event in events:
+                    if event.partial:
+                        if sink and event.content and event.content.parts and event.content.parts[0].text:
+                            sink(event.content.parts[0].text)
+                        continue
+                    if self.metrics is not None and event.usage_metadata:
+                        self._count_tokens(event.usage_metadata)
+                    if event.is_final_response() and event.content and event.content.parts:
+                        response_text = event.content.parts[0].text
+                        break
+        return response_text
+    
+    def _model_name(self) -> str:
+        return str(getattr(self.agent.model, "model", self.agent.model))
+    
+    def _count_tokens(self, usage: types.GenerateContentResponseUsageMetadata):
+        model = self._model_name()
+        if usage.prompt_token_count:
+            self.metrics.llm_tokens.inc(self.agent.name, model, "prompt", amount=usage.prompt_token_count)
+        if usage.candidates_token_count:
+            self.metrics.llm_tokens.inc(self.agent.name, model, "completion", amount=usage.candidates_token_count)
+    
+    def _call_timeout(self, agent_name: str, request: AgentRequest) -> float:
+        """Seconds a call may take: the collaborator timeout, capped by the deadlines in play."""
+        timeout = self.collaborator_configs[agent_name].timeout
+        if request.deadline is not None:
+            timeout = min(timeout, request.deadline)
+        return outbound_deadline(timeout)
+    
+    def _build_message(
+        self, request: AgentRequest, deadline: Optional[float] = None, task_id: Optional[str] = None
+    ) -> Message:
+        """Build the A2A message sent to a collaborator."""
+        # Prepare data with skill_id if specified
+        data = request.context.copy() if request.context else {}
+        if request.skill_id:
+            data["skill_id"] = request.skill_id
+        if request.priority:
+            data["priority"] = request.priority
+        deadline = request.deadline if deadline is None else deadline
+        if deadline is not None:
+            data["deadline"] = round(deadline, 3)
+        
+        parts = [Part(root=TextPart(text=request.message))]
+        if data:
+            parts.append(Part(root=DataPart(data=data)))
+        
+        traceparent = self.tracer.inject() if self.tracer is not None else None
+        return Message(
+            messageId=str(uuid.uuid4()),
+            role="user",
+            parts=parts,
+            taskId=task_id,
+            metadata={TRACEPARENT: traceparent} if traceparent else None,
+        )
+    
     async def call_agent(self, agent_name: str, request: AgentRequest) -> AgentResponse:
-        """Call another agent with skill support."""
+        """Call another agent with skill support.
+        
+        With coalesce_calls, concurrent identical calls to the same agent share
+        one outbound request. With a traffic recorder or replayer, the
+        response is recorded or replayed.
+        """
+        if self.traffic is not None:
+            return await self.traffic.call(agent_name, request, lambda: self._coalesced_call(agent_name, request))
+        return await self._coalesced_call(agent_name, request)
+    
+    async def _coalesced_call(self, agent_name: str, request: AgentRequest) -> AgentResponse:
+        key = self.coalesce_key(request) if self.coalesce_calls else None
+        if key is None:
+            return await self._call_agent(agent_name, request)
+        try:
+            response = await run_with_deadline(self.inflight_calls.do(
+                (agent_name, request.priority, key),
+                lambda emit: self._call_agent(agent_name, request),
+                deadline=current_deadline(),
+            ))
+        except DeadlineExceeded:
+            return AgentResponse(message=f"Deadline exceeded waiting for {agent_name}", status="timeout")
+        return response.model_copy(deep=True)
+    
+    async def _call_agent(self, agent_name: str, request: AgentRequest) -> AgentResponse:
         if agent_name not in self.collaborators:
             return AgentResponse(
                 message=f"Agent {agent_name} not found",
                 status="error"
             )
         
+        if not self.registry.is_healthy(agent_name):
+            return AgentResponse(
+                message=f"Agent {agent_name} is unavailable",
+                status="error"
+            )
+        
+        config = self.collaborator_configs[agent_name]
+        stats = self.call_stats[agent_name]
+        tried: List[str] = []
+        response: Optional[AgentResponse] = None
+        attempt = 0
+        while True:
+            # Tell the collaborator how long we will wait, and don't call if that is no time at all
+            timeout = self._call_timeout(agent_name, request)
+            if timeout <= 0:
+                return AgentResponse(
+                    message=f"Deadline exceeded before calling {agent_name}",
+                    status="timeout"
+                )
+            # Healthy replica with a closed circuit, preferring one not tried yet
+            endpoint = self.balancers[agent_name].pick(avoid=tried)
+            if endpoint is None and tried:
+                # The failures being retried may have just marked every replica unhealthy;
+                # a retry still goes out unless a circuit breaker refuses it
+                endpoint = self.balancers[agent_name].pick(avoid=tried, healthy_only=False)
+            if endpoint is None:
+                # Only breakers refuse here: the registry check above found a healthy replica
+                if response is not None:
+                    return response
+                return AgentResponse(
+                    message=f"Agent {agent_name} is unavailable (circuit open)",
+                    status="error"
+                )
+            tried.append(endpoint)
+            
+            stats["calls"] += 1
+            if attempt > 0:
+                stats["retries"] += 1
+            response, retryable = await self._hedged_send(agent_name, endpoint, request, timeout)
+            
+            attempt += 1
+            if not retryable or attempt > config.retries:
+                return response
+            delay = backoff_delay(attempt, config.retry_backoff, config.retry_max_backoff)
+            left = outbound_deadline(None)
+            if left is not None and left <= delay:
+                return response
+            self.logger.debug(f"Retrying {agent_name} in {delay:.3f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+    
+    def _hedge_delay(self, agent_name: str) -> Optional[float]:
+        config = self.collaborator_configs[agent_name]
+        latencies = self.latencies[agent_name]
+        if config.hedge_percentile is not None and len(latencies) >= 20:
+            return latencies.percentile(config.hedge_percentile)
+        return config.hedge_delay
+    
+    async def _hedged_send(
+        self, agent_name: str, endpoint: str, request: AgentRequest, timeout: float
+    ) -> Tuple[AgentResponse, bool]:
+        """Send a request, plus a duplicate if the first is slow; the first usable answer wins."""
+        delay = self._hedge_delay(agent_name)
+        if delay is None or delay >= timeout:
+            return await self._send_once(agent_name, endpoint, request, timeout)
+        
+        first = asyncio.ensure_future(self._send_once(agent_name, endpoint, request, timeout))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            # The duplicate goes to another replica when there is one
+            second = self.balancers[agent_name].pick(avoid=[endpoint]) if not done else None
+            if second is not None:
+                self.call_stats[agent_name]["hedges"] += 1
+                pending.add(asyncio.ensure_future(
+                    self._send_once(agent_name, second, request, timeout - delay)
+                ))
+            while True:
+                for task in done:
+                    response, retryable = task.result()
+                    # Wait for the other request if this one failed in a retryable way
+                    if not retryable or not pending:
+                        if task is not first:
+                            self.call_stats[agent_name]["hedge_wins"] += 1
+                        return response, retryable
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # Losers are cancelled, which also cancels their task on the collaborator
+            for task in pending:
+                task.cancel()
+    
+    async def _send_once(
+        self, agent_name: str, endpoint: str, request: AgentRequest, timeout: float
+    ) -> Tuple[AgentResponse, bool]:
+        """One request to a collaborator replica; returns (response, whether a retry could help)."""
+        span = None
+        if self.tracer is not None:
+            span = self.tracer.span(
+                "call_agent", self.agent.name, kind="client", collaborator=agent_name, endpoint=endpoint
+            )
+        if not isinstance(span, Span):
+            return await self._send_attempt(agent_name, endpoint, request, timeout)
+        # The call span is current while sending, so its id goes out as the callee's parent
+        with span:
+            response, retryable = await self._send_attempt(agent_name, endpoint, request, timeout)
+            span.set_attribute("status", response.status)
+            span.set_status("ok" if response.status == "success" else "error")
+            return response, retryable
+    
+    async def _send_attempt(
+        self, agent_name: str, endpoint: str, request: AgentRequest, timeout: float
+    ) -> Tuple[AgentResponse, bool]:
+        started = time.monotonic()
+        breaker = self.breakers.get(endpoint)
+        try:
+            if is_local(self.connection_pool.configs[endpoint].url):
+                async with self.connection_pool.connection(endpoint):
+                    response = await self._send_local(endpoint, request, timeout)
+            else:
+                response = await self._send_http(endpoint, request, timeout)
+            
+            self.registry.mark_healthy(endpoint)
+            if response.status == "success":
+                latency = time.monotonic() - started
+                self.latencies[agent_name].record(latency)
+                self.balancers[agent_name].record_latency(endpoint, latency)
+            # An overloaded collaborator may accept the request a little later
+            retryable = response.status in ("rejected", "timeout")
+                
+        except Exception as e:
+            # A slow answer cut off by our deadline says nothing about the peer's health
+            if _is_connection_error(e) and not _is_timeout(e):
+                self.registry.mark_unhealthy(endpoint, e)
+            self.logger.error(f"Error calling {agent_name}: {e}")
+            response = AgentResponse(
+                message=f"Error calling {agent_name}: {str(e)}",
+                status="timeout" if _is_timeout(e) else "error"
+            )
+            retryable = _is_connection_error(e) or _is_timeout(e)
+        
+        if breaker is not None:
+            breaker.record(not retryable)
+        if self.metrics is not None:
+            self.metrics.outbound_seconds.observe(
+                time.monotonic() - started, self.agent.name, agent_name, response.status
+            )
+        return response, retryable
+    
+    async def _send_http(self, endpoint: str, request: AgentRequest, timeout: float) -> AgentResponse:
+        """Send a request to a collaborator over JSON-RPC (HTTP or a Unix socket)."""
+        from a2a.client.client import A2AClient
+        
+        async with self.connection_pool.connection(endpoint) as client:
+            a2a_client = A2AClient(
+                httpx_client=client,
+                url=self.connection_pool.url(endpoint)
+            )
+            
+            # Our own task id for the collaborator's task, so we can cancel it
+            task_id = str(uuid.uuid4())
+            req = SendMessageRequest(
+                params=MessageSendParams(message=self._build_message(request, timeout, task_id))
+            )
+            try:
+                resp = await a2a_client.send_message(req, http_kwargs={"timeout": httpx.Timeout(timeout)})
+            except asyncio.CancelledError:
+                self._cancel_remote(endpoint, task_id)
+                raise
+        
+        # Extract response
+        response_text = ""
+        response_data = {}
+        status = "success"
+        
+        if resp and hasattr(resp, 'root') and hasattr(resp.root, 'result'):
+            result = resp.root.result
+            if hasattr(result, 'artifacts') and result.artifacts:
+                response_text, response_data = _read_parts(
+                    part for artifact in result.artifacts for part in artifact.parts
+                )
+            task_status = getattr(result, 'status', None)
+            if task_status and task_status.state in (TaskState.failed, TaskState.rejected):
+                status = "rejected" if task_status.state == TaskState.rejected else "error"
+                if task_status.message and not response_text:
+                    response_text, _ = _read_parts(task_status.message.parts)
+        
+        return AgentResponse(
+            message=response_text,
+            status=status,
+            data=response_data
+        )
+    
+    async def _send_local(
+        self,
+        endpoint: str,
+        request: AgentRequest,
+        timeout: float,
+        on_partial: Optional[Callable[[str], None]] = None,
+    ) -> AgentResponse:
+        """Hand a request to a collaborator running in this process, without serializing it.
+        
+        Outcomes map to the statuses an HTTP call would produce. Cancelling
+        the caller cancels the collaborator's work directly.
+        """
+        server = get_local_server(self.connection_pool.configs[endpoint].url)
+        request = request.model_copy(update={"deadline": timeout, "session_id": None})
+        # Our own streaming sink must not receive the collaborator's partial text
+        sink_token = _partial_sink.set(None)
+        try:
+            response = await server._answer(request, on_partial=on_partial)
+        finally:
+            _partial_sink.reset(sink_token)
+        # Like the HTTP path, the caller gets the message, status and data only
+        return AgentResponse(message=response.message, status=response.status, data=response.data)
+    
+    async def _stream_local(self, endpoint: str, request: AgentRequest, timeout: float) -> AsyncIterator[AgentResponse]:
+        """Stream a local collaborator's partial text, then its final response."""
+        chunks: asyncio.Queue = asyncio.Queue()
+        done = object()
+        task = asyncio.ensure_future(self._send_local(endpoint, request, timeout, on_partial=chunks.put_nowait))
+        task.add_done_callback(lambda _: chunks.put_nowait(done))
+        try:
+            while (chunk := await chunks.get()) is not done:
+                if chunk:
+                    yield AgentResponse(message=chunk, status="partial")
+            yield task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+    
+    async def call_agent_stream(self, agent_name: str, request: AgentRequest) -> AsyncIterator[AgentResponse]:
+        """Call another agent and yield its response while it is generated.
+        
+        Yields one AgentResponse with status "partial" per text chunk, then a
+        final response with the full text, as call_agent would return it.
+        Collaborators whose agent card does not advertise streaming are called
+        with call_agent and produce only the final response.
+        """
+        responses = self._stream_agent(agent_name, request)
+        if self.traffic is not None:
+            responses = self.traffic.stream(agent_name, request, responses)
+        async for response in responses:
+            yield response
+    
+    async def _stream_agent(self, agent_name: str, request: AgentRequest) -> AsyncIterator[AgentResponse]:
+        card = self.registry.get_card(agent_name)
+        if (
+            agent_name not in self.collaborators
+            or not self.registry.is_healthy(agent_name)
+            or (card is not None and not (card.capabilities and card.capabilities.streaming))
+        ):
+            yield await self._coalesced_call(agent_name, request)
+            return
+        
+        endpoint = breaker = None
         try:
             from a2a.client.client import A2AClient
             
-            async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-                a2a_client = A2AClient(
-                    httpx_client=client,
-                    url=self.collaborators[agent_name]
+            timeout = self._call_timeout(agent_name, request)
+            if timeout <= 0:
+                yield AgentResponse(
+                    message=f"Deadline exceeded before calling {agent_name}",
+                    status="timeout"
                 )
-                
-                # Prepare data with skill_id if specified
-                data = request.context.copy() if request.context else {}
-                if request.skill_id:
-                    data["skill_id"] = request.skill_id
-                
-                parts = [Part(root=TextPart(text=request.message))]
-                if data:
-                    parts.append(Part(root=DataPart(data=data)))
-                
-                msg = Message(
-                    messageId=str(uuid.uuid4()),
-                    role="user",
-                    parts=parts
+                return
+            # Streams are not retried or hedged (chunks may already be out), but are balanced
+            endpoint = self.balancers[agent_name].pick()
+            if endpoint is None:
+                yield AgentResponse(
+                    message=f"Agent {agent_name} is unavailable (circuit open)",
+                    status="error"
+                )
+                return
+            breaker = self.breakers.get(endpoint)
+            if is_local(self.connection_pool.configs[endpoint].url):
+                async with self.connection_pool.connection(endpoint):
+                    async for response in self._stream_local(endpoint, request, timeout):
+                        if response.status != "partial":
+                            self.registry.mark_healthy(endpoint)
+                            if breaker is not None:
+                                breaker.record(response.status not in ("rejected", "timeout"))
+                        yield response
+                return
+            async with self.connection_pool.connection(endpoint) as client:
+                a2a_client = A2AClient(httpx_client=client, url=self.connection_pool.url(endpoint))
+                task_id = str(uuid.uuid4())
+                req = SendStreamingMessageRequest(
+                    params=MessageSendParams(message=self._build_message(request, timeout, task_id))
                 )
                 
-                req = SendMessageRequest(params=MessageSendParams(message=msg))
-                resp = await a2a_client.send_message(req)
-                
-                # Extract response
-                response_text = ""
-                response_data = {}
-                
-                if resp and hasattr(resp, 'root') and hasattr(resp.root, 'result'):
-                    result = resp.root.result
-                    if hasattr(result, 'artifacts') and result.artifacts:
-                        for artifact in result.artifacts:
-                            for part in artifact.parts:
-                                if part.root.kind == "text":
-                                    response_text += part.root.text
-                                elif part.root.kind == "data":
-                                    response_data.update(part.root.data)
+                artifacts: Dict[str, List[Part]] = {}
+                status = "success"
+                error_text = ""
+                stream = a2a_client.send_message_streaming(
+                    req, http_kwargs={"timeout": httpx.Timeout(timeout)}
+                )
+                async for resp in _cancel_remote_on_exit(self, endpoint, task_id, stream):
+                    if hasattr(resp.root, "error"):
+                        raise RuntimeError(resp.root.error.message)
+                    event = resp.root.result
+                    if event.kind == "artifact-update":
+                        artifact_id = event.artifact.artifactId
+                        if event.append and artifact_id in artifacts:
+                            artifacts[artifact_id].extend(event.artifact.parts)
+                        else:
+                            artifacts[artifact_id] = list(event.artifact.parts)
+                        if not event.lastChunk:
+                            chunk, _ = _read_parts(event.artifact.parts)
+                            if chunk:
+                                yield AgentResponse(message=chunk, status="partial")
+                    elif event.kind == "task" and event.artifacts:
+                        artifacts = {a.artifactId: list(a.parts) for a in event.artifacts}
+                    elif event.kind == "status-update" and event.status.state == TaskState.failed:
+                        status = "error"
+                        if event.status.message:
+                            error_text, _ = _read_parts(event.status.message.parts)
                 
-                return AgentResponse(
-                    message=response_text,
-                    status="success",
+                self.registry.mark_healthy(endpoint)
+                if breaker is not None:
+                    breaker.record(True)
+                response_text, response_data = _read_parts(
+                    part for parts in artifacts.values() for part in parts
+                )
+                yield AgentResponse(
+                    message=response_text or error_text,
+                    status=status,
                     data=response_data
                 )
                 
         except Exception as e:
+            # A slow answer cut off by our deadline says nothing about the peer's health
+            if endpoint and _is_connection_error(e) and not _is_timeout(e):
+                self.registry.mark_unhealthy(endpoint, e)
+            if breaker is not None:
+                breaker.record(not (_is_connection_error(e) or _is_timeout(e)))
             self.logger.error(f"Error calling {agent_name}: {e}")
-            return AgentResponse(
+            yield AgentResponse(
                 message=f"Error calling {agent_name}: {str(e)}",
-                status="error"
+                status="timeout" if _is_timeout(e) else "error"
             )
     
+    async def call_agents(
+        self,
+        calls: List[AgentCall],
+        mode: str = "all",
+        k: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[AgentResponse]:
+        """Call several agents concurrently.
+        
+        Args:
+            calls: The calls to make; each may carry its own timeout
+            mode: "all" (wait for every call), "first" (stop after k successes)
+                or "quorum" (stop after k successes, default a majority)
+            k: Number of successes needed by "first"/"quorum"
+            max_concurrency: Maximum number of calls in flight at once
+            timeout: Deadline for the whole fan-out in seconds
+        
+        Returns:
+            One AgentResponse per call, in the same order as calls. Calls that
+            missed their own deadline or the fan-out's have status "timeout";
+            calls cancelled because the fan-out finished early have status
+            "cancelled".
+        """
+        results = await scatter_gather(
+            [(self._call_factory(call), call.timeout) for call in calls],
+            mode=mode,
+            k=k,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            is_success=lambda response: response.status == "success",
+        )
+        responses = []
+        for call, result in zip(calls, results):
+            if isinstance(result, asyncio.TimeoutError):
+                result = AgentResponse(message=f"Call to {call.agent_name} timed out", status="timeout")
+            elif isinstance(result, asyncio.CancelledError):
+                result = AgentResponse(message=f"Call to {call.agent_name} was cancelled", status="cancelled")
+            elif isinstance(result, BaseException):
+                result = AgentResponse(message=f"Error calling {call.agent_name}: {result}", status="error")
+            responses.append(result)
+        return responses
+    
+    async def call_agent_batch(
+        self,
+        agent_name: str,
+        requests: List[AgentRequest],
+        skill_id: Optional[str] = None,
+        priority: Optional[str] = "batch",
+        max_concurrency: Optional[int] = None,
+    ) -> List[AgentResponse]:
+        """Send many requests to one agent as a single batch.
+        
+        The collaborator processes them with bounded parallelism and streams
+        the results back as they complete. Collaborators without the batch
+        endpoint get the requests as individual calls instead, as does every
+        collaborator while traffic is recorded or replayed (so that each item
+        is).
+        
+        Args:
+            agent_name: The collaborator to call
+            requests: The requests to process
+            skill_id: Skill for requests that do not name one
+            priority: Priority class for requests that do not name one
+            max_concurrency: Requests the collaborator processes at once
+        
+        Returns:
+            One AgentResponse per request, in the same order as requests
+        """
+        if not requests:
+            return []
+        if self.traffic is not None:
+            return await self._call_batch_individually(
+                agent_name,
+                BatchRequest(requests=requests, skill_id=skill_id, priority=priority, max_concurrency=max_concurrency),
+            )
+        if agent_name not in self.collaborators or not self.registry.is_healthy(agent_name):
+            status = "not found" if agent_name not in self.collaborators else "is unavailable"
+            return [AgentResponse(message=f"Agent {agent_name} {status}", status="error") for _ in requests]
+        
+        # Items may not outlive the request we are handling
+        left = outbound_deadline(None)
+        if left is not None:
+            requests = [
+                r.model_copy(update={"deadline": left if r.deadline is None else min(r.deadline, left)})
+                for r in requests
+            ]
+        batch = BatchRequest(
+            requests=requests, skill_id=skill_id, priority=priority, max_concurrency=max_concurrency
+        )
+        endpoint = self.balancers[agent_name].pick()
+        if endpoint is None:
+            return [
+                AgentResponse(message=f"Agent {agent_name} is unavailable (circuit open)", status="error")
+                for _ in requests
+            ]
+        
+        responses: List[Optional[AgentResponse]] = [None] * len(requests)
+        breaker = self.breakers.get(endpoint)
+        try:
+            url = self.connection_pool.configs[endpoint].url
+            async with self.connection_pool.connection(endpoint) as client:
+                if is_local(url):
+                    sink_token = _partial_sink.set(None)
+                    try:
+                        async for index, response in get_local_server(url).handle_batch(batch):
+                            responses[index] = AgentResponse(
+                                message=response.message, status=response.status, data=response.data
+                            )
+                    finally:
+                        _partial_sink.reset(sink_token)
+                else:
+                    batch_url = self.connection_pool.url(endpoint).rstrip("/") + BATCH_PATH
+                    async with client.stream(
+                        "POST",
+                        batch_url,
+                        content=batch.model_dump_json(exclude_none=True),
+                        headers=self._batch_headers(),
+                    ) as resp:
+                        if resp.status_code in (404, 405):
+                            # An older collaborator: fall back to one call per request
+                            return await self._call_batch_individually(agent_name, batch)
+                        resp.raise_for_status()
+                        async for line in resp.aiter_lines():
+                            if line:
+                                item = loads(line)
+                                responses[item["index"]] = AgentResponse.model_validate(item["response"])
+            self.registry.mark_healthy(endpoint)
+            if breaker is not None:
+                breaker.record(True)
+        except Exception as e:
+            if _is_connection_error(e) and not _is_timeout(e):
+                self.registry.mark_unhealthy(endpoint, e)
+            if breaker is not None:
+                breaker.record(not (_is_connection_error(e) or _is_timeout(e)))
+            self.logger.error(f"Error calling {agent_name} with a batch: {e}")
+            error = AgentResponse(
+                message=f"Error calling {agent_name}: {str(e)}",
+                status="timeout" if _is_timeout(e) else "error"
+            )
+            # Items answered before the failure keep their response
+            return [response or error for response in responses]
+        
+        return [
+            response or AgentResponse(message=f"No response from {agent_name} for this request", status="error")
+            for response in responses
+        ]
+    
+    def _batch_headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        traceparent = self.tracer.inject() if self.tracer is not None else None
+        if traceparent:
+            headers[TRACEPARENT] = traceparent
+        return headers
+    
+    async def _call_batch_individually(self, agent_name: str, batch: BatchRequest) -> List[AgentResponse]:
+        requests = [
+            r.model_copy(update={"skill_id": r.skill_id or batch.skill_id, "priority": r.priority or batch.priority})
+            for r in batch.requests
+        ]
+        return await self.call_agents(
+            [AgentCall(agent_name=agent_name, request=request) for request in requests],
+            max_concurrency=batch.max_concurrency or self.batch_concurrency,
+        )
+    
+    def _cancel_remote(self, endpoint: str, task_id: str):
+        """Ask a collaborator replica, in the background, to cancel a task we no longer wait for."""
+        async def cancel():
+            from a2a.client.client import A2AClient
+            
+            try:
+                async with self.connection_pool.connection(endpoint) as client:
+                    a2a_client = A2AClient(httpx_client=client, url=self.connection_pool.url(endpoint))
+                    await a2a_client.cancel_task(
+                        CancelTaskRequest(id=str(uuid.uuid4()), params=TaskIdParams(id=task_id)),
+                        http_kwargs={"timeout": httpx.Timeout(5.0)},
+                    )
+                self.cancel_stats["downstream_cancels"] += 1
+                if self.metrics is not None:
+                    self.metrics.downstream_cancels.inc(self.agent.name, "sent")
+            except Exception as e:
+                self.cancel_stats["downstream_cancel_failures"] += 1
+                if self.metrics is not None:
+                    self.metrics.downstream_cancels.inc(self.agent.name, "failed")
+                self.logger.debug(f"Could not cancel task {task_id} on {endpoint}: {e}")
+        
+        task = asyncio.ensure_future(cancel())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
+    def _call_factory(self, call: AgentCall):
+        request = call.request
+        if call.timeout is not None and (request.deadline is None or call.timeout < request.deadline):
+            # The callee need not work past the point where the fan-out stops waiting
+            request = request.model_copy(update={"deadline": call.timeout})
+        return lambda: self.call_agent(call.agent_name, request)
+    
+    async def summarize_history(self, events: List[Event], token_budget: int) -> str:
+        """Summarize older conversation events when a context session is compacted.
+        
+        Override to summarize with an LLM; the default keeps the most recent
+        turns that fit in token_budget.
+        """
+        return await extractive_summary(events, token_budget)
+    
+    async def release_session(self, session_id: str):
+        """Delete an ADK session that is no longer needed."""
+        try:
+            await self.session_service.delete_session(
+                app_name=self.agent.name,
+                user_id="user1",
+                session_id=session_id
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not delete session {session_id}: {e}")
+    
+    def store_stats(self) -> Dict[str, Any]:
+        """Return session and task store counters, when the stores provide them."""
+        stats = {}
+        if hasattr(self.session_service, "stats"):
+            stats["sessions"] = self.session_service.stats()
+        if hasattr(self.task_store, "stats"):
+            stats["tasks"] = self.task_store.stats()
+        if self.context_sessions:
+            stats["contexts"] = self.context_sessions.stats()
+        return stats
+    
+    def collaborator_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-collaborator call, retry and hedging counters, latencies and per-replica state."""
+        stats = {}
+        for name, calls in self.call_stats.items():
+            latencies = self.latencies[name]
+            stats[name] = dict(
+                calls,
+                latency_p50=latencies.percentile(0.5),
+                latency_p99=latencies.percentile(0.99),
+            )
+            stats[name]["replicas"] = self.balancers[name].stats()
+        return stats
+    
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return connection pool statistics per collaborator."""
+        return self.connection_pool.stats()
+    
+    def find_collaborators(self, skill_id: Optional[str] = None, tag: Optional[str] = None) -> List[str]:
+        """Find healthy collaborators by skill id or tag from the cached agent cards."""
+        if skill_id:
+            return self.registry.find_by_skill(skill_id)
+        if tag:
+            return self.registry.find_by_tag(tag)
+        return [name for name in self.collaborators if self.registry.is_healthy(name)]
+    
+    async def startup(self):
+        """Acquire long-lived resources (called when the app starts)."""
+        await self.connection_pool.start()
+        await self.registry.start()
+    
+    async def drain(self, timeout: Optional[float] = 30.0):
+        """Wait for in-flight executions and history compactions to finish, up to timeout seconds."""
+        started = time.monotonic()
+        tasks = [task for task in self.running_tasks.values() if task is not asyncio.current_task()]
+        if tasks:
+            self.logger.info(f"Draining {len(tasks)} in-flight task(s)...")
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            if pending:
+                self.logger.warning(f"Cancelling {len(pending)} task(s) still running after drain timeout")
+                for task in pending:
+                    task.cancel()
+                await asyncio.wait(pending, timeout=1.0)
+        # Finished turns may still be compacting their history; don't cut that off halfway
+        if self.context_sessions:
+            left = None if timeout is None else max(timeout - (time.monotonic() - started), 1.0)
+            await self.context_sessions.wait_finishing(left)
+        # Let cancel requests to collaborators go out before the pool closes
+        if self._background:
+            await asyncio.wait(set(self._background), timeout=1.0)
+    
+    async def shutdown(self):
+        """Release long-lived resources (called when the app stops)."""
+        unregister_local(self.agent.name, self)
+        await self.drain(self.drain_timeout)
+        await self.registry.close()
+        await self.connection_pool.close()
+        if self.database:
+            await self.database.close()
+        if self.response_cache:
+            await self.response_cache.close()
+        if self.tracer:
+            await self.tracer.flush()
+        if self.traffic:
+            await self.traffic.close()
+    
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """Starlette lifespan that runs startup and shutdown."""
+        await self.startup()
+        try:
+            yield
+        finally:
+            await self.shutdown()
+    
     def build_app(self):
         """Build the Starlette application."""
         handler = DefaultRequestHandler(
             agent_executor=self.executor,
             task_store=self.task_store,
         )
-        app = A2AStarletteApplication(self.agent_card, handler).build()
+        routes = [Route(BATCH_PATH, self._batch_endpoint, methods=["POST"])]
+        if self.metrics is not None:
+            routes.append(Route(METRICS_PATH, self._metrics_endpoint, methods=["GET"]))
+        app = A2AStarletteApplication(self.agent_card, handler).build(lifespan=self.lifespan, routes=routes)
         return app
     
-    def run(self):
-        """Run the agent server."""
+    async def _metrics_endpoint(self, request: Request) -> Response:
+        return Response(self.metrics.render(), media_type=METRICS_CONTENT_TYPE)
+    
+    def create_worker_app(self):
+        """App factory for one worker process: fresh runner and stores, then the app."""
+        self._init_components()
+        return self.build_app()
+    
+    def run(self, workers: int = 1, drain_timeout: float = 30.0, uds: Optional[str] = None):
+        """Run the agent server.
+        
+        Args:
+            workers: Number of worker processes. With more than one, workers
+                are forked and share the port (SO_REUSEPORT where available,
+                otherwise a socket bound once by the parent).
+            drain_timeout: Seconds to wait for in-flight tasks on shutdown
+            uds: Serve on this Unix domain socket path instead of host:port,
+                for peers on the same host (collaborator URL "unix://<path>")
+        """
+        self.drain_timeout = drain_timeout
+        self.uds = uds
+        if workers > 1:
+            from .workers import run_workers
+            run_workers(self, workers)
+            return
+        
         import uvicorn
-        uvicorn.run(self.build_app(), host=self.host, port=self.port)
+        uvicorn.run(
+            self.build_app(),
+            host=self.host,
+            port=self.port,
+            uds=uds,
+            timeout_graceful_shutdown=drain_timeout,
+        )
+
+
+class _Stage:
+    """Times a stage for the metrics while recording it as a span."""
+    
+    __slots__ = ("timer", "span")
+    
+    def __init__(self, timer, span: Span):
+        self.timer = timer
+        self.span = span
+    
+    def __enter__(self):
+        self.timer.__enter__()
+        return self.span.__enter__()
+    
+    def __exit__(self, *exc_info):
+        self.span.__exit__(*exc_info)
+        return self.timer.__exit__(*exc_info)
+
+
+def _send_artifact_chunk(updater: TaskUpdater, parts: List[Part], append: bool, last_chunk: bool):
+    """Publish a chunk of the "response" artifact."""
+    updater.event_queue.enqueue_event(
+        TaskArtifactUpdateEvent(
+            taskId=updater.task_id,
+            contextId=updater.context_id,
+            artifact=Artifact(artifactId="response", name="response", parts=parts),
+            append=append,
+            lastChunk=last_chunk,
+        )
+    )
+
+
+def _read_parts(parts) -> tuple:
+    """Collect the text and data of A2A parts."""
+    text = ""
+    data = {}
+    for part in parts:
+        if part.root.kind == "text":
+            text += part.root.text
+        elif part.root.kind == "data":
+            data.update(part.root.data)
+    return text, data
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """Whether an error means the collaborator could not be reached."""
+    if isinstance(error, (httpx.TransportError, ConnectionError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and status_code >= 500
+
+
+async def _cancel_remote_on_exit(server: "A2AAgentServer", endpoint: str, task_id: str, stream):
+    """Relay a collaborator's event stream; cancel its task if we stop listening early."""
+    try:
+        async for event in stream:
+            yield event
+    except (asyncio.CancelledError, GeneratorExit):
+        server._cancel_remote(endpoint, task_id)
+        raise
+
+
+def _is_timeout(error: Exception) -> bool:
+    """Whether an error means the collaborator did not answer in time."""
+    cause = error if isinstance(error, httpx.TimeoutException) else error.__cause__
+    return isinstance(cause, httpx.TimeoutException) and not isinstance(cause, httpx.ConnectTimeout)
 
 
 def create_a2a_agent(
     agent: Agent,
     port: int,
     skills: Optional[List[SkillDefinition]] = None,
-    collaborators: Optional[Dict[str, str]] = None,
+    collaborators: Optional[Dict[str, Union[str, List[str], CollaboratorConfig]]] = None,
     **kwargs
 ) -> A2AAgentServer:
     """Create an A2A server for an ADK agent with skill support.
@@ -330,7 +1674,7 @@ def create_a2a_agent(
         agent: The ADK agent instance
         port: Port to run the server on
         skills: List of skill definitions for the agent
-        collaborators: Dict mapping agent names to their URLs
+        collaborators: Dict mapping agent names to their URLs or CollaboratorConfig
         **kwargs: Additional arguments for A2AAgentServer
     
     Returns:
@@ -0,0 +1,25 @@
+"""
+Batch processing through a server's admission control.
+"""
+import asyncio
+from google.adk.agents import Agent
+from adk_a2a_wrapper.benchmark import FakeLlm
+from adk_a2a_wrapper.models import AgentRequest, BatchRequest
+from adk_a2a_wrapper.wrapper import A2AAgentServer
+
+
+def test_batch_stays_within_admission_limits():
+    async def main():
+        agent = Agent(name="worker", model=FakeLlm(latency=0.05), instruction="Answer the request.")
+        server = A2AAgentServer(agent, port=0, max_concurrency=2, max_queue=3)
+        await server.startup()
+        try:
+            # Ten items at the default batch_concurrency of 8 would overflow 2 slots + 3 queued
+            batch = BatchRequest(requests=[AgentRequest(message=f"Item {i}") for i in range(10)])
+            results = {index: response async for index, response in server.handle_batch(batch)}
+        finally:
+            await server.shutdown()
+        assert sorted(results) == list(range(10))
+        assert {response.status for response in results.values()} == {"success"}
+
+    asyncio.run(main())
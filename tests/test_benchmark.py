@@ -0,0 +1,48 @@
+"""
+Smoke tests of the benchmark harness: FakeLlm, scenarios and the load generator.
+"""
+import asyncio
+import httpx
+import pytest
+from adk_a2a_wrapper.benchmark import FakeLlm, a2a_sender, run_load, run_scenario
+
+
+def test_fake_llm_is_deterministic():
+    llm = FakeLlm(output_tokens=8)
+    assert llm._words("a prompt") == llm._words("a prompt")
+    assert len(llm._words("a prompt")) == 8
+
+
+@pytest.mark.parametrize("scenario", ["single", "chain"])
+def test_closed_loop_load(scenario):
+    async def main():
+        async with run_scenario(scenario, FakeLlm(latency=0.01)) as url:
+            async with httpx.AsyncClient(timeout=10) as client:
+                send = a2a_sender(client, url)
+                # The first request in a process is slow (lazy imports), keep it out of the measurement
+                assert await send(0)
+                return await run_load(send, concurrency=4, duration=1.0, warmup=0.2)
+
+    report = asyncio.run(main()).to_dict()
+    assert report["requests"] > 0
+    assert report["errors"] == 0
+    assert 0 < report["p50"] <= report["p99"] <= report["max"]
+
+
+def test_open_loop_schedule():
+    sent = []
+
+    async def send(index: int) -> bool:
+        sent.append(index)
+        await asyncio.sleep(0.01)
+        return index % 2 == 0
+
+    report = asyncio.run(run_load(send, schedule=[0.0, 0.05, 0.1, 0.15])).to_dict()
+    assert sent == [0, 1, 2, 3]
+    assert report["requests"] == 2
+    assert report["errors"] == 2
+
+
+def test_open_loop_needs_rate():
+    with pytest.raises(ValueError):
+        asyncio.run(run_load(lambda index: asyncio.sleep(0, True), mode="open"))
@@ -0,0 +1,278 @@
+"""
+End-to-end collaborator calls against a peer agent served on a loopback port.
+"""
+import asyncio
+import socket
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+import uvicorn
+from google.adk.agents import Agent
+from adk_a2a_wrapper.benchmark import FakeLlm
+from adk_a2a_wrapper.metrics import Metrics
+from adk_a2a_wrapper.models import AgentCall, AgentRequest, CollaboratorConfig
+from adk_a2a_wrapper.wrapper import A2AAgentServer
+
+
+def make_server(name: str, latency: float = 0.0, **kwargs) -> A2AAgentServer:
+    agent = Agent(name=name, model=FakeLlm(latency=latency), instruction="Answer the request.")
+    return A2AAgentServer(agent, port=0, host="127.0.0.1", health_check_interval=None, **kwargs)
+
+
+def bind_loopback() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+def url_of(sock: socket.socket) -> str:
+    return f"http://127.0.0.1:{sock.getsockname()[1]}/"
+
+
+@asynccontextmanager
+async def serving(
+    server: A2AAgentServer, sock: socket.socket, wrap: Optional[Callable[[Any], Any]] = None
+) -> AsyncIterator[None]:
+    """Serve server's app (behind wrap, if given) with uvicorn on sock until the block exits."""
+    app = server.build_app()
+    uv = uvicorn.Server(uvicorn.Config(wrap(app) if wrap else app, lifespan="on", log_level="warning"))
+    task = asyncio.create_task(uv.serve(sockets=[sock]))
+    while not uv.started:
+        assert not task.done(), "peer stopped during startup"
+        await asyncio.sleep(0.01)
+    try:
+        yield
+    finally:
+        uv.should_exit = True
+        await task
+
+
+@asynccontextmanager
+async def caller_of(
+    url: str, timeout: float = 10.0, policy: Optional[dict] = None, **kwargs
+) -> AsyncIterator[A2AAgentServer]:
+    """A server with the peer at url as collaborator "peer", started and shut down around the block.
+
+    policy holds extra CollaboratorConfig fields (retries, hedging, breaker, replicas).
+    """
+    config = CollaboratorConfig(url=url, timeout=timeout, **(policy or {}))
+    server = make_server("caller", collaborators={"peer": config}, **kwargs)
+    await server.startup()
+    try:
+        yield server
+    finally:
+        await server.shutdown()
+
+
+class Overloaded:
+    """ASGI front that answers the first `failures` JSON-RPC posts with a 503.
+
+    Agent card fetches (GET) always reach the app, so the peer stays discoverable.
+    """
+
+    def __init__(self, app, failures: int):
+        self.app = app
+        self.failures = failures
+        self.posts = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST":
+            self.posts += 1
+            if self.posts <= self.failures:
+                await send({"type": "http.response.start", "status": 503, "headers": [(b"content-type", b"text/plain")]})
+                await send({"type": "http.response.body", "body": b"overloaded"})
+                return
+        await self.app(scope, receive, send)
+
+
+async def wait_until(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.02)
+
+
+def test_call_success():
+    async def main():
+        sock = bind_loopback()
+        async with serving(make_server("peer"), sock), caller_of(url_of(sock)) as caller:
+            response = await caller.call_agent("peer", AgentRequest(message="Write a poem"))
+            assert response.status == "success"
+            assert response.message
+            assert caller.registry.is_healthy("peer")
+            assert caller.call_stats["peer"]["calls"] == 1
+
+    asyncio.run(main())
+
+
+def test_call_timeout():
+    async def main():
+        sock = bind_loopback()
+        async with serving(make_server("peer", latency=5.0), sock), caller_of(url_of(sock), timeout=0.3) as caller:
+            started = time.monotonic()
+            response = await caller.call_agent("peer", AgentRequest(message="Write a poem"))
+            assert response.status == "timeout"
+            assert time.monotonic() - started < 2.0
+            # A slow answer says nothing about the peer's health
+            assert caller.registry.is_healthy("peer")
+
+    asyncio.run(main())
+
+
+def test_fanout_timeout_reports_timeout():
+    async def main():
+        sock = bind_loopback()
+        async with serving(make_server("peer", latency=5.0), sock), caller_of(url_of(sock)) as caller:
+            responses = await caller.call_agents(
+                [AgentCall(agent_name="peer", request=AgentRequest(message="Write a poem"))],
+                timeout=0.3,
+            )
+            assert [r.status for r in responses] == ["timeout"]
+
+    asyncio.run(main())
+
+
+def test_unhealthy_peer_fails_fast_and_recovers():
+    async def main():
+        # Bound but not listening: connections are refused until the peer is served on it
+        sock = bind_loopback()
+        async with caller_of(url_of(sock), unhealthy_cooldown=0.5) as caller:
+            request = AgentRequest(message="Write a poem")
+            # The startup card fetch failed once; one failed call reaches the threshold
+            first = await caller.call_agent("peer", request)
+            assert first.status == "error"
+            assert not caller.registry.is_healthy("peer")
+
+            started = time.monotonic()
+            second = await caller.call_agent("peer", request)
+            assert second.status == "error"
+            assert "unavailable" in second.message
+            assert time.monotonic() - started < 0.1
+
+            async with serving(make_server("peer"), sock):
+                await asyncio.sleep(0.5)
+                # The mark has expired: the call goes through and clears it
+                third = await caller.call_agent("peer", request)
+                assert third.status == "success"
+                assert caller.registry.is_healthy("peer")
+
+    asyncio.run(main())
+
+
+def test_cancelled_call_cancels_peer_task():
+    async def main():
+        sock = bind_loopback()
+        peer = make_server("peer", latency=5.0, metrics=Metrics())
+        async with serving(peer, sock), caller_of(url_of(sock)) as caller:
+            call = asyncio.ensure_future(caller.call_agent("peer", AgentRequest(message="Write a poem")))
+            await wait_until(lambda: peer.running_tasks)
+            call.cancel()
+            try:
+                await call
+            except asyncio.CancelledError:
+                pass
+            else:
+                raise AssertionError("call was not cancelled")
+            await wait_until(lambda: caller.cancel_stats["downstream_cancels"] == 1)
+            await wait_until(lambda: peer.cancel_stats["cancelled"] == 1)
+            assert not peer.running_tasks
+            exposition = peer.metrics.render()
+            assert 'a2a_cancelled_total{agent="peer",what="execution"} 1' in exposition
+            assert 'a2a_cancelled_seconds_total{agent="peer"}' in exposition
+
+    asyncio.run(main())
+
+
+def overloaded(failures: int):
+    """A serving() wrap that keeps the Overloaded front it builds in .front."""
+    def wrap(app):
+        wrap.front = Overloaded(app, failures)
+        return wrap.front
+    return wrap
+
+
+def test_retry_recovers_after_503():
+    async def main():
+        sock = bind_loopback()
+        wrap = overloaded(failures=1)
+        async with serving(make_server("peer"), sock, wrap), caller_of(
+            url_of(sock), policy={"retries": 2, "retry_backoff": 0.01}
+        ) as caller:
+            response = await caller.call_agent("peer", AgentRequest(message="Write a poem"))
+            assert response.status == "success"
+            assert wrap.front.posts == 2
+            assert caller.call_stats["peer"]["calls"] == 2
+            assert caller.call_stats["peer"]["retries"] == 1
+
+    asyncio.run(main())
+
+
+def test_retries_exhausted_surface_the_503():
+    async def main():
+        sock = bind_loopback()
+        wrap = overloaded(failures=100)
+        async with serving(make_server("peer"), sock, wrap), caller_of(
+            url_of(sock), policy={"retries": 3, "retry_backoff": 0.01}
+        ) as caller:
+            response = await caller.call_agent("peer", AgentRequest(message="Write a poem"))
+            # The peer gets marked unhealthy along the way, but every retry still goes out
+            assert wrap.front.posts == 4
+            assert response.status == "error"
+            assert "503" in response.message
+            assert caller.call_stats["peer"]["calls"] == 4
+            assert caller.call_stats["peer"]["retries"] == 3
+
+    asyncio.run(main())
+
+
+def test_hedge_to_fast_replica_wins_and_cancels_slow():
+    async def main():
+        slow_sock, fast_sock = bind_loopback(), bind_loopback()
+        slow = make_server("peer", latency=5.0)
+        policy = {"replicas": [url_of(fast_sock)], "hedge_delay": 0.3}
+        async with serving(slow, slow_sock), serving(make_server("peer"), fast_sock), caller_of(
+            url_of(slow_sock), policy=policy
+        ) as caller:
+            started = time.monotonic()
+            # Round robin sends the first call to the first (slow) replica
+            response = await caller.call_agent("peer", AgentRequest(message="Write a poem"))
+            assert response.status == "success"
+            assert time.monotonic() - started < 2.0
+            assert caller.call_stats["peer"]["hedges"] == 1
+            assert caller.call_stats["peer"]["hedge_wins"] == 1
+            # The losing request is cancelled on the slow replica
+            await wait_until(lambda: slow.cancel_stats["cancelled"] == 1)
+            assert not slow.running_tasks
+
+    asyncio.run(main())
+
+
+def test_circuit_breaker_opens_probes_and_closes():
+    async def main():
+        sock = bind_loopback()
+        wrap = overloaded(failures=2)
+        policy = {"circuit_failure_rate": 0.5, "circuit_min_requests": 2, "circuit_reset_timeout": 0.3}
+        # A high failure threshold keeps the registry from failing calls before the breaker does
+        async with serving(make_server("peer"), sock, wrap), caller_of(
+            url_of(sock), policy=policy, failure_threshold=100
+        ) as caller:
+            request = AgentRequest(message="Write a poem")
+            breaker = caller.breakers["peer"]
+            for _ in range(2):
+                assert (await caller.call_agent("peer", request)).status == "error"
+            assert breaker.state == "open"
+
+            refused = await caller.call_agent("peer", request)
+            assert "circuit open" in refused.message
+            assert wrap.front.posts == 2
+
+            await asyncio.sleep(0.3)
+            assert breaker.available()
+            # The half-open probe succeeds and closes the circuit
+            probe = await caller.call_agent("peer", request)
+            assert probe.status == "success"
+            assert wrap.front.posts == 3
+            assert breaker.state == "closed"
+            assert breaker.stats()["opens"] == 1
+
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+History compaction of context sessions, including failures halfway.
+"""
+import asyncio
+import pytest
+from google.adk.events import Event
+from google.genai import types
+from adk_a2a_wrapper.context_sessions import SUMMARY_PREFIX, ContextSessionManager, event_text
+from adk_a2a_wrapper.stores import BoundedSessionService
+
+
+class FlakySessionService(BoundedSessionService):
+    """create_session fails once for the first session id that fail_on matches."""
+
+    fail_on = None
+
+    async def create_session(self, *, app_name, user_id, state=None, session_id=None):
+        if self.fail_on is not None and self.fail_on(session_id):
+            self.fail_on = None
+            raise RuntimeError("store unavailable")
+        return await super().create_session(app_name=app_name, user_id=user_id, state=state, session_id=session_id)
+
+
+async def context_with_history(manager: ContextSessionManager, turns: int = 10):
+    session_id = await manager.acquire("c1")
+    service = manager.session_service
+    session = await service.get_session(app_name="app", user_id="user1", session_id=session_id)
+    for i in range(turns):
+        text = f"turn {i} " + "words " * 50
+        await service.append_event(session, Event(
+            author="user" if i % 2 == 0 else "agent",
+            content=types.Content(role="user", parts=[types.Part(text=text)]),
+        ))
+    return session_id
+
+
+async def texts(manager: ContextSessionManager, session_id: str):
+    session = await manager.session_service.get_session(app_name="app", user_id="user1", session_id=session_id)
+    return [event_text(event) for event in session.events]
+
+
+def test_release_compacts_over_budget():
+    async def main():
+        manager = ContextSessionManager(BoundedSessionService(), "app", token_budget=200, keep_recent_events=2)
+        session_id = await context_with_history(manager)
+        before = await texts(manager, session_id)
+        await manager.release("c1")
+        await manager.wait_finishing()
+        after = await texts(manager, session_id)
+        assert len(after) == 3
+        assert after[0].startswith(SUMMARY_PREFIX)
+        assert after[1:] == before[-2:]
+        assert manager.compactions == 1
+        # Only the context's session is left behind
+        listed = await manager.session_service.list_sessions(app_name="app", user_id="user1")
+        assert [s.id for s in listed.sessions] == [session_id]
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("failure", ["summary", "scratch", "replacement"])
+def test_failed_compaction_keeps_history(failure):
+    async def main():
+        service = FlakySessionService()
+
+        async def summarizer(events, budget):
+            if failure == "summary":
+                raise RuntimeError("summarizer down")
+            return "short"
+
+        manager = ContextSessionManager(service, "app", token_budget=200, keep_recent_events=2, summarizer=summarizer)
+        session_id = await context_with_history(manager)
+        before = await texts(manager, session_id)
+        session = await service.get_session(app_name="app", user_id="user1", session_id=session_id)
+        if failure == "scratch":
+            service.fail_on = lambda sid: "-compacting-" in sid
+        elif failure == "replacement":
+            service.fail_on = lambda sid: sid == session_id
+        with pytest.raises(RuntimeError):
+            await manager.compact(session)
+        assert await texts(manager, session_id) == before
+        assert manager.compactions == 0
+        listed = await service.list_sessions(app_name="app", user_id="user1")
+        assert [s.id for s in listed.sessions] == [session_id]
+
+    asyncio.run(main())
+
+
+def test_wait_finishing_waits_for_compaction():
+    async def main():
+        done = asyncio.Event()
+
+        async def slow_summary(events, budget):
+            await asyncio.sleep(0.2)
+            done.set()
+            return "short"
+
+        manager = ContextSessionManager(
+            BoundedSessionService(), "app", token_budget=200, keep_recent_events=2, summarizer=slow_summary
+        )
+        await context_with_history(manager)
+        await manager.release("c1")
+        await manager.wait_finishing(timeout=5)
+        assert done.is_set() and manager.compactions == 1
+
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+"""
+Token buckets of the RateLimiter.
+"""
+import asyncio
+import pytest
+from adk_a2a_wrapper.ratelimit import RateLimiter, reserve
+
+
+def test_budget_within_a_minute_goes_through_at_once():
+    async def main():
+        limiter = RateLimiter(rpm=60, tpm=6000)
+        waits = [await limiter.acquire("model", 270) for _ in range(20)]
+        assert waits == [0.0] * 20
+        assert limiter.stats()["model"]["delayed"] == 0
+
+    asyncio.run(main())
+
+
+def test_over_budget_waits_for_refill():
+    async def main():
+        limiter = RateLimiter(tpm=6000)
+        assert await limiter._take("model:tpm", 6000, 6000) == 0.0
+        # The bucket is empty: 100 more tokens take a second to refill
+        assert await limiter._take("model:tpm", 6000, 100) == pytest.approx(1.0, abs=0.05)
+
+    asyncio.run(main())
+
+
+def test_call_larger_than_budget_does_not_wait_on_idle_bucket():
+    async def main():
+        limiter = RateLimiter(tpm=600, burst=1.0)
+        assert await limiter._take("model:tpm", 600, 5000) == 0.0
+
+    asyncio.run(main())
+
+
+def test_refund_does_not_overfill():
+    state, wait = reserve(None, 0.0, rate=1.0, capacity=10.0, amount=4.0)
+    assert state == (6.0, 0.0) and wait == 0.0
+    state, _ = reserve(state, 0.0, rate=1.0, capacity=10.0, amount=-100.0)
+    assert state == (10.0, 0.0)
@@ -0,0 +1,123 @@
+"""
+Round trips through TrafficRecorder and TrafficReplayer.
+"""
+import asyncio
+import time
+import pytest
+from google.adk.events import Event
+from google.genai import types
+from adk_a2a_wrapper.models import AgentRequest, AgentResponse
+from adk_a2a_wrapper.replay import ReplayMiss, TrafficRecorder, TrafficReplayer, read_log
+
+
+async def model_run(delay: float = 0.0):
+    """Runner events: two partial chunks, then the final response with usage."""
+    for chunk in ("Roses ", "are red"):
+        await asyncio.sleep(delay)
+        yield Event(author="agent", content=types.Content(role="model", parts=[types.Part(text=chunk)]), partial=True)
+    yield Event(
+        author="agent",
+        content=types.Content(role="model", parts=[types.Part(text="Roses are red")]),
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=12, candidates_token_count=4, total_token_count=16
+        ),
+    )
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+def record(path, delay: float = 0.0):
+    async def main():
+        recorder = TrafficRecorder(str(path))
+        request = AgentRequest(message="Translate", context={"lang": "es", "n": 1}, priority="interactive")
+        recorder.request(request)
+        await collect(recorder.run("Write a poem", model_run(delay)))
+
+        async def send():
+            await asyncio.sleep(delay)
+            return AgentResponse(message="Rosas", data={"lang": "es"})
+
+        await recorder.call("translator", request, send)
+        await recorder.close()
+        return recorder.stats()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("name", ["traffic.jsonl", "traffic.jsonl.gz"])
+def test_round_trip(tmp_path, name):
+    path = tmp_path / name
+    assert record(path) == {"recorded": {"req": 1, "run": 1, "call": 1}}
+    assert [entry["k"] for entry in read_log(str(path))] == ["req", "run", "call"]
+
+    async def main():
+        replayer = TrafficReplayer(str(path), time_scale=0)
+        [(_, request)] = replayer.requests()
+        assert request.message == "Translate" and request.priority == "interactive"
+
+        events = await collect(replayer.run("Write a poem", model_run()))
+        assert [e.content.parts[0].text for e in events] == ["Roses ", "are red", "Roses are red"]
+        assert [bool(e.partial) for e in events] == [True, True, False]
+        assert events[-1].usage_metadata.prompt_token_count == 12
+        assert events[-1].usage_metadata.candidates_token_count == 4
+
+        async def live():
+            raise AssertionError("a recorded call must not be made")
+
+        # Context key order does not matter
+        reordered = AgentRequest(message="Translate", context={"n": 1, "lang": "es"})
+        response = await replayer.call("translator", reordered, live)
+        assert response == AgentResponse(message="Rosas", data={"lang": "es"})
+        assert replayer.stats() == {"hits": 2, "misses": 0}
+
+    asyncio.run(main())
+
+
+def test_replay_keeps_recorded_timing(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    record(path, delay=0.1)
+
+    async def main():
+        replayer = TrafficReplayer(str(path))
+        started = time.monotonic()
+        await collect(replayer.run("Write a poem", model_run()))
+        assert time.monotonic() - started >= 0.18
+
+        fast = TrafficReplayer(str(path), time_scale=0)
+        started = time.monotonic()
+        await collect(fast.run("Write a poem", model_run()))
+        assert time.monotonic() - started < 0.05
+
+    asyncio.run(main())
+
+
+def test_misses(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    record(path)
+
+    async def live():
+        return AgentResponse(message="live")
+
+    async def main():
+        replayer = TrafficReplayer(str(path), time_scale=0)
+        with pytest.raises(ReplayMiss):
+            await collect(replayer.run("Another prompt", model_run()))
+        response = await replayer.call("translator", AgentRequest(message="Other"), live)
+        assert response.status == "error"
+        assert replayer.stats() == {"hits": 0, "misses": 2}
+
+        passthrough = TrafficReplayer(str(path), time_scale=0, on_miss="live")
+        events = await collect(passthrough.run("Another prompt", model_run()))
+        assert events[-1].content.parts[0].text == "Roses are red"
+        assert (await passthrough.call("translator", AgentRequest(message="Other"), live)).message == "live"
+
+    asyncio.run(main())
+
+
+def test_unknown_miss_mode(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    path.write_text("")
+    with pytest.raises(ValueError):
+        TrafficReplayer(str(path), on_miss="ignore")
@@ -0,0 +1,54 @@
+"""
+canonical_json, dumps and loads, with orjson and with the json fallback.
+"""
+import json
+import pytest
+from adk_a2a_wrapper import serialization
+from adk_a2a_wrapper.serialization import canonical_json, dumps, loads
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        if not serialization.HAS_ORJSON:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+def test_canonical_json_ignores_key_order(backend):
+    a = {"b": 1, "a": {"y": [1, 2], "x": None}}
+    b = {"a": {"x": None, "y": [1, 2]}, "b": 1}
+    assert canonical_json(a) == canonical_json(b) == '{"a":{"x":null,"y":[1,2]},"b":1}'
+
+
+def test_canonical_json_is_compact_json(backend):
+    value = {"text": "océano", "flag": True, "score": 0.5}
+    text = canonical_json(value)
+    assert " " not in text
+    assert "océano" in text
+    assert json.loads(text) == value
+
+
+def test_canonical_json_edge_cases(backend):
+    # Unknown types are encoded as their str(), integers beyond 64 bits are kept
+    assert canonical_json({"when": object}) == json.dumps({"when": str(object)}, separators=(",", ":"))
+    assert canonical_json({"n": 2**70}) == '{"n":%d}' % 2**70
+    # Keys of mixed types cannot be sorted, but still encode
+    assert loads(canonical_json({1: "a", "b": 2})) == {"1": "a", "b": 2}
+
+
+def test_backends_agree(monkeypatch):
+    if not serialization.HAS_ORJSON:
+        pytest.skip("orjson is not installed")
+    value = {"z": [1, 2.5, "ü", None], "a": {"nested": True}, "n": -3}
+    fast = canonical_json(value)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert canonical_json(value) == fast
+
+
+def test_dumps_loads_round_trip(backend):
+    value = {"b": [1, {"c": "d"}], "a": "é"}
+    assert loads(dumps(value)) == value
+    assert loads(dumps(value).encode("utf-8")) == value